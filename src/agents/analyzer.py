@@ -6,24 +6,37 @@ Analyzes a repository to identify its package manager, locate dependency files,
 and identify outdated dependencies.
 """
 
+import asyncio
+import atexit
+import contextlib
+import fnmatch
+import functools
 import json
 import os
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
+import httpx
 import requests
 from dotenv import load_dotenv
-from langchain.agents import create_agent
-from langchain_anthropic import ChatAnthropic
 from langchain_core.tools import tool
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
 
 from src.config import language_map as LanguageMap
 
 # Import caching module
 from src.services.cache import get_cache
+from src.utils import serialization
+from src.utils.llm import cached_system_prompt
+from src.utils.ttl_cache import TTLCache
 
 
 def _get_nested(obj, path, default="N/A"):
@@ -41,6 +54,171 @@ def _get_nested(obj, path, default="N/A"):
 # Load environment variables from .env file
 load_dotenv()
 
+# Package managers whose outdated check is answered from PyPI's JSON API
+PYPI_PACKAGE_MANAGERS = ("pip", "pip-tools")
+PYPI_JSON_URL = "https://pypi.org/pypi/{name}/json"
+PYPI_MAX_CONCURRENCY = 20
+GITHUB_RAW_URL = "https://raw.githubusercontent.com/{repo}/HEAD/{path}"
+GITHUB_CONTENTS_URL = "https://api.github.com/repos/{repo}/contents"
+ANALYZER_MODEL = "claude-sonnet-4-5-20250929"
+
+# Directory levels below the root searched for wildcard detect_files, and
+# directories never searched (VCS metadata and vendored dependencies)
+NESTED_SEARCH_DEPTH = 3
+_SKIPPED_SEARCH_DIRS = frozenset({".git", "node_modules", "vendor"})
+
+# Specifier operators whose version is taken as the requirement's current one
+_CURRENT_VERSION_OPERATORS = ("==", "~=", ">=")
+
+
+@dataclass
+class RepoContext:
+    """A repository checkout created by clone_repository."""
+
+    path: Path
+    # Root-level file names, listed once when the checkout is registered
+    entries: FrozenSet[str]
+    # File names in subdirectories (see _list_nested_files), for wildcard
+    # detect_files such as *.csproj and *.tf
+    nested_entries: FrozenSet[str] = frozenset()
+    # Dependency file contents keyed by relative path, with their mtime_ns
+    manifests: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+
+
+# Checkouts created by clone_repository, keyed by resolved path
+_contexts: Dict[str, RepoContext] = {}
+
+# Checkouts registered during the current run (see track_checkouts). The
+# set is shared by reference, so tools running in copied contexts on
+# LangChain's worker threads add to the caller's set.
+_run_checkouts: ContextVar[Optional[Set[str]]] = ContextVar(
+    "run_checkouts", default=None
+)
+
+
+def _list_root_files(repo_path) -> set:
+    """List the file names at the root of a repository with one os.scandir."""
+    with os.scandir(repo_path) as it:
+        return {entry.name for entry in it if entry.is_file()}
+
+
+def _list_nested_files(repo_path, max_depth: int = NESTED_SEARCH_DEPTH) -> set:
+    """
+    List the file names in a repository's subdirectories, up to max_depth deep.
+
+    Wildcard manifests often live below the root (a .NET solution's projects
+    under src/, Terraform modules under modules/). Directories in
+    _SKIPPED_SEARCH_DIRS and symlinked directories are not entered.
+
+    Args:
+        repo_path: Path to the repository
+        max_depth: Number of directory levels below the root to search
+
+    Returns:
+        File names found in subdirectories (root-level files excluded)
+    """
+    names = set()
+    pending = [(os.fspath(repo_path), 0)]
+    while pending:
+        directory, depth = pending.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < max_depth and entry.name not in _SKIPPED_SEARCH_DIRS:
+                            pending.append((entry.path, depth + 1))
+                    elif depth and entry.is_file():
+                        names.add(entry.name)
+        except OSError:
+            continue
+    return names
+
+
+def _register_context(repo_path: str) -> RepoContext:
+    """Record a fresh checkout so later tools can reuse its metadata."""
+    path = Path(repo_path).resolve()
+    ctx = RepoContext(
+        path=path,
+        entries=frozenset(_list_root_files(path)),
+        nested_entries=frozenset(_list_nested_files(path)),
+    )
+    _contexts[str(path)] = ctx
+    run_checkouts = _run_checkouts.get()
+    if run_checkouts is not None:
+        run_checkouts.add(str(path))
+    return ctx
+
+
+def _get_context(repo_path: str) -> Optional[RepoContext]:
+    """Look up the context of a checkout created by clone_repository."""
+    return _contexts.get(str(Path(repo_path).resolve()))
+
+
+def _repo_file_names(repo_path) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Get the root and nested file names of a repo, from its context if known."""
+    ctx = _get_context(repo_path)
+    if ctx:
+        return ctx.entries, ctx.nested_entries
+    return (
+        frozenset(_list_root_files(repo_path)),
+        frozenset(_list_nested_files(repo_path)),
+    )
+
+
+def cleanup_checkouts(*repo_paths: str) -> None:
+    """
+    Remove checkouts created by clone_repository.
+
+    Any checkout still registered at interpreter exit is removed too.
+
+    Args:
+        repo_paths: Checkouts to remove (every registered checkout if none)
+    """
+    if repo_paths:
+        keys = [str(Path(repo_path).resolve()) for repo_path in repo_paths]
+    else:
+        keys = list(_contexts)
+    for key in keys:
+        ctx = _contexts.pop(key, None)
+        if ctx is not None:
+            shutil.rmtree(ctx.path, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def track_checkouts() -> Iterator[Set[str]]:
+    """
+    Remove the checkouts cloned during a run once the run finishes.
+
+    The agents are told to leave the checkout for the updater and may stop
+    before ever reaching it, so the caller that owns a run (a job or the
+    CLI) wraps it in this block instead of relying on the LLM calling
+    cleanup_repository. Only checkouts registered inside the block are
+    removed, so concurrent runs do not delete each other's checkouts.
+
+    Yields:
+        Resolved paths of the checkouts registered so far
+    """
+    paths: Set[str] = set()
+    token = _run_checkouts.set(paths)
+    try:
+        yield paths
+    finally:
+        _run_checkouts.reset(token)
+        # No paths must not fall through to removing every checkout
+        if paths:
+            cleanup_checkouts(*paths)
+
+
+atexit.register(cleanup_checkouts)
+
+# Latest PyPI release by PEP 503 normalized package name, shared across jobs
+# and the check_all_outdated worker threads in the process
+PYPI_LATEST_CACHE_TTL = 3600
+PYPI_LATEST_CACHE_MAX_SIZE = 4096
+_pypi_latest_cache: TTLCache[str] = TTLCache(
+    PYPI_LATEST_CACHE_TTL, PYPI_LATEST_CACHE_MAX_SIZE, canonicalize_name
+)
+
 
 @tool
 def clone_repository(repo_url: str) -> str:
@@ -62,6 +240,7 @@ def clone_repository(repo_url: str) -> str:
             # Copy cached repo to temp directory
             temp_dir = tempfile.mkdtemp(prefix="dep_analyzer_")
             shutil.copytree(cached_path, temp_dir, dirs_exist_ok=True)
+            _register_context(temp_dir)
 
             return json.dumps(
                 {
@@ -72,10 +251,21 @@ def clone_repository(repo_url: str) -> str:
                 }
             )
 
-        # Clone fresh repository
+        # Clone fresh repository. Only the default branch tip is needed, so
+        # skip history, other branches and tags, and fetch blobs on checkout.
         temp_dir = tempfile.mkdtemp(prefix="dep_analyzer_")
         result = subprocess.run(
-            ["git", "clone", "--depth", "1", repo_url, temp_dir],
+            [
+                "git",
+                "clone",
+                "--filter=blob:none",
+                "--depth",
+                "1",
+                "--single-branch",
+                "--no-tags",
+                repo_url,
+                temp_dir,
+            ],
             capture_output=True,
             text=True,
             timeout=60,
@@ -89,6 +279,8 @@ def clone_repository(repo_url: str) -> str:
                 }
             )
 
+        _register_context(temp_dir)
+
         # Cache the cloned repository
         try:
             cache.cache_repository(repo_url, temp_dir)
@@ -125,18 +317,34 @@ def detect_package_manager(repo_path: Path) -> str:
         - field_map
         - skip_when
     """
-    language_map = LanguageMap.LANGUAGE_PACKAGE_BUILD_MAP
-    repo_files = {p.name for p in repo_path.rglob("*") if p.is_file()}
+    # Manifests and lock files live at the repository root, where the
+    # outdated/build commands run; only wildcard manifests (*.csproj, *.tf)
+    # are also searched for in subdirectories.
+    detected = _detect_languages(*_repo_file_names(repo_path))
+    return _detection_result(*next(detected, (None, None)))
+
+
+def _detect_languages(repo_files, nested_files=frozenset()):
+    """
+    Yield the (language, package manager) pair of each language in a repo.
+
+    Args:
+        repo_files: Root-level file names of the repository
+        nested_files: File names in subdirectories, matched against wildcard
+            detect_files only
 
-    for language, lang_cfg in language_map.items():
+    Yields:
+        Tuples of (language, package manager name), in language map order
+    """
+    for language, lang_cfg in LanguageMap.LANGUAGE_PACKAGE_BUILD_MAP.items():
         # 1. Detect language
         detect_files = lang_cfg.get("detect_files", [])
-        language_detected = False
-
-        for f in detect_files:
-            if f in repo_files or any(Path(p).match(f) for p in repo_files):
-                language_detected = True
-                break
+        language_detected = any(
+            (fnmatch.filter(repo_files, f) or fnmatch.filter(nested_files, f))
+            if "*" in f
+            else f in repo_files
+            for f in detect_files
+        )
 
         if not language_detected:
             continue
@@ -145,56 +353,37 @@ def detect_package_manager(repo_path: Path) -> str:
         for pm_name, pm_cfg in lang_cfg["package_managers"].items():
             lock_files = pm_cfg.get("lock_files", [])
 
-            if not lock_files:
-                return json.dumps(
-                    {
-                        "language": language,
-                        "package_manager": pm_name,
-                        "build_command": pm_cfg.get("build"),
-                        "outdated_command": pm_cfg.get("outdated_cmd"),
-                        "output_format": pm_cfg.get("output_format", "text"),
-                        "field_map": pm_cfg.get("field_map", {}),
-                        "skip_when": pm_cfg.get("skip_when", {}),
-                    }
-                )
+            if not lock_files or any(lock in repo_files for lock in lock_files):
+                break
+        else:
+            # 3. Fallback to first package manager
+            pm_name = next(iter(lang_cfg["package_managers"]))
 
-            for lock in lock_files:
-                if lock in repo_files:
-                    return json.dumps(
-                        {
-                            "language": language,
-                            "package_manager": pm_name,
-                            "build_command": pm_cfg.get("build"),
-                            "outdated_command": pm_cfg.get("outdated_cmd"),
-                            "output_format": pm_cfg.get("output_format", "text"),
-                            "field_map": pm_cfg.get("field_map", {}),
-                            "skip_when": pm_cfg.get("skip_when", {}),
-                        }
-                    )
+        yield language, pm_name
 
-        # 3. Fallback to first package manager
-        pm_name, pm_cfg = next(iter(lang_cfg["package_managers"].items()))
-        return json.dumps(
-            {
-                "language": language,
-                "package_manager": pm_name,
-                "build_command": pm_cfg.get("build"),
-                "outdated_command": pm_cfg.get("outdated_cmd"),
-                "output_format": pm_cfg.get("output_format", "text"),
-                "field_map": pm_cfg.get("field_map", {}),
-                "skip_when": pm_cfg.get("skip_when", {}),
-            }
-        )
 
+@functools.lru_cache(maxsize=None)
+def _detection_result(language: Optional[str], pm_name: Optional[str]) -> str:
+    """
+    Build the detect_package_manager JSON payload for a package manager.
+
+    The payload only depends on the static language map, so it is built
+    once per (language, package manager) pair.
+    """
+    pm_cfg = (
+        LanguageMap.LANGUAGE_PACKAGE_BUILD_MAP[language]["package_managers"][pm_name]
+        if language
+        else {}
+    )
     return json.dumps(
         {
-            "language": None,
-            "package_manager": None,
-            "build_command": None,
-            "outdated_command": None,
-            "output_format": "text",
-            "field_map": {},
-            "skip_when": {},
+            "language": language,
+            "package_manager": pm_name,
+            "build_command": pm_cfg.get("build"),
+            "outdated_command": pm_cfg.get("outdated_cmd"),
+            "output_format": pm_cfg.get("output_format", "text"),
+            "field_map": pm_cfg.get("field_map", {}),
+            "skip_when": pm_cfg.get("skip_when", {}),
         }
     )
 
@@ -212,14 +401,267 @@ def read_dependency_file(repo_path: str, file_path: str) -> str:
         File contents
     """
     try:
-        full_path = os.path.join(repo_path, file_path)
-        with open(full_path, "r") as f:
-            content = f.read()
-        return content
-    except Exception as e:
+        return _read_dependency_file(repo_path, file_path)
+    except (OSError, UnicodeDecodeError) as e:
         return f"Error reading file: {str(e)}"
 
 
+@tool
+def read_dependency_files(repo_path: str, file_paths: List[str]) -> str:
+    """
+    Read several dependency files in one call.
+
+    Args:
+        repo_path: Path to the repository
+        file_paths: Relative paths to the dependency files
+
+    Returns:
+        JSON string with the contents of each file read and an error
+        message for each file that could not be read
+    """
+    files = {}
+    errors = {}
+    for file_path in file_paths:
+        try:
+            files[file_path] = _read_dependency_file(repo_path, file_path)
+        except (OSError, UnicodeDecodeError) as e:
+            errors[file_path] = str(e)
+
+    return serialization.dumps({"status": "success", "files": files, "errors": errors})
+
+
+def _read_dependency_file(repo_path: str, file_path: str) -> str:
+    """Read a dependency file, memoized for registered checkouts."""
+    ctx = _get_context(repo_path)
+    if ctx is None:
+        with open(os.path.join(repo_path, file_path), "r") as f:
+            return f.read()
+
+    # Memoize per checkout; the mtime check picks up files rewritten
+    # by the updater.
+    full_path = ctx.path / file_path
+    mtime = full_path.stat().st_mtime_ns
+    cached = ctx.manifests.get(file_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    content = full_path.read_text()
+    ctx.manifests[file_path] = (mtime, content)
+    return content
+
+
+def _parse_outdated_output(stdout: str, detected_info: dict) -> List[Dict]:
+    """
+    Parse the output of a package manager's outdated command.
+
+    Args:
+        stdout: Stripped stdout of the outdated command
+        detected_info: Detection info with output_format, field_map and skip_when
+
+    Returns:
+        List of outdated package dicts (or a single raw_output entry for text)
+    """
+    outdated_list = []
+
+    if stdout:
+        output_format = detected_info.get("output_format", "text")
+        field_map = detected_info.get("field_map", {})
+        name_field = field_map.get("name", "name")
+        current_field = field_map.get("current", "current")
+        latest_field = field_map.get("latest", "latest")
+
+        try:
+            if output_format == "json_dict":
+                outdated_list = [
+                    {
+                        "name": key if name_field == "_key" else info.get(name_field, key),
+                        "current": info.get(current_field, "N/A"),
+                        "latest": info.get(latest_field, "N/A"),
+                    }
+                    for key, info in serialization.loads(stdout).items()
+                ]
+
+            elif output_format == "json_array":
+                outdated_list = [
+                    {
+                        "name": item.get(name_field, "N/A"),
+                        "current": item.get(current_field, "N/A"),
+                        "latest": item.get(latest_field, "N/A"),
+                    }
+                    for item in serialization.loads(stdout)
+                ]
+
+            elif output_format == "ndjson":
+                skip_when = detected_info.get("skip_when", {})
+                decoder = json.JSONDecoder()
+                pos = 0
+                while pos < len(stdout):
+                    while pos < len(stdout) and stdout[pos] in " \t\n\r":
+                        pos += 1
+                    if pos >= len(stdout):
+                        break
+                    try:
+                        obj, end_pos = decoder.raw_decode(stdout, pos)
+                        pos = end_pos
+                    except json.JSONDecodeError:
+                        break
+
+                    # Apply skip rules from language map
+                    skip = False
+                    for key, val in skip_when.items():
+                        if val is None and key not in obj:
+                            skip = True
+                        elif val is not None and obj.get(key) == val:
+                            skip = True
+                    if skip:
+                        continue
+
+                    outdated_list.append(
+                        {
+                            "name": _get_nested(obj, name_field),
+                            "current": _get_nested(obj, current_field),
+                            "latest": _get_nested(obj, latest_field),
+                        }
+                    )
+
+            else:  # "text" format — pass raw output for LLM to interpret
+                outdated_list.append({"raw_output": stdout})
+
+        except serialization.JSONDecodeError:
+            outdated_list.append({"raw_output": stdout})
+
+    return outdated_list
+
+
+def _read_pinned_requirements(requirements_path: Path) -> Dict[str, str]:
+    """
+    Read the current version of each requirement in a requirements file.
+
+    The current version is taken from the first ==, ~= or >= specifier;
+    requirements without one (and pip options such as -r/-e) are skipped.
+
+    Args:
+        requirements_path: Path to requirements.txt
+
+    Returns:
+        Mapping of package name to current version
+    """
+    pinned = {}
+    with open(requirements_path, "r") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("-"):
+                continue
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                continue
+            current = next(
+                (
+                    spec.version
+                    for spec in requirement.specifier
+                    if spec.operator in _CURRENT_VERSION_OPERATORS
+                ),
+                None,
+            )
+            if current:
+                pinned[requirement.name] = current
+    return pinned
+
+
+async def _fetch_pypi_latest(names: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Fetch the latest release of each package from PyPI concurrently.
+
+    Args:
+        names: Package names to look up
+
+    Returns:
+        Mapping of package name to latest version (None if the lookup failed)
+    """
+    semaphore = asyncio.Semaphore(PYPI_MAX_CONCURRENCY)
+
+    async def fetch(client: httpx.AsyncClient, name: str) -> Tuple[str, Optional[str]]:
+        latest = _pypi_latest_cache.get(name)
+        if latest is not None:
+            return name, latest
+
+        async with semaphore:
+            try:
+                response = await client.get(PYPI_JSON_URL.format(name=name))
+                response.raise_for_status()
+                latest = response.json()["info"]["version"]
+            except (httpx.HTTPError, ValueError, KeyError):
+                return name, None
+
+        _pypi_latest_cache.set(name, latest)
+        return name, latest
+
+    async with httpx.AsyncClient(timeout=10) as client:
+        return dict(await asyncio.gather(*(fetch(client, name) for name in names)))
+
+
+def _check_pypi_outdated(requirements_path: Path) -> List[Dict]:
+    """
+    Compare pinned requirements against the latest releases on PyPI.
+
+    Args:
+        requirements_path: Path to requirements.txt
+
+    Returns:
+        List of outdated package dicts with name, current and latest
+    """
+    pinned = _read_pinned_requirements(requirements_path)
+    latest_versions = asyncio.run(_fetch_pypi_latest(list(pinned)))
+
+    outdated_list = []
+    for name, current in pinned.items():
+        latest = latest_versions.get(name)
+        if not latest:
+            continue
+        try:
+            if Version(latest) > Version(current):
+                outdated_list.append(
+                    {"name": name, "current": current, "latest": latest}
+                )
+        except InvalidVersion:
+            continue
+    return outdated_list
+
+
+def _find_outdated(repo_path: Path, detected_info: dict) -> List[Dict]:
+    """
+    Find the outdated dependencies of one package manager in a repository.
+
+    Args:
+        repo_path: Resolved path to the repository
+        detected_info: Detection info with package_manager and outdated_command
+
+    Returns:
+        List of outdated package dicts
+
+    Raises:
+        subprocess.TimeoutExpired: If the outdated command times out
+    """
+    requirements_path = repo_path / "requirements.txt"
+    if (
+        detected_info.get("package_manager") in PYPI_PACKAGE_MANAGERS
+        and requirements_path.is_file()
+    ):
+        # Query PyPI for the repo's own pins instead of `pip list`, which
+        # reports the packages installed in this process's environment.
+        return _check_pypi_outdated(requirements_path)
+
+    # Run outdated command
+    result = subprocess.run(
+        detected_info["outdated_command"].split(),
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    return _parse_outdated_output(result.stdout.strip(), detected_info)
+
+
 @tool
 def check_outdated_dependencies(
     repo_path: str, repo_url: str = "", detected_info: dict = None
@@ -252,101 +694,12 @@ def check_outdated_dependencies(
         )
 
     repo_path = Path(repo_path).resolve()
-    original_dir = os.getcwd()
-    os.chdir(repo_path)
 
     try:
         # Check cache if repo_url provided
         cache = get_cache()
 
-        # Run outdated command
-        result = subprocess.run(
-            outdated_cmd.split(), capture_output=True, text=True, timeout=120
-        )
-
-        stdout = result.stdout.strip()
-        outdated_list = []
-
-        if stdout:
-            output_format = detected_info.get("output_format", "text")
-            field_map = detected_info.get("field_map", {})
-
-            try:
-                if output_format == "json_dict":
-                    data = json.loads(stdout)
-                    for pkg_key, info in data.items():
-                        name_field = field_map.get("name", "name")
-                        outdated_list.append(
-                            {
-                                "name": pkg_key
-                                if name_field == "_key"
-                                else info.get(name_field, pkg_key),
-                                "current": info.get(
-                                    field_map.get("current", "current"), "N/A"
-                                ),
-                                "latest": info.get(
-                                    field_map.get("latest", "latest"), "N/A"
-                                ),
-                            }
-                        )
-
-                elif output_format == "json_array":
-                    data = json.loads(stdout)
-                    for item in data:
-                        outdated_list.append(
-                            {
-                                "name": item.get(field_map.get("name", "name"), "N/A"),
-                                "current": item.get(
-                                    field_map.get("current", "current"), "N/A"
-                                ),
-                                "latest": item.get(
-                                    field_map.get("latest", "latest"), "N/A"
-                                ),
-                            }
-                        )
-
-                elif output_format == "ndjson":
-                    skip_when = detected_info.get("skip_when", {})
-                    decoder = json.JSONDecoder()
-                    pos = 0
-                    while pos < len(stdout):
-                        while pos < len(stdout) and stdout[pos] in " \t\n\r":
-                            pos += 1
-                        if pos >= len(stdout):
-                            break
-                        try:
-                            obj, end_pos = decoder.raw_decode(stdout, pos)
-                            pos = end_pos
-                        except json.JSONDecodeError:
-                            break
-
-                        # Apply skip rules from language map
-                        skip = False
-                        for key, val in skip_when.items():
-                            if val is None and key not in obj:
-                                skip = True
-                            elif val is not None and obj.get(key) == val:
-                                skip = True
-                        if skip:
-                            continue
-
-                        outdated_list.append(
-                            {
-                                "name": _get_nested(obj, field_map.get("name", "name")),
-                                "current": _get_nested(
-                                    obj, field_map.get("current", "current")
-                                ),
-                                "latest": _get_nested(
-                                    obj, field_map.get("latest", "latest")
-                                ),
-                            }
-                        )
-
-                else:  # "text" format — pass raw output for LLM to interpret
-                    outdated_list.append({"raw_output": stdout})
-
-            except json.JSONDecodeError:
-                outdated_list.append({"raw_output": stdout})
+        outdated_list = _find_outdated(repo_path, detected_info)
 
         result_data = {
             "status": "success",
@@ -364,7 +717,7 @@ def check_outdated_dependencies(
             except Exception:
                 pass  # ignore caching errors
 
-        return json.dumps(result_data, indent=2)
+        return serialization.dumps(result_data)
 
     except subprocess.TimeoutExpired:
         return json.dumps({"status": "error", "message": "Outdated command timed out"})
@@ -375,8 +728,206 @@ def check_outdated_dependencies(
                 "message": f"Error checking outdated dependencies: {str(e)}",
             }
         )
-    finally:
-        os.chdir(original_dir)
+
+
+@tool
+def check_all_outdated(repo_path: str, repo_url: str = "") -> str:
+    """
+    Detect every package manager in a repo and check them all for outdated dependencies.
+
+    The outdated checks of a polyglot repository (e.g. npm + pip + cargo)
+    run in parallel threads, so the call takes as long as the slowest one.
+
+    Args:
+        repo_path: Path to the repository
+        repo_url: Repository URL for caching (optional)
+
+    Returns:
+        JSON string with the primary package manager's outdated packages and
+        a package_managers list with the result of every detected manager
+    """
+    try:
+        repo_path = Path(repo_path).resolve()
+        repo_files, nested_files = _repo_file_names(repo_path)
+    except OSError as e:
+        return json.dumps(
+            {"status": "error", "message": f"Error reading repository: {str(e)}"}
+        )
+
+    detected = [
+        json.loads(_detection_result(language, pm_name))
+        for language, pm_name in _detect_languages(repo_files, nested_files)
+    ]
+    if not detected:
+        return json.dumps({"status": "error", "message": "No package manager detected"})
+
+    def check(detected_info: dict) -> Dict:
+        result = {
+            "language": detected_info["language"],
+            "package_manager": detected_info["package_manager"],
+            "build_command": detected_info["build_command"],
+        }
+        if not detected_info["outdated_command"]:
+            result["error"] = "No outdated command defined"
+            return result
+        try:
+            outdated_list = _find_outdated(repo_path, detected_info)
+        except subprocess.TimeoutExpired:
+            result["error"] = "Outdated command timed out"
+            return result
+        except Exception as e:
+            result["error"] = f"Error checking outdated dependencies: {str(e)}"
+            return result
+        result["outdated_count"] = len(outdated_list)
+        result["outdated_packages"] = outdated_list
+        return result
+
+    with ThreadPoolExecutor(max_workers=len(detected)) as executor:
+        results = list(executor.map(check, detected))
+
+    primary = results[0]
+    result_data = {
+        "status": "error" if "error" in primary else "success",
+        "language": primary["language"],
+        "package_manager": primary["package_manager"],
+        "outdated_count": primary.get("outdated_count", 0),
+        "outdated_packages": primary.get("outdated_packages", []),
+        "package_managers": results,
+        "from_cache": False,
+    }
+    if "error" in primary:
+        result_data["message"] = primary["error"]
+    elif repo_url:
+        try:
+            get_cache().cache_outdated(repo_url, result_data)
+        except Exception:
+            pass  # ignore caching errors
+
+    return serialization.dumps(result_data)
+
+
+def _manifest_candidates() -> List[str]:
+    """List root manifest file names from the language map (wildcards excluded)."""
+    candidates = []
+    for lang_cfg in LanguageMap.LANGUAGE_PACKAGE_BUILD_MAP.values():
+        for name in lang_cfg.get("detect_files", []):
+            if "*" not in name and name not in candidates:
+                candidates.append(name)
+    return candidates
+
+
+def _match_manifests(entries) -> List[str]:
+    """Pick the root entries that are manifests in the language map."""
+    patterns = [
+        pattern
+        for lang_cfg in LanguageMap.LANGUAGE_PACKAGE_BUILD_MAP.values()
+        for pattern in lang_cfg.get("detect_files", [])
+    ]
+    return sorted(
+        name
+        for name in entries
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    )
+
+
+async def _list_root_entries(repo: str) -> Optional[FrozenSet[str]]:
+    """
+    List the files at the root of a GitHub repository with the contents API.
+
+    Args:
+        repo: Repository in 'owner/repo' format
+
+    Returns:
+        Root-level file names, or None if the listing failed (e.g. rate limited)
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    async with httpx.AsyncClient(timeout=10, headers=headers) as client:
+        try:
+            response = await client.get(GITHUB_CONTENTS_URL.format(repo=repo))
+            response.raise_for_status()
+            return frozenset(
+                entry["name"] for entry in response.json() if entry["type"] == "file"
+            )
+        except (httpx.HTTPError, ValueError, KeyError, TypeError):
+            return None
+
+
+async def _fetch_raw_files(repo: str, files: List[str]) -> Dict[str, str]:
+    """
+    Fetch files from a GitHub repository's default branch concurrently.
+
+    Args:
+        repo: Repository in 'owner/repo' format
+        files: Paths relative to the repository root
+
+    Returns:
+        Mapping of path to contents for the files that exist
+    """
+
+    async def fetch(client: httpx.AsyncClient, path: str) -> Tuple[str, Optional[str]]:
+        try:
+            response = await client.get(GITHUB_RAW_URL.format(repo=repo, path=path))
+        except httpx.HTTPError:
+            return path, None
+        return path, response.text if response.status_code == 200 else None
+
+    async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+        results = await asyncio.gather(*(fetch(client, path) for path in files))
+    return {path: content for path, content in results if content is not None}
+
+
+@tool
+def fetch_manifests(repo: str) -> str:
+    """
+    Fetch a GitHub repository's dependency manifests over HTTPS without cloning.
+
+    Args:
+        repo: Repository in 'owner/repo' format or a https://github.com URL
+
+    Returns:
+        JSON string with the manifest files found, their contents and the
+        detected package managers
+    """
+    slug = repo.strip().rstrip("/")
+    if slug.startswith(("https://github.com/", "http://github.com/")):
+        slug = slug.split("github.com/", 1)[1]
+    slug = slug.removesuffix(".git")
+
+    if slug.count("/") != 1:
+        return json.dumps(
+            {"status": "error", "message": f"Not a GitHub repository: {repo}"}
+        )
+
+    try:
+        # One directory listing tells which manifests exist, so only those
+        # are downloaded; without it every known manifest name is probed.
+        entries = asyncio.run(_list_root_entries(slug))
+        if entries is None:
+            candidates = _manifest_candidates()
+        else:
+            candidates = _match_manifests(entries)
+        files = asyncio.run(_fetch_raw_files(slug, candidates)) if candidates else {}
+    except Exception as e:
+        return json.dumps(
+            {"status": "error", "message": f"Error fetching manifests: {str(e)}"}
+        )
+
+    package_managers = [
+        {"language": language, "package_manager": pm_name}
+        for language, pm_name in _detect_languages(entries or files.keys())
+    ]
+    return serialization.dumps(
+        {
+            "status": "success",
+            "repository": slug,
+            "files": files,
+            "package_managers": package_managers,
+        }
+    )
 
 
 @tool
@@ -391,6 +942,14 @@ def cleanup_repository(repo_path: str) -> str:
         Confirmation message
     """
     try:
+        # Checkouts created by clone_repository are removed by their
+        # recorded path; anything else must match a known temp prefix.
+        ctx = _contexts.pop(str(Path(repo_path).resolve()), None)
+        if ctx is not None and ctx.path.exists():
+            shutil.rmtree(ctx.path)
+            return json.dumps(
+                {"status": "success", "message": f"Cleaned up {repo_path}"}
+            )
         if os.path.exists(repo_path) and (
             repo_path.startswith("/tmp/dep_analyzer_")
             or repo_path.startswith("/tmp/repo_check_")
@@ -408,35 +967,57 @@ def cleanup_repository(repo_path: str) -> str:
         )
 
 
-def create_dependency_analyzer_agent():
-    """
-    Create the dependency analyzer agent.
-    """
-    tools = [
-        clone_repository,
-        detect_package_manager,
-        read_dependency_file,
-        check_outdated_dependencies,
-    ]
-
-    system_message = """You are a dependency analysis agent. Your job: clone a repo, detect its package manager, and check for outdated dependencies.
+_SYSTEM_PROMPT = """You are a dependency analysis agent. Your job: clone a repo, detect its package manager, and check for outdated dependencies.
 
 Execute these steps IN ORDER. Do NOT skip steps or add extra steps.
 
 STEP 1: Clone the repository using clone_repository.
-STEP 2: Detect the package manager using detect_package_manager with the repo_path from step 1.
-STEP 3: Check outdated dependencies using check_outdated_dependencies with the repo_path and detected_info from step 2.
-STEP 4: Return a SHORT JSON summary. Do NOT write a long report.
+STEP 2: Detect the package managers and check outdated dependencies using check_all_outdated with the repo_path from step 1.
+STEP 3: Return a SHORT JSON summary. Do NOT write a long report.
 
 IMPORTANT RULES:
 - Do NOT clean up or delete the repository. It will be used by the next agent.
-- Do NOT call read_dependency_file unless check_outdated_dependencies fails.
+- Do NOT read dependency files unless check_all_outdated fails. If it does, read ALL the files you need in a single read_dependency_files call.
+- If clone_repository fails for a GitHub repository, call fetch_manifests with "owner/repo" instead and report the package managers and manifests found with repo_path set to null.
 - Keep ALL your text responses under 50 words. No explanations, no analysis, no commentary.
 - Your final response MUST be ONLY this JSON and nothing else:
 {"repo_path": "...", "package_manager": "...", "outdated_count": N, "outdated_packages": [...]}"""
 
-    llm = ChatAnthropic(model="claude-sonnet-4-5-20250929", temperature=0)
 
-    agent_executor = create_agent(llm, tools, system_prompt=system_message)
+# Tools registered with the analyzer agent
+_TOOLS = (
+    clone_repository,
+    check_all_outdated,
+    read_dependency_file,
+    read_dependency_files,
+    fetch_manifests,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def create_dependency_analyzer_agent(
+    model: str = ANALYZER_MODEL, temperature: float = 0
+):
+    """
+    Create the dependency analyzer agent.
+
+    Cached per (model, temperature) so every analyze_repository call reuses
+    the same agent and LLM client.
+
+    Args:
+        model: Anthropic model name
+        temperature: Sampling temperature
+
+    Returns:
+        Compiled analyzer agent
+    """
+    from langchain.agents import create_agent
+    from langchain_anthropic import ChatAnthropic
+
+    llm = ChatAnthropic(model=model, temperature=temperature)
+
+    agent_executor = create_agent(
+        llm, list(_TOOLS), system_prompt=cached_system_prompt(_SYSTEM_PROMPT)
+    )
 
     return agent_executor
@@ -10,6 +10,7 @@ Complete workflow:
 5. Create PR (success) or Issue (failure)
 """
 
+import functools
 import json
 import os
 import subprocess
@@ -17,18 +18,24 @@ import sys
 from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
-from langchain.agents import create_agent
-from langchain_anthropic import ChatAnthropic
 from langchain_core.tools import tool
 
 # Import sub-agents and tools
-from src.agents.analyzer import create_dependency_analyzer_agent
+from src.agents.analyzer import create_dependency_analyzer_agent, track_checkouts
 from src.agents.updater import create_smart_updater_agent
 from src.callbacks.agent_activity import AgentActivityHandler
+from src.tools.dependency_ops import prefetch_rollback_versions
+from src.utils import serialization
+from src.utils.llm import cached_system_prompt
 
 # Load environment variables
 load_dotenv()
 
+# Upper bound on tool calls from one model turn that an agent runs at once.
+# create_agent executes a turn's tool calls concurrently on a thread pool;
+# this is passed as the run's max_concurrency to keep that fan-out polite.
+TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", "5"))
+
 # Module-level reference to the current orchestrator handler so child tools
 # can register their sub-agent handlers for aggregated cost tracking.
 _current_orchestrator_handler: Optional[AgentActivityHandler] = None
@@ -63,12 +70,17 @@ def analyze_repository(repo_url: str) -> str:
                     )
                 ]
             },
-            config={"callbacks": [handler]},
+            # The analyzer needs at most ~6 tool calls; fail fast if it loops
+            config={
+                "callbacks": [handler],
+                "recursion_limit": 15,
+                "max_concurrency": TOOL_MAX_CONCURRENCY,
+            },
         )
 
         final_message = result["messages"][-1]
 
-        return json.dumps(
+        return serialization.dumps(
             {
                 "status": "success",
                 "repo_url": repo_url,
@@ -100,6 +112,9 @@ def smart_update_and_test(
     try:
         print(f"\nStep 2: Applying updates and testing...")
 
+        # Speculatively warm the registry cache used by major-update rollbacks
+        prefetch_rollback_versions(outdated_packages, package_manager)
+
         updater_agent = create_smart_updater_agent()
         handler = AgentActivityHandler("updater")
 
@@ -128,12 +143,18 @@ Return the final PR URL or Issue URL.""",
                     )
                 ]
             },
-            config={"callbacks": [handler], "recursion_limit": 50},
+            config={
+                "callbacks": [handler],
+                "recursion_limit": 50,
+                "max_concurrency": TOOL_MAX_CONCURRENCY,
+            },
         )
 
         final_message = result["messages"][-1]
 
-        return json.dumps({"status": "success", "result": final_message.content})
+        return serialization.dumps(
+            {"status": "success", "result": final_message.content}
+        )
 
     except Exception as e:
         return json.dumps(
@@ -184,13 +205,7 @@ def validate_prerequisites() -> tuple[bool, str]:
     return True, "All prerequisites validated successfully"
 
 
-def create_main_orchestrator():
-    """
-    Create the main orchestrator agent that coordinates the entire workflow.
-    """
-    tools = [analyze_repository, smart_update_and_test]
-
-    system_message = """You are the orchestrator for automated dependency updates. Follow this EXACT workflow:
+_SYSTEM_PROMPT = """You are the orchestrator for automated dependency updates. Follow this EXACT workflow:
 
 STEP 1: Call analyze_repository with the repository URL.
 - Extract from the result: repo_path, package_manager, and the outdated_packages list.
@@ -212,9 +227,26 @@ IMPORTANT RULES:
 - Keep ALL your text responses under 50 words. No analysis, no reports, no summaries of intermediate results.
 - When calling smart_update_and_test, pass the outdated_packages as a compact JSON string — do NOT reformat or annotate them."""
 
+
+@functools.lru_cache(maxsize=1)
+def create_main_orchestrator():
+    """
+    Create the main orchestrator agent that coordinates the entire workflow.
+
+    Built once per process: the compiled graph keeps no per-run state, so
+    concurrent jobs share the same instance.
+    """
+    tools = [analyze_repository, smart_update_and_test]
+
+    # Deferred: slow to import and only needed to build the agent
+    from langchain.agents import create_agent
+    from langchain_anthropic import ChatAnthropic
+
     llm = ChatAnthropic(model="claude-sonnet-4-5-20250929", temperature=0)
 
-    agent_executor = create_agent(llm, tools, system_prompt=system_message)
+    agent_executor = create_agent(
+        llm, tools, system_prompt=cached_system_prompt(_SYSTEM_PROMPT)
+    )
 
     return agent_executor
 
@@ -290,17 +322,21 @@ Prerequisites:
     _current_orchestrator_handler = handler
 
     try:
-        result = orchestrator.invoke(
-            {
-                "messages": [
-                    (
-                        "user",
-                        f"Automatically update dependencies for repository: {repo_url}",
-                    )
-                ]
-            },
-            config={"callbacks": [handler]},
-        )
+        with track_checkouts():
+            result = orchestrator.invoke(
+                {
+                    "messages": [
+                        (
+                            "user",
+                            f"Automatically update dependencies for repository: {repo_url}",
+                        )
+                    ]
+                },
+                config={
+                    "callbacks": [handler],
+                    "max_concurrency": TOOL_MAX_CONCURRENCY,
+                },
+            )
 
         print("\n" + "=" * 80)
         print("  FINAL RESULT")
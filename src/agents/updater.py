@@ -6,7 +6,7 @@ Intelligently updates dependencies with automatic testing and rollback capabilit
 Tests updates, identifies breaking changes, and creates PRs or Issues accordingly.
 """
 
-import json
+import functools
 import os
 import shutil
 import subprocess
@@ -14,11 +14,15 @@ import sys
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
 
 from dotenv import load_dotenv
-from langchain.agents import create_agent
-from langchain_anthropic import ChatAnthropic
 from langchain_core.tools import tool
 
 # Load environment variables
@@ -29,9 +33,12 @@ from src.tools.dependency_ops import (
     apply_all_updates,
     categorize_updates,
     get_latest_version_for_major,
+    get_latest_versions_for_majors,
     parse_error_for_dependency,
     rollback_major_update,
 )
+from src.utils import serialization
+from src.utils.llm import cached_system_prompt
 
 # Stores build/test logs captured by run_build_test for the PR body.
 # detect_build_command populates _detected_commands; run_build_test uses it
@@ -53,6 +60,99 @@ _NO_TESTS_PATTERNS = [
 ]
 
 
+# Commands detect_build_command reports for each non-npm project setup
+# (npm/yarn/pnpm commands are derived from package.json scripts instead)
+_BUILD_COMMANDS: Mapping[str, Mapping[str, str]] = MappingProxyType(
+    {
+        setup: MappingProxyType(commands)
+        for setup, commands in {
+            "poetry": {
+                "package_manager": "poetry",
+                "install": "poetry install",
+                "build": "poetry install",
+                "test": "poetry run pytest",
+            },
+            "uv": {
+                "package_manager": "uv",
+                "install": "uv sync",
+                "build": "uv sync",
+                "test": "uv run pytest",
+            },
+            "pdm": {
+                "package_manager": "pdm",
+                "install": "pdm install",
+                "build": "pdm install",
+                "test": "pdm run pytest",
+            },
+            "hatch": {
+                "package_manager": "hatch",
+                "install": "pip install .",
+                "build": "hatch build",
+                "test": "hatch test",
+            },
+            "pipenv": {
+                "package_manager": "pipenv",
+                "install": "pipenv install",
+                "build": "pipenv install",
+                "test": "pipenv run pytest",
+            },
+            "pip": {
+                "package_manager": "pip",
+                "install": "pip install -r requirements.txt",
+                "build": "pip install -r requirements.txt",
+                "test": "pytest",
+            },
+            # PEP 621 [project] or other build backend without requirements.txt
+            "pip-project": {
+                "package_manager": "pip",
+                "install": "pip install .",
+                "build": "pip install .",
+                "test": "pytest",
+            },
+            "cargo": {
+                "package_manager": "cargo",
+                "build": "cargo build",
+                "test": "cargo test",
+                "lint": "cargo clippy",
+            },
+            "go": {
+                "package_manager": "go",
+                "build": "go build ./...",
+                "test": "go test ./...",
+                "lint": "go vet ./...",
+            },
+            "bundler": {
+                "package_manager": "bundler",
+                "install": "bundle install",
+                "test": "bundle exec rspec",
+            },
+            "composer": {
+                "package_manager": "composer",
+                "install": "composer install",
+                "test": "composer test",
+            },
+        }.items()
+    }
+)
+
+
+def _load_pyproject(path: str) -> dict:
+    """
+    Parse a pyproject.toml file.
+
+    Args:
+        path: Path to pyproject.toml
+
+    Returns:
+        Parsed TOML data, or an empty dict if the file is not valid TOML
+    """
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except tomllib.TOMLDecodeError:
+        return {}
+
+
 @tool
 def detect_build_command(repo_path: str) -> str:
     """
@@ -74,16 +174,20 @@ def detect_build_command(repo_path: str) -> str:
             "type_check": None,
         }
 
+        # One directory listing instead of a stat per candidate file
+        with os.scandir(repo_path) as it:
+            root_files = {entry.name for entry in it if entry.is_file()}
+
         # JavaScript/TypeScript - npm/yarn/pnpm
-        if os.path.exists(os.path.join(repo_path, "package.json")):
+        if "package.json" in root_files:
             with open(os.path.join(repo_path, "package.json"), "r") as f:
-                package_json = json.load(f)
+                package_json = serialization.loads(f.read())
                 scripts = package_json.get("scripts", {})
 
             # Detect package manager
-            if os.path.exists(os.path.join(repo_path, "pnpm-lock.yaml")):
+            if "pnpm-lock.yaml" in root_files:
                 pm = "pnpm"
-            elif os.path.exists(os.path.join(repo_path, "yarn.lock")):
+            elif "yarn.lock" in root_files:
                 pm = "yarn"
             else:
                 pm = "npm"
@@ -102,68 +206,47 @@ def detect_build_command(repo_path: str) -> str:
                 commands["type_check"] = f"{pm} run type-check"
 
         # Python - pip/poetry/pipenv
-        elif os.path.exists(os.path.join(repo_path, "pyproject.toml")):
-            with open(os.path.join(repo_path, "pyproject.toml"), "r") as f:
-                content = f.read()
-            if "[tool.poetry]" in content:
-                commands["package_manager"] = "poetry"
-                commands["install"] = "poetry install"
-                commands["build"] = "poetry install"
-                commands["test"] = "poetry run pytest"
-            elif os.path.exists(os.path.join(repo_path, "Pipfile")):
-                commands["package_manager"] = "pipenv"
-                commands["install"] = "pipenv install"
-                commands["build"] = "pipenv install"
-                commands["test"] = "pipenv run pytest"
-            elif os.path.exists(os.path.join(repo_path, "requirements.txt")):
-                commands["package_manager"] = "pip"
-                commands["install"] = "pip install -r requirements.txt"
-                commands["build"] = "pip install -r requirements.txt"
-                commands["test"] = "pytest"
+        elif "pyproject.toml" in root_files:
+            tool_cfg = _load_pyproject(os.path.join(repo_path, "pyproject.toml")).get(
+                "tool", {}
+            )
+            if "poetry" in tool_cfg:
+                setup = "poetry"
+            elif "uv" in tool_cfg or "uv.lock" in root_files:
+                setup = "uv"
+            elif "pdm" in tool_cfg:
+                setup = "pdm"
+            elif "hatch" in tool_cfg:
+                setup = "hatch"
+            elif "Pipfile" in root_files:
+                setup = "pipenv"
+            elif "requirements.txt" in root_files:
+                setup = "pip"
             else:
-                # pyproject.toml without poetry — assume pip
-                commands["package_manager"] = "pip"
-                commands["install"] = "pip install ."
-                commands["build"] = "pip install ."
-                commands["test"] = "pytest"
-
-        elif os.path.exists(os.path.join(repo_path, "Pipfile")):
-            commands["package_manager"] = "pipenv"
-            commands["install"] = "pipenv install"
-            commands["build"] = "pipenv install"
-            commands["test"] = "pipenv run pytest"
-
-        elif os.path.exists(os.path.join(repo_path, "requirements.txt")):
-            commands["package_manager"] = "pip"
-            commands["install"] = "pip install -r requirements.txt"
-            commands["build"] = "pip install -r requirements.txt"
-            commands["test"] = "pytest"
+                setup = "pip-project"
+            commands.update(_BUILD_COMMANDS[setup])
+
+        elif "Pipfile" in root_files:
+            commands.update(_BUILD_COMMANDS["pipenv"])
+
+        elif "requirements.txt" in root_files:
+            commands.update(_BUILD_COMMANDS["pip"])
 
         # Rust - Cargo
-        elif os.path.exists(os.path.join(repo_path, "Cargo.toml")):
-            commands["package_manager"] = "cargo"
-            commands["build"] = "cargo build"
-            commands["test"] = "cargo test"
-            commands["lint"] = "cargo clippy"
+        elif "Cargo.toml" in root_files:
+            commands.update(_BUILD_COMMANDS["cargo"])
 
         # Go
-        elif os.path.exists(os.path.join(repo_path, "go.mod")):
-            commands["package_manager"] = "go"
-            commands["build"] = "go build ./..."
-            commands["test"] = "go test ./..."
-            commands["lint"] = "go vet ./..."
+        elif "go.mod" in root_files:
+            commands.update(_BUILD_COMMANDS["go"])
 
         # Ruby
-        elif os.path.exists(os.path.join(repo_path, "Gemfile")):
-            commands["package_manager"] = "bundler"
-            commands["install"] = "bundle install"
-            commands["test"] = "bundle exec rspec"
+        elif "Gemfile" in root_files:
+            commands.update(_BUILD_COMMANDS["bundler"])
 
         # PHP
-        elif os.path.exists(os.path.join(repo_path, "composer.json")):
-            commands["package_manager"] = "composer"
-            commands["install"] = "composer install"
-            commands["test"] = "composer test"
+        elif "composer.json" in root_files:
+            commands.update(_BUILD_COMMANDS["composer"])
 
         # Store detected commands so run_build_test can classify logs
         _detected_commands["build"] = commands.get("build")
@@ -173,10 +256,12 @@ def detect_build_command(repo_path: str) -> str:
         _test_info["has_tests"] = True
         _test_info["exit_code"] = None
 
-        return json.dumps({"status": "success", "commands": commands}, indent=2)
+        return serialization.dumps(
+            {"status": "success", "commands": commands}, indent=True
+        )
 
     except Exception as e:
-        return json.dumps(
+        return serialization.dumps(
             {"status": "error", "message": f"Error detecting build commands: {str(e)}"}
         )
 
@@ -195,22 +280,21 @@ def run_build_test(repo_path: str, command: str, timeout: int = 300) -> str:
         JSON with execution results (success/failure, stdout, stderr)
     """
     try:
-        original_dir = os.getcwd()
-        os.chdir(repo_path)
-
         result = subprocess.run(
-            command, shell=True, capture_output=True, text=True, timeout=timeout
+            command,
+            shell=True,
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
         )
 
-        os.chdir(original_dir)
-
         stdout_tail = result.stdout[-5000:] if result.stdout else ""
         stderr_tail = result.stderr[-5000:] if result.stderr else ""
 
         # Capture logs for build/test commands to include in PR body
-        combined = (stdout_tail + "\n" + stderr_tail).strip()
-        log_entry = f"$ {command}\n"
-        log_entry += combined if combined else f"exit code: {result.returncode}"
+        combined = f"{stdout_tail}\n{stderr_tail}".strip()
+        log_entry = f"$ {command}\n{combined or f'exit code: {result.returncode}'}"
         if command == _detected_commands.get("build"):
             _build_test_logs["build"] = log_entry
         if command == _detected_commands.get("test"):
@@ -221,7 +305,7 @@ def run_build_test(repo_path: str, command: str, timeout: int = 300) -> str:
             if any(pat in combined_lower for pat in _NO_TESTS_PATTERNS):
                 _test_info["has_tests"] = False
 
-        return json.dumps(
+        return serialization.dumps(
             {
                 "status": "success",
                 "command": command,
@@ -230,12 +314,11 @@ def run_build_test(repo_path: str, command: str, timeout: int = 300) -> str:
                 "stdout": stdout_tail,
                 "stderr": stderr_tail,
             },
-            indent=2,
+            indent=True,
         )
 
     except subprocess.TimeoutExpired:
-        os.chdir(original_dir)
-        return json.dumps(
+        return serialization.dumps(
             {
                 "status": "error",
                 "command": command,
@@ -243,8 +326,7 @@ def run_build_test(repo_path: str, command: str, timeout: int = 300) -> str:
             }
         )
     except Exception as e:
-        os.chdir(original_dir)
-        return json.dumps(
+        return serialization.dumps(
             {
                 "status": "error",
                 "command": command,
@@ -271,7 +353,7 @@ def write_dependency_file(repo_path: str, file_name: str, content: str) -> str:
         with open(file_path, "w") as f:
             f.write(content)
 
-        return json.dumps(
+        return serialization.dumps(
             {
                 "status": "success",
                 "file": file_name,
@@ -281,7 +363,7 @@ def write_dependency_file(repo_path: str, file_name: str, content: str) -> str:
         )
 
     except Exception as e:
-        return json.dumps(
+        return serialization.dumps(
             {"status": "error", "message": f"Error writing file: {str(e)}"}
         )
 
@@ -327,16 +409,13 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
         kwargs = kwargs["kwargs"]
 
     try:
-        original_dir = os.getcwd()
-        os.chdir(repo_path)
-
         if operation == "get_remote_url":
             result = subprocess.run(
                 ["git", "config", "--get", "remote.origin.url"],
                 capture_output=True,
                 text=True,
+                cwd=repo_path,
             )
-            os.chdir(original_dir)
 
             if result.returncode == 0:
                 url = result.stdout.strip()
@@ -347,7 +426,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                 else:
                     repo_name = url
 
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "success",
                         "operation": "get_remote_url",
@@ -356,7 +435,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                     }
                 )
             else:
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "error",
                         "operation": "get_remote_url",
@@ -365,11 +444,10 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                 )
 
         elif operation == "create_branch":
-            os.chdir(original_dir)
             try:
                 owner, repo = _get_repo_owner_name(repo_path)
             except ValueError as e:
-                return json.dumps(
+                return serialization.dumps(
                     {"status": "error", "operation": "create_branch", "message": str(e)}
                 )
 
@@ -384,7 +462,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
             result = _run_mcp_call(_create_branch, owner, repo, branch_name)
 
             if result["status"] == "success":
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "success",
                         "operation": "create_branch",
@@ -392,7 +470,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                     }
                 )
             else:
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "error",
                         "operation": "create_branch",
@@ -404,8 +482,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
             try:
                 owner, repo = _get_repo_owner_name(repo_path)
             except ValueError as e:
-                os.chdir(original_dir)
-                return json.dumps(
+                return serialization.dumps(
                     {"status": "error", "operation": "push_files", "message": str(e)}
                 )
 
@@ -413,8 +490,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
             message = kwargs.get("message", "chore: update dependencies")
 
             if not branch_name:
-                os.chdir(original_dir)
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "error",
                         "operation": "push_files",
@@ -427,12 +503,14 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                 ["git", "diff", "--name-only"],
                 capture_output=True,
                 text=True,
+                cwd=repo_path,
             )
             # Also check untracked files
             untracked_result = subprocess.run(
                 ["git", "ls-files", "--others", "--exclude-standard"],
                 capture_output=True,
                 text=True,
+                cwd=repo_path,
             )
 
             changed_files = []
@@ -446,8 +524,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                     all_paths.add(line.strip())
 
             if not all_paths:
-                os.chdir(original_dir)
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "no_changes",
                         "operation": "push_files",
@@ -467,8 +544,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                     continue
 
             if not changed_files:
-                os.chdir(original_dir)
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "no_changes",
                         "operation": "push_files",
@@ -476,8 +552,6 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                     }
                 )
 
-            os.chdir(original_dir)
-
             async def _push_files(server, o, r, b, f, m):
                 return await server.push_files(o, r, b, f, m)
 
@@ -486,7 +560,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
             )
 
             if result["status"] == "success":
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "success",
                         "operation": "push_files",
@@ -496,7 +570,7 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                     }
                 )
             else:
-                return json.dumps(
+                return serialization.dumps(
                     {
                         "status": "error",
                         "operation": "push_files",
@@ -505,17 +579,12 @@ def git_operations(repo_path: str, operation: str, **kwargs) -> str:
                 )
 
         else:
-            os.chdir(original_dir)
-            return json.dumps(
+            return serialization.dumps(
                 {"status": "error", "message": f"Unknown operation: {operation}"}
             )
 
     except Exception as e:
-        try:
-            os.chdir(original_dir)
-        except Exception:
-            pass
-        return json.dumps(
+        return serialization.dumps(
             {
                 "status": "error",
                 "operation": operation,
@@ -588,24 +657,24 @@ def create_github_pr(
     try:
         parts = repo_name.split("/")
         if len(parts) != 2:
-            return json.dumps(
+            return serialization.dumps(
                 {"status": "error", "message": f"Invalid repo format: {repo_name}"}
             )
 
         # Append build/test logs to PR body automatically
-        log_section = "\n\n---\n\nAll updates have been tested and verified:\n"
+        log_parts = ["\n\n---\n\nAll updates have been tested and verified:\n"]
         build_log = _build_test_logs.get("build")
         test_log = _build_test_logs.get("test")
         has_tests = _test_info.get("has_tests", True)
         has_test_command = _detected_commands.get("test") is not None
         if build_log:
-            log_section += (
+            log_parts.append(
                 f"\n:white_check_mark: Build successful\n"
                 f"<details><summary>Build logs</summary>\n\n"
                 f"```\n{build_log}\n```\n\n</details>\n"
             )
         if test_log and has_tests:
-            log_section += (
+            log_parts.append(
                 f"\n:white_check_mark: Tests passing\n"
                 f"<details><summary>Test logs</summary>\n\n"
                 f"```\n{test_log}\n```\n\n</details>\n"
@@ -613,25 +682,25 @@ def create_github_pr(
         if build_log or (test_log and has_tests):
             # Add merge recommendation
             if has_tests:
-                log_section += (
+                log_parts.append(
                     "\n:rocket: **This PR is safe to merge.** "
                     "All dependency updates have been verified with a successful build and passing tests.\n"
                 )
             elif has_test_command and not has_tests:
-                log_section += (
+                log_parts.append(
                     "\n:warning: **No unit tests were found in this repository.** "
                     "The build succeeded, but there are no tests to verify runtime behavior. "
                     "Consider adding unit tests to catch potential issues from dependency updates.\n"
                     "\n:rocket: **This PR can be merged**, but we strongly recommend adding tests for better safety.\n"
                 )
             else:
-                log_section += (
+                log_parts.append(
                     "\n:warning: **No test command is configured for this project.** "
                     "The build succeeded, but no tests were run. "
                     "Consider adding unit tests to catch potential runtime issues from dependency updates.\n"
                     "\n:rocket: **This PR can be merged**, but we strongly recommend adding tests for better safety.\n"
                 )
-            body = body + log_section
+            body = "".join([body, *log_parts])
 
         async def _create_pr(server, owner, repo, t, b, head, base):
             return await server.create_pull_request(
@@ -659,7 +728,7 @@ def create_github_pr(
             # Fallback: pr_url at top level (old client format)
             if not pr_url:
                 pr_url = result.get("pr_url", "")
-            return json.dumps(
+            return serialization.dumps(
                 {
                     "status": "success",
                     "pr_url": pr_url,
@@ -667,12 +736,12 @@ def create_github_pr(
                 }
             )
         else:
-            return json.dumps(
+            return serialization.dumps(
                 {"status": "error", "message": result.get("message", "Unknown error")}
             )
 
     except Exception as e:
-        return json.dumps(
+        return serialization.dumps(
             {"status": "error", "message": f"Error creating PR via MCP: {str(e)}"}
         )
 
@@ -696,7 +765,7 @@ def create_github_issue(
     try:
         parts = repo_name.split("/")
         if len(parts) != 2:
-            return json.dumps(
+            return serialization.dumps(
                 {"status": "error", "message": f"Invalid repo format: {repo_name}"}
             )
 
@@ -727,7 +796,7 @@ def create_github_issue(
                     issue_url = data["url"]
             if not issue_url:
                 issue_url = result.get("issue_url", "")
-            return json.dumps(
+            return serialization.dumps(
                 {
                     "status": "success",
                     "issue_url": issue_url,
@@ -735,35 +804,17 @@ def create_github_issue(
                 }
             )
         else:
-            return json.dumps(
+            return serialization.dumps(
                 {"status": "error", "message": result.get("message", "Unknown error")}
             )
 
     except Exception as e:
-        return json.dumps(
+        return serialization.dumps(
             {"status": "error", "message": f"Error creating issue via MCP: {str(e)}"}
         )
 
 
-def create_smart_updater_agent():
-    """
-    Create the smart dependency updater agent with testing and rollback capabilities.
-    """
-    tools = [
-        detect_build_command,
-        run_build_test,
-        write_dependency_file,
-        git_operations,
-        create_github_pr,
-        create_github_issue,
-        apply_all_updates,
-        rollback_major_update,
-        parse_error_for_dependency,
-        categorize_updates,
-        get_latest_version_for_major,
-    ]
-
-    system_message = """You are a dependency update agent. Follow this EXACT workflow. Do NOT deviate or add extra steps.
+_SYSTEM_PROMPT = """You are a dependency update agent. Follow this EXACT workflow. Do NOT deviate or add extra steps.
 
 STEP 1: DETECT BUILD COMMANDS
 - Call detect_build_command with the repo_path.
@@ -825,10 +876,12 @@ STEP 4: HANDLE RESULTS
   2. Return the Issue URL.
 
 IMPORTANT RULES:
+- Tool calls that do not depend on each other's results run in parallel when issued in the SAME turn. Plan in waves: call detect_build_command together with apply_all_updates (one per dependency file), then call write_dependency_file for every updated file in one turn.
 - Do NOT call get_remote_url — create_branch and push_files auto-detect the repo.
 - Do NOT use "commit" or "push" operations. Use "push_files" instead.
 - Do NOT run exploratory or inspection commands via run_build_test. FORBIDDEN commands include: cat, grep, ls, head, tail, pip list, pip freeze, pip show, go list, npm ls, cargo tree, or any command that reads/inspects files or package state.
 - Do NOT call categorize_updates — the orchestrator already did that.
+- To find the latest version within a major line for more than one package, call get_latest_versions_for_majors ONCE with all of them instead of get_latest_version_for_major per package.
 - Do NOT re-read dependency files to inspect them. Trust the tool outputs.
 - Do NOT create lock files (requirements-lock.txt, etc.). Only modify the dependency file identified by the package manager.
 - Keep ALL your text responses under 50 words. Just state what you're doing next or the final result.
@@ -840,9 +893,38 @@ IMPORTANT RULES:
 - If create_github_issue fails (e.g., permission denied on a forked repo), return:
   {"status": "issue_failed", "message": "<error>", "details": "<the issue body you tried to create>"}"""
 
+
+@functools.lru_cache(maxsize=1)
+def create_smart_updater_agent():
+    """
+    Create the smart dependency updater agent with testing and rollback capabilities.
+
+    Cached so every smart_update_and_test call reuses the same agent and
+    Anthropic client.
+    """
+    tools = [
+        detect_build_command,
+        run_build_test,
+        write_dependency_file,
+        git_operations,
+        create_github_pr,
+        create_github_issue,
+        apply_all_updates,
+        rollback_major_update,
+        parse_error_for_dependency,
+        categorize_updates,
+        get_latest_version_for_major,
+        get_latest_versions_for_majors,
+    ]
+
+    from langchain.agents import create_agent
+    from langchain_anthropic import ChatAnthropic
+
     llm = ChatAnthropic(model="claude-sonnet-4-5-20250929", temperature=0)
 
-    agent_executor = create_agent(llm, tools, system_prompt=system_message)
+    agent_executor = create_agent(
+        llm, tools, system_prompt=cached_system_prompt(_SYSTEM_PROMPT)
+    )
 
     return agent_executor
 
@@ -0,0 +1,271 @@
+"""
+Repository update job runner.
+Shared by the in-process API fallback and the ARQ worker so both execute
+the exact same orchestrator workflow.
+"""
+
+import asyncio
+import json
+import os
+import zlib
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.agents.analyzer import track_checkouts
+from src.agents.orchestrator import (
+    TOOL_MAX_CONCURRENCY,
+    create_main_orchestrator,
+    validate_prerequisites,
+)
+
+# Seconds the ARQ worker lets a repository update run before cancelling it
+JOB_TIMEOUT = 1800
+
+# Redis key marking a repository as having an active queued or running job.
+# The API sets it with JOB_LOCK_TTL, which leaves room for waiting behind other
+# jobs in the queue; the worker resets it to JOB_RUN_LOCK_TTL when the job
+# starts, so the lock outlives the run however long it was queued.
+JOB_LOCK_KEY = "job:lock:{repository}"
+JOB_LOCK_TTL = 2 * JOB_TIMEOUT
+JOB_RUN_LOCK_TTL = JOB_TIMEOUT + 60
+
+# Only the tail of the orchestrator's final message is kept, zlib-compressed,
+# so long-lived job records stay small
+OUTPUT_TAIL_CHARS = 8192
+
+# Bounds how many orchestrator runs share the default thread pool at once.
+# Created lazily so it binds to the running event loop.
+_job_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_job_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide job concurrency limiter."""
+    global _job_semaphore
+    if _job_semaphore is None:
+        _job_semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_JOBS", "4")))
+    return _job_semaphore
+
+
+def compress_output(text: str) -> bytes:
+    """
+    Compress the tail of an orchestrator message for storage.
+
+    Args:
+        text: Final orchestrator message
+
+    Returns:
+        zlib-compressed UTF-8 bytes of the last OUTPUT_TAIL_CHARS characters
+    """
+    return zlib.compress(text[-OUTPUT_TAIL_CHARS:].encode(), 6)
+
+
+def expand_result(result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Restore a stored job result for API responses.
+
+    Args:
+        result: Stored result, possibly holding compressed output_gz
+
+    Returns:
+        Copy of the result with output_gz decompressed into output
+    """
+    if not result or "output_gz" not in result:
+        return result
+    expanded = dict(result)
+    expanded["output"] = zlib.decompress(expanded.pop("output_gz")).decode()
+    return expanded
+
+
+def repository_key(repository: str) -> str:
+    """
+    Normalize a repository reference for de-duplicating concurrent jobs.
+
+    Args:
+        repository: 'owner/repo' or a GitHub URL
+
+    Returns:
+        Lowercase 'owner/repo' style key
+    """
+    key = repository.strip().rstrip("/").lower().removesuffix(".git")
+    for prefix in ("https://github.com/", "http://github.com/", "github.com/"):
+        if key.startswith(prefix):
+            return key[len(prefix) :]
+    return key
+
+
+class JobStore:
+    """
+    Bounded, async-safe in-memory job store.
+
+    All access goes through an asyncio.Lock and returns copies, so handlers
+    never observe a half-updated record. Records stay in creation order, so
+    list pages do not shift when a job changes state, and the oldest jobs
+    are evicted once max_jobs is exceeded.
+    """
+
+    def __init__(self, max_jobs: int = 10_000):
+        self._lock = asyncio.Lock()
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max = max_jobs
+
+    async def set(self, job_id: str, patch: Dict[str, Any]) -> None:
+        """
+        Create or update a job record.
+
+        Args:
+            job_id: Unique job identifier
+            patch: Fields to merge into the job record
+        """
+        async with self._lock:
+            record = self._data.get(job_id)
+            if record is None:
+                record = self._data[job_id] = {"job_id": job_id}
+            record.update(patch)
+            while len(self._data) > self._max:
+                self._data.popitem(last=False)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a copy of a job record.
+
+        Args:
+            job_id: Unique job identifier
+
+        Returns:
+            Job record, or None if the job is unknown or was evicted
+        """
+        async with self._lock:
+            record = self._data.get(job_id)
+            return dict(record) if record is not None else None
+
+    async def list(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Get copies of a page of job records, in creation order (oldest first).
+
+        Args:
+            offset: Number of records to skip
+            limit: Maximum number of records to return (all if None)
+
+        Returns:
+            Tuple of (total job count, job records in the page)
+        """
+        async with self._lock:
+            stop = None if limit is None else offset + limit
+            page = islice(self._data.values(), offset, stop)
+            return len(self._data), [dict(record) for record in page]
+
+
+async def run_repository_update(
+    job_id: str, repository: str, github_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run the orchestrator for a repository and collect the job outcome.
+
+    Args:
+        job_id: Unique job identifier
+        repository: Repository to process
+        github_token: GitHub token for API operations
+
+    Returns:
+        Job record with status, result, error, activity_log and usage
+    """
+    async with _get_job_semaphore():
+        return await _run_repository_update(job_id, repository, github_token)
+
+
+async def _run_repository_update(
+    job_id: str, repository: str, github_token: Optional[str]
+) -> Dict[str, Any]:
+    """Run a single repository update (see run_repository_update)."""
+    try:
+        # Validate prerequisites
+        print(f"[Job {job_id}] Validating prerequisites...")
+        is_valid, message = await asyncio.to_thread(validate_prerequisites)
+
+        if not is_valid:
+            return {"status": "failed", "error": message}
+
+        # Set GitHub token if provided
+        if github_token:
+            os.environ["GITHUB_PERSONAL_ACCESS_TOKEN"] = github_token
+
+        # Create orchestrator agent
+        print(f"[Job {job_id}] Creating orchestrator agent...")
+        agent = await asyncio.to_thread(create_main_orchestrator)
+
+        # Run the update process with activity logging
+        from src.callbacks.agent_activity import AgentActivityHandler
+
+        handler = AgentActivityHandler("orchestrator", job_id=job_id)
+
+        # Set module-level handler so child agents register for cost aggregation
+        import src.agents.orchestrator as orch_module
+
+        orch_module._current_orchestrator_handler = handler
+
+        print(f"[Job {job_id}] Processing repository: {repository}")
+
+        # Run agent.invoke() in a thread so it doesn't block the event loop.
+        # This is critical: MCP tool calls use run_coroutine_threadsafe() to
+        # schedule async MCP operations back on this event loop. If the loop
+        # is blocked by agent.invoke(), it deadlocks.
+        from src.agents.updater import set_main_event_loop
+
+        set_main_event_loop(asyncio.get_running_loop())
+        # asyncio.to_thread copies the context, so checkouts cloned by this
+        # job are tracked and removed however the run ends.
+        with track_checkouts():
+            result = await asyncio.to_thread(
+                agent.invoke,
+                {
+                    "messages": [
+                        (
+                            "user",
+                            f"Analyze and update dependencies for repository: {repository}",
+                        )
+                    ]
+                },
+                config={
+                    "callbacks": [handler],
+                    "max_concurrency": TOOL_MAX_CONCURRENCY,
+                },
+            )
+
+        usage_summary = handler.get_usage_summary()
+        final_message = result["messages"][-1].content if result.get("messages") else ""
+
+        # Try to parse structured JSON from orchestrator's final message
+        parsed_result = {
+            "output_gz": compress_output(final_message),
+            "repository": repository,
+        }
+        try:
+            result_json = json.loads(final_message)
+            parsed_result["status"] = result_json.get("status", "unknown")
+            if "url" in result_json:
+                parsed_result["url"] = result_json["url"]
+            if "message" in result_json:
+                parsed_result["message"] = result_json["message"]
+            if "details" in result_json:
+                parsed_result["details"] = result_json["details"]
+        except (json.JSONDecodeError, TypeError):
+            parsed_result["status"] = "completed"
+
+        print(
+            f"[Job {job_id}] Completed — Cost: ${usage_summary['estimated_cost_usd']:.4f} "
+            f"({usage_summary['total_tokens']:,} tokens, {usage_summary['llm_calls']} LLM calls)"
+        )
+
+        return {
+            "status": "completed",
+            "result": parsed_result,
+            "activity_log": handler.activity_log,
+            "usage": usage_summary,
+        }
+
+    except Exception as e:
+        print(f"[Job {job_id}] Failed: {str(e)}")
+        return {"status": "failed", "error": str(e)}
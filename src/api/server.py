@@ -4,22 +4,39 @@ Exposes REST endpoints to analyze and update repository dependencies.
 """
 
 import asyncio
-import json
 import os
-import subprocess
+import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
-from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from src.agents.orchestrator import create_main_orchestrator, validate_prerequisites
+from src.api.jobs import (
+    JOB_LOCK_KEY,
+    JOB_LOCK_TTL,
+    JobStore,
+    expand_result,
+    repository_key,
+    run_repository_update,
+)
+from src.utils import serialization
 from src.utils.docker import get_docker_path
 
 # Load environment variables
 load_dotenv()
 
+GITHUB_MCP_IMAGE = "ghcr.io/github/github-mcp-server"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (see src.utils.serialization)."""
+
+    def render(self, content: Any) -> bytes:
+        return serialization.dumps_bytes(content)
+
 
 class RepositoryRequest(BaseModel):
     """Request model for repository operations"""
@@ -27,7 +44,7 @@ class RepositoryRequest(BaseModel):
     repository: str = Field(
         ...,
         description="Repository in format 'owner/repo' or full GitHub URL",
-        example="facebook/react",
+        examples=["facebook/react"],
     )
     github_token: Optional[str] = Field(
         None,
@@ -64,8 +81,25 @@ class JobStatusResponse(BaseModel):
     usage: Optional[UsageResponse] = None
 
 
-# In-memory job storage (use Redis/DB for production)
-jobs_storage: Dict[str, Dict[str, Any]] = {}
+# In-memory job storage, used only when REDIS_URL is not configured.
+# With REDIS_URL set, jobs are queued to ARQ and run by src.api.worker.
+job_store = JobStore()
+
+# Active in-process job per repository key, so concurrent requests for the
+# same repository share one run instead of starting duplicates
+_in_flight: Dict[str, str] = {}
+_in_flight_lock = asyncio.Lock()
+
+ACTIVE_JOB_STATUSES = ("queued", "processing")
+
+# Replaces a repository lock only while it still holds the given stale job id
+_REPLACE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+end
+return false
+"""
+_LOCK_CLAIM_ATTEMPTS = 3
 
 
 async def start_persistent_mcp_server():
@@ -93,46 +127,133 @@ async def stop_persistent_mcp_server():
     print("  Persistent MCP server stopped")
 
 
-async def setup_github_mcp_docker():
+async def _run_docker(*args: str, timeout: float) -> Tuple[int, str]:
+    """
+    Run a docker CLI command without blocking the event loop.
+
+    Args:
+        *args: Arguments passed to the docker binary
+        timeout: Seconds to wait before killing the process
+
+    Returns:
+        Tuple of (returncode, stdout)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        get_docker_path(),
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, stdout.decode().strip()
+
+
+def create_docker_client() -> Optional[Any]:
+    """
+    Create a long-lived aiodocker client if aiodocker is installed.
+
+    Returns:
+        aiodocker.Docker instance, or None to fall back to the docker CLI
+    """
+    try:
+        import aiodocker
+
+        return aiodocker.Docker()
+    except Exception:
+        return None
+
+
+async def _docker_version(docker: Optional[Any] = None) -> Optional[str]:
+    """
+    Get the Docker version string.
+
+    Args:
+        docker: Shared aiodocker client (uses the docker CLI if None)
+
+    Returns:
+        Version string, or None if Docker is unavailable
+    """
+    if docker is not None:
+        try:
+            info = await docker.version()
+            return f"Docker version {info.get('Version', 'unknown')}"
+        except Exception:
+            return None
+
+    try:
+        returncode, version = await _run_docker("--version", timeout=5)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return version if returncode == 0 else None
+
+
+async def _mcp_image_cached(docker: Optional[Any] = None) -> bool:
+    """Check whether the GitHub MCP image exists locally."""
+    if docker is not None:
+        try:
+            await docker.images.inspect(GITHUB_MCP_IMAGE)
+            return True
+        except Exception:
+            return False
+
+    _, image_id = await _run_docker("images", GITHUB_MCP_IMAGE, "-q", timeout=10)
+    return bool(image_id)
+
+
+async def _pull_mcp_image(docker: Optional[Any] = None) -> bool:
+    """Pull the GitHub MCP image, returning True on success."""
+    if docker is not None:
+        try:
+            await docker.images.pull(GITHUB_MCP_IMAGE, tag="latest")
+            return True
+        except Exception:
+            return False
+
+    returncode, _ = await _run_docker("pull", GITHUB_MCP_IMAGE, timeout=600)
+    return returncode == 0
+
+
+async def setup_github_mcp_docker(docker: Optional[Any] = None):
     """
     Verify Docker is available and start the persistent MCP server.
-    Image pulling is handled by startup.py's pull_mcp_image().
+    The MCP image is only pulled when it is missing locally or FORCE_PULL=1.
+
+    Args:
+        docker: Shared aiodocker client (uses the docker CLI if None)
     """
     print("Setting up GitHub MCP Docker image...")
-    docker_cmd = get_docker_path()
 
     try:
         # Check if Docker is available
-        result = subprocess.run(
-            [docker_cmd, "--version"], capture_output=True, text=True, timeout=10
-        )
+        version = await _docker_version(docker)
 
-        if result.returncode != 0:
+        if version is None:
             raise RuntimeError("Docker is not available")
 
-        print(f"Docker found: {result.stdout.strip()}")
-
-        # Verify the image exists locally
-        verify_result = subprocess.run(
-            [docker_cmd, "images", "ghcr.io/github/github-mcp-server", "-q"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+        print(f"Docker found: {version}")
 
-        if not verify_result.stdout.strip():
-            raise RuntimeError(
-                "GitHub MCP server image not available. Run startup with --skip-checks disabled to pull it."
-            )
+        # Check for a locally cached image before touching the registry
+        image_cached = await _mcp_image_cached(docker)
 
-        print("GitHub MCP server image verified")
+        if image_cached and os.getenv("FORCE_PULL") != "1":
+            print("GitHub MCP server image verified (using cached image)")
+        else:
+            print("Pulling GitHub MCP server image...")
+            if not await _pull_mcp_image(docker) and not image_cached:
+                raise RuntimeError("GitHub MCP server image not available")
+            print("GitHub MCP server image ready")
 
         # Start the persistent MCP server (keeps running until shutdown)
         await start_persistent_mcp_server()
 
         print("GitHub MCP setup complete")
 
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         raise RuntimeError("Docker command timed out")
     except Exception as e:
         raise RuntimeError(f"Failed to setup GitHub MCP Docker: {str(e)}")
@@ -147,8 +268,22 @@ async def lifespan(app: FastAPI):
     # Startup
     print("Starting Dependency Update API Server...")
 
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        from arq import create_pool
+        from arq.connections import RedisSettings
+
+        app.state.redis = await create_pool(RedisSettings.from_dsn(redis_url))
+        print("Job queue: ARQ (Redis)")
+    else:
+        print("Job queue: in-process (set REDIS_URL to use ARQ)")
+
+    app.state.docker = create_docker_client()
+    if app.state.docker is None:
+        print("Docker client: CLI (install aiodocker for a pooled client)")
+
     try:
-        await setup_github_mcp_docker()
+        await setup_github_mcp_docker(app.state.docker)
         print("Server ready to accept requests")
     except Exception as e:
         print(f"Startup failed: {str(e)}")
@@ -158,7 +293,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("Shutting down server...")
+    if app.state.redis is not None:
+        await app.state.redis.close()
     await stop_persistent_mcp_server()
+    if app.state.docker is not None:
+        await app.state.docker.close()
 
 
 # Create FastAPI app with lifespan
@@ -167,14 +306,20 @@ app = FastAPI(
     description="Automatically analyze and update repository dependencies with intelligent testing and rollback",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Shared clients, replaced in lifespan when configured
+app.state.redis = None
+app.state.docker = None
+
 
 async def process_repository_update(
     job_id: str, repository: str, github_token: Optional[str] = None
 ):
     """
-    Background task to process repository updates.
+    Background task to process repository updates in-process.
+    Used when no Redis queue is configured (REDIS_URL unset).
 
     Args:
         job_id: Unique job identifier
@@ -182,95 +327,15 @@ async def process_repository_update(
         github_token: GitHub token for API operations
     """
     try:
-        # Update job status
-        jobs_storage[job_id]["status"] = "processing"
-
-        # Validate prerequisites
-        print(f"[Job {job_id}] Validating prerequisites...")
-        is_valid, message = validate_prerequisites()
-
-        if not is_valid:
-            jobs_storage[job_id]["status"] = "failed"
-            jobs_storage[job_id]["error"] = message
-            return
-
-        # Set GitHub token if provided
-        if github_token:
-            os.environ["GITHUB_PERSONAL_ACCESS_TOKEN"] = github_token
-
-        # Create orchestrator agent
-        print(f"[Job {job_id}] Creating orchestrator agent...")
-        agent = create_main_orchestrator()
-
-        # Run the update process with activity logging
-        from src.callbacks.agent_activity import AgentActivityHandler
-
-        handler = AgentActivityHandler("orchestrator", job_id=job_id)
-
-        # Set module-level handler so child agents register for cost aggregation
-        import src.agents.orchestrator as orch_module
-
-        orch_module._current_orchestrator_handler = handler
-
-        print(f"[Job {job_id}] Processing repository: {repository}")
-
-        # Run agent.invoke() in a thread so it doesn't block the event loop.
-        # This is critical: MCP tool calls use run_coroutine_threadsafe() to
-        # schedule async MCP operations back on this event loop. If the loop
-        # is blocked by agent.invoke(), it deadlocks.
-        import asyncio
-
-        from src.agents.updater import set_main_event_loop
-
-        loop = asyncio.get_running_loop()
-        set_main_event_loop(loop)
-        result = await loop.run_in_executor(
-            None,
-            lambda: agent.invoke(
-                {
-                    "messages": [
-                        (
-                            "user",
-                            f"Analyze and update dependencies for repository: {repository}",
-                        )
-                    ]
-                },
-                config={"callbacks": [handler]},
-            ),
+        await job_store.set(job_id, {"status": "processing"})
+        await job_store.set(
+            job_id, await run_repository_update(job_id, repository, github_token)
         )
-
-        # Update job with results
-        usage_summary = handler.get_usage_summary()
-        final_message = result["messages"][-1].content if result.get("messages") else ""
-
-        # Try to parse structured JSON from orchestrator's final message
-        parsed_result = {"output": final_message, "repository": repository}
-        try:
-            result_json = json.loads(final_message)
-            parsed_result["status"] = result_json.get("status", "unknown")
-            if "url" in result_json:
-                parsed_result["url"] = result_json["url"]
-            if "message" in result_json:
-                parsed_result["message"] = result_json["message"]
-            if "details" in result_json:
-                parsed_result["details"] = result_json["details"]
-        except (json.JSONDecodeError, TypeError):
-            parsed_result["status"] = "completed"
-
-        jobs_storage[job_id]["status"] = "completed"
-        jobs_storage[job_id]["result"] = parsed_result
-        jobs_storage[job_id]["activity_log"] = handler.activity_log
-        jobs_storage[job_id]["usage"] = usage_summary
-
-        print(
-            f"[Job {job_id}] Completed — Cost: ${usage_summary['estimated_cost_usd']:.4f} "
-            f"({usage_summary['total_tokens']:,} tokens, {usage_summary['llm_calls']} LLM calls)"
-        )
-
-    except Exception as e:
-        print(f"[Job {job_id}] Failed: {str(e)}")
-        jobs_storage[job_id]["status"] = "failed"
-        jobs_storage[job_id]["error"] = str(e)
+    finally:
+        async with _in_flight_lock:
+            key = repository_key(repository)
+            if _in_flight.get(key) == job_id:
+                del _in_flight[key]
 
 
 @app.get("/")
@@ -283,18 +348,35 @@ async def root():
     }
 
 
+# Collapses frequent liveness probes into one Docker/MCP check per window
+HEALTH_CACHE_TTL = 3.0
+_health_cache: Dict[str, Any] = {"ts": 0.0, "payload": None}
+_health_lock = asyncio.Lock()
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check including Docker and MCP server availability"""
+    async with _health_lock:
+        now = time.monotonic()
+        if (
+            _health_cache["payload"] is not None
+            and now - _health_cache["ts"] < HEALTH_CACHE_TTL
+        ):
+            return _health_cache["payload"]
+
+        payload = await _compute_health()
+        _health_cache.update(ts=time.monotonic(), payload=payload)
+        return payload
+
+
+async def _compute_health() -> Dict[str, Any]:
+    """Run the Docker, credential and MCP server checks for /health."""
     try:
         from src.integrations.mcp_server_manager import MCPServerStatus, get_mcp_status
 
         # Check Docker
-        docker_cmd = get_docker_path()
-        docker_check = subprocess.run(
-            [docker_cmd, "--version"], capture_output=True, text=True, timeout=5
-        )
-        docker_available = docker_check.returncode == 0
+        docker_available = await _docker_version(app.state.docker) is not None
 
         # Check GitHub token
         github_token = os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
@@ -396,27 +478,59 @@ async def update_repository(
 
     The process runs in the background and returns a job ID for status tracking.
     """
-    # Generate job ID
     import uuid
 
-    job_id = str(uuid.uuid4())
+    key = repository_key(request.repository)
 
-    # Initialize job
-    jobs_storage[job_id] = {
-        "job_id": job_id,
-        "status": "queued",
-        "repository": request.repository,
-        "result": None,
-        "error": None,
-    }
+    if app.state.redis is not None:
+        job_id = str(uuid.uuid4())
+        lock_key = JOB_LOCK_KEY.format(repository=key)
 
-    # Add to background tasks
-    background_tasks.add_task(
-        process_repository_update,
-        job_id=job_id,
-        repository=request.repository,
-        github_token=request.github_token,
-    )
+        existing = await _claim_repository_lock(lock_key, job_id)
+        if existing:
+            return _already_running(existing, request.repository)
+
+        try:
+            await app.state.redis.enqueue_job(
+                "process_repository_update_task",
+                request.repository,
+                request.github_token,
+                _job_id=job_id,
+            )
+        except Exception:
+            # Don't leave the repository locked by a job that never queued
+            if await app.state.redis.get(lock_key) == job_id.encode():
+                await app.state.redis.delete(lock_key)
+            raise
+    else:
+        async with _in_flight_lock:
+            if key in _in_flight:
+                existing = await job_store.get(_in_flight[key])
+                if existing and existing["status"] in ACTIVE_JOB_STATUSES:
+                    return _already_running(existing, request.repository)
+
+            # Generate job ID
+            job_id = str(uuid.uuid4())
+            _in_flight[key] = job_id
+
+            # Initialize job
+            await job_store.set(
+                job_id,
+                {
+                    "status": "queued",
+                    "repository": request.repository,
+                    "result": None,
+                    "error": None,
+                },
+            )
+
+        # Add to background tasks
+        background_tasks.add_task(
+            process_repository_update,
+            job_id=job_id,
+            repository=request.repository,
+            github_token=request.github_token,
+        )
 
     return JobResponse(
         job_id=job_id,
@@ -426,15 +540,109 @@ async def update_repository(
     )
 
 
+async def _claim_repository_lock(
+    lock_key: str, job_id: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Claim a repository lock for a new ARQ job across all API processes.
+
+    A lock whose job is not visible in the queue yet is treated as active,
+    because its holder may still be between claiming the lock and
+    enqueueing the job. A lock held by a finished job is only replaced if
+    it still holds that job's id, so concurrent requests cannot both take
+    over the same stale lock.
+
+    Args:
+        lock_key: Redis key of the repository lock
+        job_id: ARQ job identifier to claim the lock for
+
+    Returns:
+        None if the lock was claimed, otherwise the job record of the
+        queued or running job holding it
+
+    Raises:
+        HTTPException: If the lock kept changing hands while claiming it
+    """
+    redis = app.state.redis
+    for _ in range(_LOCK_CLAIM_ATTEMPTS):
+        if await redis.set(lock_key, job_id, nx=True, ex=JOB_LOCK_TTL):
+            return None
+
+        holder = await redis.get(lock_key)
+        if holder is None:
+            # Released in the meantime; try SET NX again
+            continue
+
+        job = await _get_queued_job(holder.decode())
+        if job is None:
+            return {"job_id": holder.decode(), "status": "queued"}
+        if job["status"] in ACTIVE_JOB_STATUSES:
+            return job
+
+        # Stale lock left by a finished job
+        if await redis.eval(
+            _REPLACE_LOCK_SCRIPT, 1, lock_key, holder, job_id, JOB_LOCK_TTL
+        ):
+            return None
+
+    raise HTTPException(
+        status_code=409, detail="Repository lock is contended, please retry"
+    )
+
+
+def _already_running(job: Dict[str, Any], repository: str) -> JobResponse:
+    """Build the response returned for a duplicate update request."""
+    return JobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        message="An update job for this repository is already in progress",
+        repository=repository,
+    )
+
+
+async def _get_queued_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Build a job record from the ARQ queue.
+
+    Args:
+        job_id: ARQ job identifier
+
+    Returns:
+        Job record, or None if the job is unknown
+    """
+    from arq.jobs import Job, JobStatus
+
+    job = Job(job_id, app.state.redis)
+    status = await job.status()
+
+    if status == JobStatus.not_found:
+        return None
+    if status in (JobStatus.deferred, JobStatus.queued):
+        return {"job_id": job_id, "status": "queued"}
+    if status == JobStatus.in_progress:
+        return {"job_id": job_id, "status": "processing"}
+
+    info = await job.result_info()
+    if info is None:
+        return None
+    if not info.success:
+        return {"job_id": job_id, "status": "failed", "error": str(info.result)}
+
+    return {"job_id": job_id, **info.result}
+
+
 @app.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(job_id: str):
     """
     Get the status of a repository update job.
     """
-    if job_id not in jobs_storage:
-        raise HTTPException(status_code=404, detail="Job not found")
+    if app.state.redis is not None:
+        job = await _get_queued_job(job_id)
+    else:
+        job = await job_store.get(job_id)
 
-    job = jobs_storage[job_id]
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
 
     usage_data = None
     if job.get("usage"):
@@ -450,16 +658,52 @@ async def get_job_status(job_id: str):
     return JobStatusResponse(
         job_id=job["job_id"],
         status=job["status"],
-        result=job.get("result"),
+        result=expand_result(job.get("result")),
         error=job.get("error"),
         usage=usage_data,
     )
 
 
+# Fields returned by /api/jobs unless include_result is set
+JOB_SUMMARY_FIELDS = ("job_id", "status", "repository", "error")
+
+
 @app.get("/api/jobs")
-async def list_jobs():
-    """List all jobs and their current status"""
-    return {"total": len(jobs_storage), "jobs": list(jobs_storage.values())}
+async def list_jobs(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    include_result: bool = False,
+):
+    """
+    List jobs and their current status, oldest first.
+
+    Result bodies, activity logs and usage are omitted unless include_result
+    is set, keeping the response small for large job histories.
+    """
+    if app.state.redis is not None:
+        queued = [
+            {"job_id": j.job_id, "status": "queued", "repository": j.args[0]}
+            for j in await app.state.redis.queued_jobs()
+        ]
+        finished = [
+            {"job_id": r.job_id, **r.result}
+            if r.success
+            else {"job_id": r.job_id, "status": "failed", "error": str(r.result)}
+            for r in await app.state.redis.all_job_results()
+        ]
+        jobs = queued + finished
+        total, jobs = len(jobs), jobs[offset : offset + limit]
+    else:
+        total, jobs = await job_store.list(offset=offset, limit=limit)
+
+    if include_result:
+        jobs = [{**job, "result": expand_result(job.get("result"))} for job in jobs]
+    else:
+        jobs = [
+            {field: job.get(field) for field in JOB_SUMMARY_FIELDS} for job in jobs
+        ]
+
+    return {"total": total, "limit": limit, "offset": offset, "jobs": jobs}
 
 
 if __name__ == "__main__":
@@ -471,6 +715,19 @@ if __name__ == "__main__":
 
     print(f"Starting server on {host}:{port}")
 
-    uvicorn.run(
-        "src.api.server:app", host=host, port=port, reload=True, log_level="info"
-    )
+    if os.getenv("ENV", "dev") == "dev":
+        uvicorn.run(
+            "src.api.server:app", host=host, port=port, reload=True, log_level="info"
+        )
+    else:
+        # In-process jobs are per worker, so only scale out with the Redis queue
+        default_workers = "4" if os.getenv("REDIS_URL") else "1"
+        uvicorn.run(
+            "src.api.server:app",
+            host=host,
+            port=port,
+            workers=int(os.getenv("WORKERS", default_workers)),
+            log_level="info",
+            loop="uvloop",
+            http="httptools",
+        )
@@ -8,7 +8,9 @@ This script:
 3. Starts the FastAPI server
 
 Usage:
-    python -m src.api.startup [--host HOST] [--port PORT] [--no-reload]
+    python -m src.api.startup [--host HOST] [--port PORT] [--no-reload] [--workers N]
+
+Set ENV=prod to disable auto-reload and run multiple uvicorn workers.
 """
 
 import argparse
@@ -135,12 +137,23 @@ def check_dependencies():
 
 
 def pull_mcp_image():
-    """Pull the GitHub MCP Docker image"""
-    print("\nPulling GitHub MCP Docker image...")
-    print("  This may take a few minutes on first run...")
+    """Pull the GitHub MCP Docker image unless it is already cached locally"""
     docker_cmd = get_docker_path()
 
     try:
+        cached = subprocess.run(
+            [docker_cmd, "images", "-q", "ghcr.io/github/github-mcp-server"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if cached.stdout.strip() and os.getenv("FORCE_PULL") != "1":
+            print("\nGitHub MCP image: Using cached image")
+            print("  Set FORCE_PULL=1 to pull the latest version")
+            return True
+
+        print("\nPulling GitHub MCP Docker image...")
+        print("  This may take a few minutes on first run...")
         result = subprocess.run(
             [docker_cmd, "pull", "ghcr.io/github/github-mcp-server"],
             capture_output=False,  # Show progress
@@ -159,7 +172,7 @@ def pull_mcp_image():
         return False
 
 
-def start_server(host: str, port: int, reload: bool):
+def start_server(host: str, port: int, reload: bool, workers: int = 1):
     """Start the FastAPI server"""
     print(f"\n{'=' * 60}")
     print(f"Starting Dependency Update Automation API")
@@ -167,26 +180,29 @@ def start_server(host: str, port: int, reload: bool):
     print(f"  Host: {host}")
     print(f"  Port: {port}")
     print(f"  Auto-reload: {'Enabled' if reload else 'Disabled'}")
+    if not reload:
+        print(f"  Workers: {workers}")
     print(f"  API Docs: http://{host}:{port}/docs")
     print(f"  Health Check: http://{host}:{port}/health")
     print(f"{'=' * 60}\n")
 
     import uvicorn
 
-    reload_kwargs = {}
     if reload:
-        reload_kwargs = {
+        server_kwargs = {
+            "reload": True,
             "reload_dirs": ["src"],
             "reload_excludes": ["*.pyc", "__pycache__", "*.log", ".git", "*.egg-info"],
         }
+    else:
+        server_kwargs = {"workers": workers, "loop": "uvloop", "http": "httptools"}
 
     uvicorn.run(
         "src.api.server:app",
         host=host,
         port=port,
-        reload=reload,
         log_level="info",
-        **reload_kwargs,
+        **server_kwargs,
     )
 
 
@@ -208,6 +224,13 @@ def main():
     parser.add_argument(
         "--no-reload", action="store_true", help="Disable auto-reload (for production)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        # In-process jobs are per worker, so only scale out with the Redis queue
+        default=int(os.getenv("WORKERS", "4" if os.getenv("REDIS_URL") else "1")),
+        help="Number of worker processes when auto-reload is disabled",
+    )
     parser.add_argument(
         "--skip-checks", action="store_true", help="Skip prerequisite checks"
     )
@@ -251,7 +274,10 @@ def main():
 
     # Start the server
     try:
-        start_server(host=args.host, port=args.port, reload=not args.no_reload)
+        reload = not args.no_reload and os.getenv("ENV", "dev") == "dev"
+        start_server(
+            host=args.host, port=args.port, reload=reload, workers=args.workers
+        )
     except KeyboardInterrupt:
         print("\n\nServer stopped by user")
     except Exception as e:
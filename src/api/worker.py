@@ -0,0 +1,97 @@
+"""
+ARQ worker for repository update jobs.
+
+Run with:
+    arq src.api.worker.WorkerSettings
+
+The API server enqueues jobs into Redis (REDIS_URL) and this worker executes
+them, keeping the LLM/git workload out of the API process.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from arq.connections import RedisSettings
+from dotenv import load_dotenv
+
+from src.api.jobs import (
+    JOB_LOCK_KEY,
+    JOB_RUN_LOCK_TTL,
+    JOB_TIMEOUT,
+    repository_key,
+    run_repository_update,
+)
+
+# Load environment variables
+load_dotenv()
+
+# Resets a repository lock's TTL only while it still holds the given job id
+_REFRESH_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return false
+"""
+
+
+async def process_repository_update_task(
+    ctx: Dict[str, Any], repository: str, github_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    ARQ task that processes a repository update.
+
+    Args:
+        ctx: ARQ job context (provides job_id and the redis pool)
+        repository: Repository to process
+        github_token: GitHub token for API operations
+
+    Returns:
+        Job record stored by ARQ as the job result
+    """
+    # The API's lock TTL was partly spent while the job waited in the queue;
+    # restart it so the lock covers the whole run.
+    lock_key = JOB_LOCK_KEY.format(repository=repository_key(repository))
+    await ctx["redis"].eval(
+        _REFRESH_LOCK_SCRIPT, 1, lock_key, ctx["job_id"], JOB_RUN_LOCK_TTL
+    )
+    try:
+        record = await run_repository_update(ctx["job_id"], repository, github_token)
+    finally:
+        # Release the de-duplication lock taken by the API, unless a newer
+        # job has already replaced it.
+        if await ctx["redis"].get(lock_key) == ctx["job_id"].encode():
+            await ctx["redis"].delete(lock_key)
+    record["repository"] = repository
+    return record
+
+
+async def startup(ctx: Dict[str, Any]) -> None:
+    """Start the persistent MCP server used by the updater's GitHub tools."""
+    from src.api.server import setup_github_mcp_docker
+
+    try:
+        await setup_github_mcp_docker()
+    except Exception as e:
+        print(f"Worker startup failed: {str(e)}")
+        print("Worker will start but may not function correctly")
+
+
+async def shutdown(ctx: Dict[str, Any]) -> None:
+    """Stop the persistent MCP server."""
+    from src.api.server import stop_persistent_mcp_server
+
+    await stop_persistent_mcp_server()
+
+
+class WorkerSettings:
+    """ARQ worker configuration"""
+
+    functions = [process_repository_update_task]
+    redis_settings = RedisSettings.from_dsn(
+        os.getenv("REDIS_URL", "redis://localhost:6379")
+    )
+    on_startup = startup
+    on_shutdown = shutdown
+    max_jobs = 4
+    job_timeout = JOB_TIMEOUT
+    keep_result = 86400
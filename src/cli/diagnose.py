@@ -30,9 +30,9 @@ class Colors:
 
 
 def print_header(text: str):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{text.center(70)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.END}\n")
+    rule = f"{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.END}"
+    title = f"{Colors.BOLD}{Colors.BLUE}{text.center(70)}{Colors.END}"
+    print(f"\n{rule}\n{title}\n{rule}\n")
 
 
 def print_test(name: str):
@@ -241,10 +241,11 @@ async def test_mcp_connection(token: str) -> bool:
             tools = await client.list_available_tools()
 
             print_success(f"Found {len(tools)} available tools:")
-            for tool in tools[:10]:
-                print(f"   - {tool}")
+            lines = [f"   - {tool}" for tool in tools[:10]]
             if len(tools) > 10:
-                print(f"   ... and {len(tools) - 10} more")
+                lines.append(f"   ... and {len(tools) - 10} more")
+            if lines:
+                print("\n".join(lines))
 
             return True
 
@@ -371,15 +372,18 @@ async def run_all_tests():
     passed = sum(1 for v in results.values() if v)
     total = len(results)
 
+    # Build each report block and write it at once rather than line by line
+    lines = []
     for test_name, passed_test in results.items():
         status = (
             f"{Colors.GREEN}PASS{Colors.END}"
             if passed_test
             else f"{Colors.RED}FAIL{Colors.END}"
         )
-        print(f"{test_name.replace('_', ' ').title()}: {status}")
+        lines.append(f"{test_name.replace('_', ' ').title()}: {status}")
 
-    print(f"\n{Colors.BOLD}Overall: {passed}/{total} tests passed{Colors.END}")
+    lines.append(f"\n{Colors.BOLD}Overall: {passed}/{total} tests passed{Colors.END}")
+    print("\n".join(lines))
 
     if passed == total:
         print_header("All Tests Passed!")
@@ -388,33 +392,49 @@ async def run_all_tests():
         print_header("Some Tests Failed")
         print_error("GitHub MCP integration has issues. Review the errors above.")
 
-        print(f"\n{Colors.BOLD}Troubleshooting Suggestions:{Colors.END}")
+        lines = [f"\n{Colors.BOLD}Troubleshooting Suggestions:{Colors.END}"]
 
         if not results["runtime_installed"]:
-            print("  Install a container runtime:")
-            print(
-                "    - Docker Desktop: https://www.docker.com/products/docker-desktop"
+            lines.extend(
+                [
+                    "  Install a container runtime:",
+                    "    - Docker Desktop: https://www.docker.com/products/docker-desktop",
+                    "    - OrbStack (macOS): https://orbstack.dev/",
+                    "    - Podman Desktop: https://podman-desktop.io/",
+                ]
             )
-            print("    - OrbStack (macOS): https://orbstack.dev/")
-            print("    - Podman Desktop: https://podman-desktop.io/")
 
         if not results["runtime_working"]:
-            print("  Start your container runtime (Docker Desktop, OrbStack, etc.)")
+            lines.append(
+                "  Start your container runtime (Docker Desktop, OrbStack, etc.)"
+            )
 
         if not results["github_token"]:
-            print("  Set GITHUB_PERSONAL_ACCESS_TOKEN environment variable")
-            print("  Create token at: https://github.com/settings/tokens")
+            lines.extend(
+                [
+                    "  Set GITHUB_PERSONAL_ACCESS_TOKEN environment variable",
+                    "  Create token at: https://github.com/settings/tokens",
+                ]
+            )
 
         if not results["python_packages"]:
-            print("  Install Python packages: pip install -r requirements.txt")
+            lines.append("  Install Python packages: pip install -r requirements.txt")
 
         if not results.get("container_image"):
-            print("  Manually pull image: docker pull ghcr.io/github/github-mcp-server")
+            lines.append(
+                "  Manually pull image: docker pull ghcr.io/github/github-mcp-server"
+            )
 
         if results.get("container_image") and not results.get("mcp_connection"):
-            print("  Check container logs for MCP server errors")
-            print("  Verify GitHub token has correct permissions (repo, workflow)")
-            print("  Check network connectivity")
+            lines.extend(
+                [
+                    "  Check container logs for MCP server errors",
+                    "  Verify GitHub token has correct permissions (repo, workflow)",
+                    "  Check network connectivity",
+                ]
+            )
+
+        print("\n".join(lines))
 
     return passed == total
 
@@ -6,55 +6,210 @@ This module provides integration with the GitHub MCP (Model Context Protocol) se
 to perform GitHub operations like creating PRs and issues without requiring the gh CLI.
 """
 
-import json
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import logging
 import os
+import re
 import subprocess
 import threading
-from typing import Any, Dict, Optional
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import httpx
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+try:
+    from mcp import McpError
+except ImportError:  # mcp 2.x renamed the exception
+    from mcp import MCPError as McpError
+
+try:
+    # Installed with uvicorn[standard] on Linux and macOS
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from src.utils import serialization
 from src.utils.docker import detect_container_runtime, find_command_path
 
-# Thread-local storage for event loops
-_thread_local = threading.local()
+# Event loop shared by the sync wrappers, run forever on a daemon thread
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
 
 load_dotenv()
 
+logger = logging.getLogger("app.github_mcp")
 
-def _get_event_loop():
-    """Get or create an event loop for the current thread."""
-    import asyncio
+# Seconds a pooled client is reused before it is recycled
+POOL_MAX_AGE = int(os.getenv("GITHUB_MCP_POOL_MAX_AGE", "900"))
 
-    if (
-        not hasattr(_thread_local, "loop")
-        or _thread_local.loop is None
-        or _thread_local.loop.is_closed()
-    ):
-        try:
-            # Try to get the current event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If there's a running loop in this thread, create a new one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            # No event loop exists in this thread, create one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+# Seconds the server's tool catalog is cached per client
+TOOLS_CACHE_TTL = 300
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the background event loop, starting its thread on first use.
+
+    The loop is a uvloop loop when uvloop is installed, which speeds up the
+    stdio pipe I/O to the MCP server.
+    """
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            _LOOP = (uvloop or asyncio).new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever, name="github-mcp-loop", daemon=True
+            ).start()
+        return _LOOP
+
+
+def _run_in_background(coro):
+    """
+    Run a coroutine on the background event loop and wait for its result.
 
-        _thread_local.loop = loop
+    Args:
+        coro: Coroutine to run
 
-    return _thread_local.loop
+    Returns:
+        The coroutine's result
 
+    Raises:
+        RuntimeError: If called from a running event loop, where blocking on
+            the result could deadlock
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
+    coro.close()
+    raise RuntimeError(
+        "GitHub MCP sync wrappers cannot be called from a running event loop; "
+        "use GitHubMCPClient or pooled_client instead."
+    )
+
+
+# Connection pooling for the streamable HTTP transport. HTTP/2 is only
+# negotiated when the optional h2 package is installed.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0
+)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Static parts of the container command line for the stdio transport.
+# Based on: https://github.com/github/github-mcp-server
+_CONTAINER_BASE_ARGS = ("run", "-i", "--rm")
+_CONTAINER_IMAGE_ARGS = ("ghcr.io/github/github-mcp-server", "stdio")
 
 # Re-export for backwards compatibility
 _find_command_path = find_command_path
 _detect_container_runtime = detect_container_runtime
 
 
+def _get_http_client(headers: Dict[str, str]) -> httpx.AsyncClient:
+    """
+    Get the keep-alive HTTP client for the running event loop and headers.
+
+    Sessions using the streamable HTTP transport share one connection pool
+    instead of paying TCP and TLS setup for each new client.
+
+    Args:
+        headers: Request headers (authorization and toolsets)
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    clients = _HTTP_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    key = tuple(sorted(headers.items()))
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = clients[key] = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(30.0, read=300.0),
+            limits=_HTTP_LIMITS,
+            http2=_HTTP2,
+        )
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients of the running event loop."""
+    for client in _HTTP_CLIENTS.pop(asyncio.get_running_loop(), {}).values():
+        await client.aclose()
+
+
+def _unwrap_tool_result(
+    result: Any, kind: Optional[str] = None, label: str = ""
+) -> Dict[str, Any]:
+    """
+    Convert an MCP tool result into the client's response dictionary.
+
+    Structured content is used as-is when the server sends it; otherwise the
+    first content block is parsed as JSON.
+
+    Args:
+        result: CallToolResult returned by ClientSession.call_tool
+        kind: Prefix for the url/number keys of a created object (e.g. "pr"),
+              or None to return the payload under "data" only
+        label: Object name used in the success message (e.g. "PR")
+
+    Returns:
+        Dictionary with status and the tool payload, or an error
+    """
+    # mcp 2.x renamed structuredContent to structured_content
+    data = getattr(result, "structured_content", None)
+    if data is None:
+        data = getattr(result, "structuredContent", None)
+
+    if data is None:
+        if not result.content:
+            return {"status": "error", "message": "No response from MCP server"}
+        block = result.content[0]
+        text = block.text if hasattr(block, "text") else str(block)
+        try:
+            data = serialization.loads(text)
+        except serialization.JSONDecodeError:
+            if kind is None:
+                return {"status": "error", "message": f"Unexpected response: {text}"}
+            return {"status": "success", "message": text, "raw_response": text}
+
+    if kind is None:
+        return {"status": "success", "data": data}
+
+    number = data.get("number", "")
+    return {
+        "status": "success",
+        f"{kind}_url": data.get("html_url", ""),
+        f"{kind}_number": number,
+        "message": f"Successfully created {label} #{number}",
+        "data": data,
+    }
+
+
+def _requires_session(method):
+    """Raise RuntimeError when a client method is used before __aenter__."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if self.session is None:
+            raise RuntimeError("Session not initialized. Use async context manager.")
+        return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class GitHubMCPClient:
     """
     Client for interacting with GitHub via MCP server running inside a container.
@@ -68,11 +223,30 @@ class GitHubMCPClient:
     - containerd with nerdctl
     """
 
+    __slots__ = (
+        "github_token",
+        "transport",
+        "url",
+        "headers",
+        "container_runtime",
+        "server_params",
+        "session",
+        "stdio_context",
+        "stdio",
+        "write",
+        "_tools_cache",
+        "_tools_fetched",
+        "_tools_lock",
+        "_broken",
+    )
+
     def __init__(
         self,
         github_token: Optional[str] = None,
         toolsets: Optional[str] = None,
         container_runtime: Optional[str] = None,
+        transport: str = "stdio",
+        url: Optional[str] = None,
     ):
         """
         Initialize GitHub MCP client.
@@ -84,6 +258,10 @@ class GitHubMCPClient:
             container_runtime: Container runtime to use (docker, podman, nerdctl)
                               If not specified, auto-detects available runtime.
                               Works with Docker Desktop, OrbStack, Podman, etc.
+            transport: "stdio" to start the server in a container per session, or
+                       "http" to connect to an already running server
+            url: Streamable HTTP endpoint for the "http" transport
+                 (falls back to the GITHUB_MCP_URL env var)
         """
         self.github_token = github_token or os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
         if not self.github_token:
@@ -92,6 +270,29 @@ class GitHubMCPClient:
                 "environment variable or pass token to constructor."
             )
 
+        self.transport = transport
+        self.session: Optional[ClientSession] = None
+        self.stdio_context = None
+        self.stdio = None
+        self.write = None
+        self._tools_cache: Optional[List[str]] = None
+        self._tools_fetched = 0.0
+        self._tools_lock: Optional[asyncio.Lock] = None
+        # Set when a call fails at the transport level; the pool drops the client
+        self._broken = False
+
+        if transport == "http":
+            self.url = url or os.getenv("GITHUB_MCP_URL")
+            if not self.url:
+                raise ValueError(
+                    "GitHub MCP URL not provided. Set GITHUB_MCP_URL "
+                    "environment variable or pass url to constructor."
+                )
+            self.headers = {"Authorization": f"Bearer {self.github_token}"}
+            if toolsets:
+                self.headers["X-MCP-Toolsets"] = toolsets
+            return
+
         # Auto-detect or use specified container runtime
         # Works with Docker Desktop, OrbStack, Podman, Rancher Desktop, etc.
         if container_runtime:
@@ -99,44 +300,38 @@ class GitHubMCPClient:
         else:
             self.container_runtime = detect_container_runtime()
 
-        # Build container arguments
-        # Based on: https://github.com/github/github-mcp-server
+        # Run the server in stdio mode, with toolsets configured if given
         container_args = [
-            "run",
-            "-i",
-            "--rm",
+            *_CONTAINER_BASE_ARGS,
             "-e",
             f"GITHUB_PERSONAL_ACCESS_TOKEN={self.github_token}",
+            *(("-e", f"GITHUB_TOOLSETS={toolsets}") if toolsets else ()),
+            *_CONTAINER_IMAGE_ARGS,
         ]
 
-        # Add optional toolsets configuration
-        if toolsets:
-            container_args.extend(["-e", f"GITHUB_TOOLSETS={toolsets}"])
-
-        container_args.extend(
-            [
-                "ghcr.io/github/github-mcp-server",
-                "stdio",  # Run in stdio mode for MCP communication
-            ]
-        )
-
         self.server_params = StdioServerParameters(
             command=self.container_runtime,
             args=container_args,
             env={"GITHUB_PERSONAL_ACCESS_TOKEN": self.github_token},
         )
 
-        self.session: Optional[ClientSession] = None
-        self.stdio_context = None
-        self.stdio = None
-        self.write = None
+    def _open_transport(self):
+        """Create the transport context manager for this client."""
+        if self.transport != "http":
+            return stdio_client(self.server_params)
+
+        from mcp.client.streamable_http import streamable_http_client
+
+        http_client = _get_http_client(self.headers)
+        return streamable_http_client(self.url, http_client=http_client)
 
     async def __aenter__(self):
         """Async context manager entry."""
         try:
-            self.stdio_context = stdio_client(self.server_params)
+            self.stdio_context = self._open_transport()
             transport = await self.stdio_context.__aenter__()
-            self.stdio, self.write = transport
+            # Streamable HTTP may also yield a session id callback
+            self.stdio, self.write = transport[:2]
 
             self.session = ClientSession(self.stdio, self.write)
             await self.session.__aenter__()
@@ -171,20 +366,65 @@ class GitHubMCPClient:
 
         self.stdio = None
         self.write = None
+        self._tools_cache = None
 
+    @_requires_session
     async def list_available_tools(self) -> list:
         """
         List all available tools from the GitHub MCP server.
 
+        The catalog is fetched once and cached for TOOLS_CACHE_TTL seconds;
+        concurrent callers share a single tools/list request.
+
         Returns:
             List of available tool names
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use async context manager.")
+        if self._tools_lock is None:
+            self._tools_lock = asyncio.Lock()
+
+        async with self._tools_lock:
+            if (
+                self._tools_cache is None
+                or time.monotonic() - self._tools_fetched >= TOOLS_CACHE_TTL
+            ):
+                tools_result = await self.session.list_tools()
+                self._tools_cache = [tool.name for tool in tools_result.tools]
+                self._tools_fetched = time.monotonic()
+            return list(self._tools_cache)
+
+    async def _call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        error_message: str,
+        kind: Optional[str] = None,
+        label: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Call an MCP tool and unwrap its result.
 
-        tools_result = await self.session.list_tools()
-        return [tool.name for tool in tools_result.tools]
+        Args:
+            tool_name: Name of the GitHub MCP tool
+            arguments: Tool arguments
+            error_message: Prefix for the error message if the call fails
+            kind: Key prefix for a created object (see _unwrap_tool_result)
+            label: Object name used in the success message
 
+        Returns:
+            Dictionary with the tool payload or error
+        """
+        try:
+            result = await self.session.call_tool(tool_name, arguments=arguments)
+        except (McpError, asyncio.TimeoutError) as e:
+            logger.warning("GitHub MCP tool %s failed: %s", tool_name, e)
+            return {"status": "error", "message": f"{error_message}: {e}"}
+        except Exception:
+            # The server or connection is gone; stop the pool reusing us
+            self._broken = True
+            raise
+        return _unwrap_tool_result(result, kind, label)
+
+    @_requires_session
     async def create_pull_request(
         self,
         repo_owner: str,
@@ -208,54 +448,22 @@ class GitHubMCPClient:
         Returns:
             Dictionary with PR details or error
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use async context manager.")
-
-        try:
-            result = await self.session.call_tool(
-                "create_pull_request",
-                arguments={
-                    "owner": repo_owner,
-                    "repo": repo_name,
-                    "title": title,
-                    "body": body,
-                    "head": head,
-                    "base": base,
-                },
-            )
-
-            if result.content and len(result.content) > 0:
-                response_text = (
-                    result.content[0].text
-                    if hasattr(result.content[0], "text")
-                    else str(result.content[0])
-                )
-
-                try:
-                    pr_data = json.loads(response_text)
-                except json.JSONDecodeError:
-                    return {
-                        "status": "success",
-                        "message": response_text,
-                        "raw_response": response_text,
-                    }
-
-                return {
-                    "status": "success",
-                    "pr_url": pr_data.get("html_url", ""),
-                    "pr_number": pr_data.get("number", ""),
-                    "message": f"Successfully created PR #{pr_data.get('number', '')}",
-                    "data": pr_data,
-                }
-
-            return {"status": "error", "message": "No response from MCP server"}
-
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Error creating PR via MCP: {str(e)}",
-            }
+        return await self._call_tool(
+            "create_pull_request",
+            {
+                "owner": repo_owner,
+                "repo": repo_name,
+                "title": title,
+                "body": body,
+                "head": head,
+                "base": base,
+            },
+            "Error creating PR via MCP",
+            "pr",
+            "PR",
+        )
 
+    @_requires_session
     async def create_issue(
         self,
         repo_owner: str,
@@ -277,57 +485,53 @@ class GitHubMCPClient:
         Returns:
             Dictionary with Issue details or error
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use async context manager.")
-
         if labels is None:
             labels = ["dependencies"]
 
-        try:
-            # Use issue_write tool (actual tool name in GitHub MCP)
-            result = await self.session.call_tool(
-                "issue_write",
-                arguments={
-                    "owner": repo_owner,
-                    "repo": repo_name,
-                    "title": title,
-                    "body": body,
-                    "labels": labels,
-                },
-            )
-
-            if result.content and len(result.content) > 0:
-                response_text = (
-                    result.content[0].text
-                    if hasattr(result.content[0], "text")
-                    else str(result.content[0])
-                )
+        # Use issue_write tool (actual tool name in GitHub MCP)
+        return await self._call_tool(
+            "issue_write",
+            {
+                "owner": repo_owner,
+                "repo": repo_name,
+                "title": title,
+                "body": body,
+                "labels": labels,
+            },
+            "Error creating issue via MCP",
+            "issue",
+            "issue",
+        )
 
-                try:
-                    issue_data = json.loads(response_text)
-                except json.JSONDecodeError:
-                    return {
-                        "status": "success",
-                        "message": response_text,
-                        "raw_response": response_text,
-                    }
-
-                return {
-                    "status": "success",
-                    "issue_url": issue_data.get("html_url", ""),
-                    "issue_number": issue_data.get("number", ""),
-                    "message": f"Successfully created issue #{issue_data.get('number', '')}",
-                    "data": issue_data,
-                }
+    @_requires_session
+    async def create_issues(
+        self, repo_owner: str, repo_name: str, issues: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several GitHub Issues concurrently over this session.
 
-            return {"status": "error", "message": "No response from MCP server"}
+        Args:
+            repo_owner: Repository owner (username or organization)
+            repo_name: Repository name
+            issues: Dicts with title, body and optional labels
 
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Error creating issue via MCP: {str(e)}",
-            }
+        Returns:
+            Issue details or error for each issue, in order
+        """
+        return await asyncio.gather(
+            *(
+                self.create_issue(
+                    repo_owner,
+                    repo_name,
+                    issue["title"],
+                    issue["body"],
+                    issue.get("labels"),
+                )
+                for issue in issues
+            )
+        )
 
+    @_requires_session
     async def get_repository_info(
         self, repo_owner: str, repo_name: str
     ) -> Dict[str, Any]:
@@ -341,31 +545,222 @@ class GitHubMCPClient:
         Returns:
             Dictionary with repository details or error
         """
-        if not self.session:
-            raise RuntimeError("Session not initialized. Use async context manager.")
+        # Use search_repositories to find the repo
+        return await self._call_tool(
+            "search_repositories",
+            {"query": f"repo:{repo_owner}/{repo_name}"},
+            "Error getting repository info",
+        )
 
-        try:
-            # Use search_repositories to find the repo
-            result = await self.session.call_tool(
-                "search_repositories",
-                arguments={"query": f"repo:{repo_owner}/{repo_name}"},
+
+@dataclass
+class PooledClient:
+    """An entered GitHubMCPClient kept warm in the module pool."""
+
+    client: GitHubMCPClient
+    loop: asyncio.AbstractEventLoop
+    closing: asyncio.Event
+    task: "asyncio.Task[None]"
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    use_count: int = 0
+    # Callers currently using the client; a retired client is closed only
+    # once the last of them releases it
+    leases: int = 0
+    retired: bool = False
+
+    async def close(self) -> None:
+        """Exit the client from the task that entered it."""
+        self.closing.set()
+        # asyncio.wait does not re-raise the holder's error or cancellation,
+        # so closing a client whose transport died cannot fail the caller
+        await asyncio.wait((self.task,))
+        if not self.task.cancelled() and self.task.exception() is not None:
+            logger.warning(
+                "GitHub MCP client exited with an error: %s", self.task.exception()
             )
 
-            if result.content and len(result.content) > 0:
-                response = result.content[0].text
-                repo_data = (
-                    json.loads(response) if isinstance(response, str) else response
-                )
+    async def retire(self) -> None:
+        """Close the client now if idle, else when its last lease is released.
+
+        Must run on the client's loop, which also serializes it with release.
+        """
+        self.retired = True
+        if not self.leases:
+            await self.close()
+
+    async def release(self) -> None:
+        """Release a lease, closing the client if it was retired meanwhile."""
+        self.leases -= 1
+        if self.retired and not self.leases and not self.closing.is_set():
+            await self.close()
+
+    def is_reusable(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Check whether the client is still open, healthy, fresh and bound to loop."""
+        return (
+            self.client.session is not None
+            and not self.client._broken
+            and not self.task.done()
+            and self.loop is loop
+            and time.monotonic() - self.created < POOL_MAX_AGE
+        )
 
-                return {"status": "success", "data": repo_data}
-            else:
-                return {"status": "error", "message": "No response from MCP server"}
 
-        except Exception as e:
-            return {
-                "status": "error",
-                "message": f"Error getting repository info: {str(e)}",
-            }
+# Warm clients shared by the sync wrappers, keyed by (token hash, transport)
+_GLOBAL_POOL: Dict[Tuple[str, str], PooledClient] = {}
+_POOL_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_pool_lock() -> asyncio.Lock:
+    """Get the pool lock for the running event loop."""
+    loop = asyncio.get_running_loop()
+    lock = _POOL_LOCKS.get(loop)
+    if lock is None:
+        lock = _POOL_LOCKS[loop] = asyncio.Lock()
+    return lock
+
+
+async def _open_client(token: Optional[str], transport: str) -> GitHubMCPClient:
+    """Open a client, falling back to stdio if the HTTP server is unreachable."""
+    if transport == "http":
+        try:
+            return await GitHubMCPClient(token, transport="http").__aenter__()
+        except RuntimeError as e:
+            logger.warning("GitHub MCP HTTP transport unavailable, using stdio: %s", e)
+    return await GitHubMCPClient(token).__aenter__()
+
+
+async def _hold_client(
+    token: Optional[str],
+    transport: str,
+    opened: "asyncio.Future[GitHubMCPClient]",
+    closing: asyncio.Event,
+) -> None:
+    """
+    Open a client and keep it entered until closing is set.
+
+    The MCP transports run anyio task groups, which must be exited from the
+    task that entered them, so each pooled client lives in its own task.
+    """
+    try:
+        client = await _open_client(token, transport)
+    except Exception as e:
+        opened.set_exception(e)
+        return
+
+    try:
+        opened.set_result(client)
+        await closing.wait()
+    finally:
+        await client._cleanup()
+
+
+async def _open_pooled_client(token: Optional[str], transport: str) -> PooledClient:
+    """Open a client in its own holder task on the running event loop."""
+    loop = asyncio.get_running_loop()
+    opened = loop.create_future()
+    closing = asyncio.Event()
+    task = loop.create_task(_hold_client(token, transport, opened, closing))
+    return PooledClient(await opened, loop, closing, task)
+
+
+async def _lease_pooled_client(github_token: Optional[str]) -> PooledClient:
+    """Get a healthy pool entry for the token, opening one if needed, and lease it."""
+    token = github_token or os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN") or ""
+    transport = "http" if os.getenv("GITHUB_MCP_URL") else "stdio"
+    key = (hashlib.sha256(token.encode()).hexdigest(), transport)
+    loop = asyncio.get_running_loop()
+
+    async with _get_pool_lock():
+        entry = _GLOBAL_POOL.get(key)
+        if entry is not None and not entry.is_reusable(loop):
+            del _GLOBAL_POOL[key]
+            if entry.loop is loop:
+                await entry.retire()
+            elif entry.loop.is_running():
+                asyncio.run_coroutine_threadsafe(entry.retire(), entry.loop)
+            entry = None
+
+        if entry is None:
+            entry = await _open_pooled_client(token or None, transport)
+            _GLOBAL_POOL[key] = entry
+
+        entry.last_used = time.monotonic()
+        entry.use_count += 1
+        entry.leases += 1
+        return entry
+
+
+@contextlib.asynccontextmanager
+async def pooled_client(
+    github_token: Optional[str] = None,
+) -> AsyncIterator[GitHubMCPClient]:
+    """
+    Lease a warm GitHubMCPClient, opening one on first use.
+
+    The MCP server process and initialized session are reused across calls,
+    and recycled once they are older than POOL_MAX_AGE seconds. A recycled
+    client stays open until every caller leasing it has left the block. When
+    GITHUB_MCP_URL is set the client connects to that long-running server
+    over streamable HTTP instead of starting a container.
+
+    Usage:
+        async with pooled_client(token) as client:
+            await client.create_issue(...)
+
+    Args:
+        github_token: GitHub token (optional, uses env var if not provided)
+
+    Yields:
+        Entered GitHubMCPClient owned by the pool (do not exit it)
+    """
+    entry = await _lease_pooled_client(github_token)
+    try:
+        yield entry.client
+    finally:
+        await entry.release()
+
+
+async def close_pooled_clients() -> None:
+    """Close every pooled client opened on the running event loop, even if leased."""
+    loop = asyncio.get_running_loop()
+    async with _get_pool_lock():
+        for key, entry in list(_GLOBAL_POOL.items()):
+            if entry.loop is loop:
+                del _GLOBAL_POOL[key]
+                await entry.close()
+
+
+async def _close_background_resources() -> None:
+    """Close the pooled and HTTP clients of the running event loop."""
+    await close_pooled_clients()
+    await close_http_clients()
+
+
+def _shutdown_background_loop() -> None:
+    """Stop the MCP servers and the background loop at interpreter exit."""
+    if _LOOP is None or not _LOOP.is_running():
+        return
+    future = asyncio.run_coroutine_threadsafe(_close_background_resources(), _LOOP)
+    try:
+        future.result(timeout=10)
+    except Exception as e:
+        logger.warning("Error closing GitHub MCP clients: %s", e)
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+
+
+atexit.register(_shutdown_background_loop)
+
+
+_REPO_RE = re.compile(r"^([^/]+)/([^/]+)$")
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_labels(labels: str) -> Tuple[str, ...]:
+    """Split a comma-separated label string into stripped label names."""
+    return tuple(label.strip() for label in labels.split(","))
 
 
 # Synchronous wrapper functions for compatibility with existing code
@@ -391,20 +786,18 @@ def create_pr_sync(
     Returns:
         Dictionary with PR URL or error
     """
-    import asyncio
-
     # Parse repo_name
-    parts = repo_name.split("/")
-    if len(parts) != 2:
+    match = _REPO_RE.match(repo_name)
+    if match is None:
         return {
             "status": "error",
             "message": f"Invalid repo_name format. Expected 'owner/repo', got '{repo_name}'",
         }
 
-    owner, repo = parts
+    owner, repo = match.groups()
 
     async def _create_pr():
-        async with GitHubMCPClient(github_token) as client:
+        async with pooled_client(github_token) as client:
             return await client.create_pull_request(
                 repo_owner=owner,
                 repo_name=repo,
@@ -415,9 +808,7 @@ def create_pr_sync(
             )
 
     try:
-        # Get or create event loop for this thread
-        loop = _get_event_loop()
-        return loop.run_until_complete(_create_pr())
+        return _run_in_background(_create_pr())
     except Exception as e:
         return {"status": "error", "message": f"Error in MCP client: {str(e)}"}
 
@@ -442,24 +833,20 @@ def create_issue_sync(
     Returns:
         Dictionary with Issue URL or error
     """
-    import asyncio
-
     # Parse repo_name
-    parts = repo_name.split("/")
-    if len(parts) != 2:
+    match = _REPO_RE.match(repo_name)
+    if match is None:
         return {
             "status": "error",
             "message": f"Invalid repo_name format. Expected 'owner/repo', got '{repo_name}'",
         }
 
-    owner, repo = parts
+    owner, repo = match.groups()
 
-    # Parse labels
-    label_list = labels.split(",") if labels else ["dependencies"]
-    label_list = [label.strip() for label in label_list]
+    label_list = list(_parse_labels(labels or "dependencies"))
 
     async def _create_issue():
-        async with GitHubMCPClient(github_token) as client:
+        async with pooled_client(github_token) as client:
             return await client.create_issue(
                 repo_owner=owner,
                 repo_name=repo,
@@ -469,17 +856,116 @@ def create_issue_sync(
             )
 
     try:
-        # Get or create event loop for this thread
-        loop = _get_event_loop()
-        return loop.run_until_complete(_create_issue())
+        return _run_in_background(_create_issue())
     except Exception as e:
         return {"status": "error", "message": f"Error in MCP client: {str(e)}"}
 
 
+def create_issues_sync(
+    repo_name: str,
+    issues: List[Dict[str, Any]],
+    github_token: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Synchronous wrapper for creating several issues over one MCP session.
+
+    Args:
+        repo_name: Repository in owner/repo format
+        issues: Dicts with title, body and optional labels (list of names)
+        github_token: GitHub token (optional, uses env var if not provided)
+
+    Returns:
+        List with an Issue URL or error for each issue, in order
+    """
+    match = _REPO_RE.match(repo_name)
+    if match is None:
+        message = f"Invalid repo_name format. Expected 'owner/repo', got '{repo_name}'"
+        return [{"status": "error", "message": message} for _ in issues]
+
+    owner, repo = match.groups()
+
+    async def _create_issues():
+        async with pooled_client(github_token) as client:
+            return await client.create_issues(owner, repo, issues)
+
+    try:
+        return _run_in_background(_create_issues())
+    except Exception as e:
+        message = f"Error in MCP client: {str(e)}"
+        return [{"status": "error", "message": message} for _ in issues]
+
+
+def create_pr_and_issue_sync(
+    repo_name: str,
+    branch_name: str,
+    pr_title: str,
+    pr_body: str,
+    issue_title: str,
+    issue_body: str,
+    base_branch: str = "main",
+    labels: Optional[str] = "dependencies",
+    github_token: Optional[str] = None,
+) -> Dict[str, Dict]:
+    """
+    Synchronous wrapper creating a PR and an issue concurrently via GitHub MCP.
+
+    Both requests are in flight at once over the same pooled MCP session.
+
+    Args:
+        repo_name: Repository in owner/repo format
+        branch_name: Source branch for the PR
+        pr_title: PR title
+        pr_body: PR description
+        issue_title: Issue title
+        issue_body: Issue description
+        base_branch: Target branch (default: main)
+        labels: Comma-separated issue labels (default: dependencies)
+        github_token: GitHub token (optional, uses env var if not provided)
+
+    Returns:
+        Dictionary with the "pr" and "issue" results
+    """
+    match = _REPO_RE.match(repo_name)
+    if match is None:
+        error = {
+            "status": "error",
+            "message": f"Invalid repo_name format. Expected 'owner/repo', got '{repo_name}'",
+        }
+        return {"pr": error, "issue": dict(error)}
+
+    owner, repo = match.groups()
+    label_list = list(_parse_labels(labels or "dependencies"))
+
+    async def _create_both():
+        async with pooled_client(github_token) as client:
+            pr, issue = await asyncio.gather(
+                client.create_pull_request(
+                    repo_owner=owner,
+                    repo_name=repo,
+                    title=pr_title,
+                    body=pr_body,
+                    head=branch_name,
+                    base=base_branch,
+                ),
+                client.create_issue(
+                    repo_owner=owner,
+                    repo_name=repo,
+                    title=issue_title,
+                    body=issue_body,
+                    labels=label_list,
+                ),
+            )
+        return {"pr": pr, "issue": issue}
+
+    try:
+        return _run_in_background(_create_both())
+    except Exception as e:
+        error = {"status": "error", "message": f"Error in MCP client: {str(e)}"}
+        return {"pr": error, "issue": dict(error)}
+
+
 # CLI testing
 if __name__ == "__main__":
-    import asyncio
-
     async def test_connection():
         """Test GitHub MCP connection and list available tools."""
         try:
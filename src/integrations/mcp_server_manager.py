@@ -9,13 +9,13 @@ avoiding container startup overhead for each request.
 
 import asyncio
 import os
-import subprocess
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 
+from src.utils import serialization
 from src.utils.docker import detect_container_runtime, get_docker_path
 
 load_dotenv()
@@ -214,22 +214,26 @@ class PersistentMCPServer:
     async def _get_running_container_id(self) -> Optional[str]:
         """Try to get the ID of the running MCP container."""
         try:
-            result = subprocess.run(
-                [
-                    self.docker_path,
-                    "ps",
-                    "-q",
-                    "--filter",
-                    "ancestor=ghcr.io/github/github-mcp-server",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=5,
+            proc = await asyncio.create_subprocess_exec(
+                self.docker_path,
+                "ps",
+                "-q",
+                "--filter",
+                "ancestor=ghcr.io/github/github-mcp-server",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
             )
-            if result.returncode == 0 and result.stdout.strip():
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return None
+            container_ids = stdout.decode().strip()
+            if proc.returncode == 0 and container_ids:
                 # Return the most recent container
-                return result.stdout.strip().split("\n")[0]
-        except Exception:
+                return container_ids.split("\n")[0]
+        except OSError:
             pass
         return None
 
@@ -306,11 +310,12 @@ class PersistentMCPServer:
                     else str(result.content[0])
                 )
 
-                import json
-
                 try:
-                    return {"status": "success", "data": json.loads(response_text)}
-                except json.JSONDecodeError:
+                    return {
+                        "status": "success",
+                        "data": serialization.loads(response_text),
+                    }
+                except serialization.JSONDecodeError:
                     return {"status": "success", "data": response_text}
 
             return {"status": "error", "message": "No response from MCP server"}
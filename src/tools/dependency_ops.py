@@ -3,18 +3,617 @@
 Dependency Operations - Helper tools for updating and rolling back dependencies
 """
 
-import json
+import asyncio
+import functools
 import re
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import TYPE_CHECKING, Dict, List, Literal, NamedTuple, Optional, Tuple
 
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+import httpx
 from dotenv import load_dotenv
-from langchain_anthropic import ChatAnthropic
 from langchain_core.tools import tool
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+from src.utils import serialization
+from src.utils.tools import tool_result
+from src.utils.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
 
 load_dotenv()
 
+# Package registry endpoints used for version lookups
+NPM_REGISTRY_URL = "https://registry.npmjs.org/{name}"
+PYPI_JSON_URL = "https://pypi.org/pypi/{name}/json"
+
+# npm's abbreviated metadata document, much smaller than the full packument
+_NPM_ABBREVIATED_METADATA = "application/vnd.npm.install-v1+json"
+
+# Package managers whose packages are published on PyPI
+_PYPI_PACKAGE_MANAGERS = ("pip", "pip-tools", "poetry", "pipenv", "uv")
+
+# Concurrent registry requests made by get_latest_versions_for_majors
+REGISTRY_MAX_CONCURRENCY = 16
+
+# Published versions by registry URL, reused for VERSIONS_CACHE_TTL seconds so
+# one run never fetches a package twice. Shared by agent tool threads and the
+# registry-prefetch thread.
+VERSIONS_CACHE_TTL = 300
+VERSIONS_CACHE_MAX_SIZE = 2048
+_VERSIONS_CACHE: TTLCache[List[str]] = TTLCache(
+    VERSIONS_CACHE_TTL, VERSIONS_CACHE_MAX_SIZE
+)
+
+# Cargo.toml table kinds that declare dependencies
+_CARGO_DEP_TABLES = ("dependencies", "dev-dependencies", "build-dependencies")
+
+# TOML table header, e.g. `[dependencies]` or `[dependencies.serde]`
+_TOML_HEADER_RE = re.compile(r"\s*\[([^\[\]]+)\]\s*(?:#.*)?$")
+
+# Bare key at the start of a `key = value` line
+_TOML_KEY_RE = re.compile(r"\s*([A-Za-z0-9_-]+)\s*=")
+
+# First quoted string in a value, and `version = "..."` inside an inline table
+_TOML_STRING_RE = re.compile(r'(["\'])([^"\']+)(["\'])')
+_CARGO_INLINE_VERSION_RE = re.compile(r'(\bversion\s*=\s*["\'])([^"\']+)(["\'])')
+
+# The requirement part of a requirements.txt line: package name, optional
+# extras and an optional specifier list. Markers, comments, `--hash` options and
+# line continuations after it are left unmatched so rewrites keep them; comment,
+# option and direct-reference (`name @ url`) lines never match.
+_REQ_SPEC = r"[ \t]*(?:===|[=~!<>]=|[<>])[ \t]*[^\s,;#\\]+"
+_REQ_LINE_RE = re.compile(
+    r"^[ \t]*([A-Za-z0-9][A-Za-z0-9_.\-]*)(\[[^\]\r\n]*\])?"
+    rf"({_REQ_SPEC}(?:[ \t]*,{_REQ_SPEC})*)?"
+    r"(?=[ \t]*(?:[;#\\\r]|--|$))",
+    re.M,
+)
+
+# Errors caused by malformed tool input (bad JSON/TOML, missing keys, wrong
+# shapes); these are reported back to the agent instead of raised
+_INPUT_ERRORS = (ValueError, KeyError, TypeError, AttributeError)
+
+# A JSON string literal or structural character, used to scan package.json
+# without parsing it
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\],]')
+
+# package.json files larger than this are patched in place instead of being
+# re-serialized, which also keeps their original formatting
+_LARGE_MANIFEST_BYTES = 64 * 1024
+
+# File types apply_all_updates knows how to rewrite
+_UPDATABLE_FILE_TYPES = ("package.json", "requirements.txt", "Cargo.toml")
+
+# Error output up to this length with no package names in it is not worth an
+# LLM round-trip
+_SHORT_ERROR_OUTPUT = 500
+
+# Outermost JSON object in an LLM response
+_JSON_BLOCK_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Range operators and prefixes skipped before the numeric part of a version
+_VERSION_PREFIX_CHARS = "^~>=<v "
+
+# Range operators preserved in front of a rewritten version
+_RANGE_OPERATOR_CHARS = "^~><=!"
+
+
+class Applied(NamedTuple):
+    """A dependency update applied to a file."""
+
+    name: str
+    old: str
+    new: str
+    section: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        """Convert to the JSON shape returned by apply_all_updates."""
+        data = self._asdict()
+        if not self.section:
+            del data["section"]
+        return data
+
+
+class UpdateEntry(NamedTuple):
+    """An outdated package, parsed once from a tool's JSON input."""
+
+    name: str
+    current: Optional[str]
+    latest: str
+
+    @classmethod
+    def from_dict(cls, pkg: Dict) -> "UpdateEntry":
+        """Accept both current/latest and current_version/latest_version keys."""
+        return cls(
+            pkg["name"],
+            pkg.get("current", pkg.get("current_version")),
+            pkg.get("latest", pkg.get("latest_version", "")),
+        )
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_semver(version: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse the numeric major.minor.patch of a version string.
+
+    Leading range operators (^, ~, >=, v, ...) are skipped, parsing stops at
+    the first non-numeric component and missing components count as 0.
+
+    Args:
+        version: Version string, e.g. "^1.2.3", "v2.0" or "1.0.0-beta"
+
+    Returns:
+        Tuple of (major, minor, patch), or None if there is no leading number
+    """
+    end = len(version)
+    start = end - len(version.lstrip(_VERSION_PREFIX_CHARS))
+
+    parts = [0, 0, 0]
+    for index in range(3):
+        stop = start
+        while stop < end and "0" <= version[stop] <= "9":
+            stop += 1
+        if stop == start:
+            if index == 0:
+                return None
+            break
+        parts[index] = int(version[start:stop])
+        if stop == end or version[stop] != ".":
+            break
+        start = stop + 1
+
+    return parts[0], parts[1], parts[2]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """Get the shared keep-alive client for package registry lookups."""
+    return httpx.Client(timeout=10.0, follow_redirects=True)
+
+
+def _registry_request(
+    package_name: str, package_manager: str
+) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    Build the registry metadata request for a package.
+
+    Args:
+        package_name: Package name (scoped npm names are supported)
+        package_manager: Package manager (npm, pip, poetry, ...)
+
+    Returns:
+        Tuple of (url, headers), or None if the package manager is unsupported
+    """
+    if package_manager == "npm":
+        url = NPM_REGISTRY_URL.format(name=package_name.replace("/", "%2F"))
+        return url, {"Accept": _NPM_ABBREVIATED_METADATA}
+    if package_manager in _PYPI_PACKAGE_MANAGERS:
+        return PYPI_JSON_URL.format(name=canonicalize_name(package_name)), {}
+    return None
+
+
+def _registry_versions(metadata: Dict, package_manager: str) -> List[str]:
+    """Extract the published version strings from registry metadata."""
+    if package_manager == "npm":
+        return list(metadata.get("versions", {}))
+    return list(metadata.get("releases", {}))
+
+
+def _latest_in_major(
+    versions: List[str], major_version: str, package_manager: str
+) -> Optional[str]:
+    """
+    Pick the newest stable release within a major version.
+
+    Args:
+        versions: Published version strings
+        major_version: Major version to stay within
+        package_manager: Package manager the versions come from
+
+    Returns:
+        Version string, or None if no stable release matches
+    """
+    if package_manager == "npm":
+        matching = [
+            v for v in versions if "-" not in v and v.split(".", 1)[0] == major_version
+        ]
+        return max(matching, key=_parse_semver) if matching else None
+
+    releases = []
+    for release in versions:
+        try:
+            version = Version(release)
+        except InvalidVersion:
+            continue
+        if not version.is_prerelease and str(version.major) == major_version:
+            releases.append((version, release))
+    return max(releases)[1] if releases else None
+
+
+def _fetch_versions(package_name: str, package_manager: str) -> Optional[List[str]]:
+    """
+    Fetch a package's published versions from its registry.
+
+    Args:
+        package_name: Package name
+        package_manager: Package manager (npm, pip, poetry, ...)
+
+    Returns:
+        Version strings, or None if the package manager is unsupported
+    """
+    request = _registry_request(package_name, package_manager)
+    if request is None:
+        return None
+    url, headers = request
+    versions = _VERSIONS_CACHE.get(url)
+    if versions is None:
+        response = _get_http_client().get(url, headers=headers)
+        response.raise_for_status()
+        versions = _registry_versions(response.json(), package_manager)
+        _VERSIONS_CACHE.set(url, versions)
+    return versions
+
+
+async def _fetch_versions_batch(
+    package_names: List[str], package_manager: str
+) -> Dict[str, Optional[List[str]]]:
+    """
+    Fetch published versions for several packages concurrently.
+
+    Args:
+        package_names: Package names
+        package_manager: Package manager (npm, pip, poetry, ...)
+
+    Returns:
+        Dict mapping package name to its versions (None if the lookup failed)
+    """
+    semaphore = asyncio.Semaphore(REGISTRY_MAX_CONCURRENCY)
+
+    async def fetch(
+        client: httpx.AsyncClient, name: str
+    ) -> Tuple[str, Optional[List[str]]]:
+        request = _registry_request(name, package_manager)
+        if request is None:
+            return name, None
+        url, headers = request
+        versions = _VERSIONS_CACHE.get(url)
+        if versions is not None:
+            return name, versions
+        async with semaphore:
+            try:
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                versions = _registry_versions(response.json(), package_manager)
+            except (httpx.HTTPError, ValueError):
+                return name, None
+        _VERSIONS_CACHE.set(url, versions)
+        return name, versions
+
+    async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+        results = await asyncio.gather(*(fetch(client, n) for n in package_names))
+    return dict(results)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm() -> "ChatAnthropic":
+    """Get the shared LLM client used for error analysis."""
+    # Imported on first use: the Anthropic SDK is slow to import and most
+    # tools in this module never need it
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(model="claude-sonnet-4-5-20250929", temperature=0)
+
+
+def classify_update(current: str, latest: str) -> Literal["major", "minor", "patch"]:
+    """
+    Classify a version change as a major, minor or patch update.
+
+    Args:
+        current: Current version, range prefixes allowed (e.g. "^17.0.2")
+        latest: Version being updated to
+
+    Returns:
+        "major", "minor" or "patch"; versions that cannot be parsed count
+        as "minor"
+    """
+    if "!" in current or "!" in latest:
+        # PEP 440 epochs ("1!2.0") are beyond the semver scanner
+        try:
+            curr_version = Version(current.lstrip(_VERSION_PREFIX_CHARS))
+            latest_version = Version(latest.lstrip(_VERSION_PREFIX_CHARS))
+        except InvalidVersion:
+            return "minor"
+        if (curr_version.epoch, curr_version.major) != (
+            latest_version.epoch,
+            latest_version.major,
+        ):
+            return "major"
+        return "minor" if curr_version.minor != latest_version.minor else "patch"
+
+    curr_parts = _parse_semver(current)
+    latest_parts = _parse_semver(latest)
+    if curr_parts is None or latest_parts is None:
+        return "minor"
+    if curr_parts[0] != latest_parts[0]:
+        return "major"
+    if curr_parts[1] != latest_parts[1]:
+        return "minor"
+    return "patch"
+
+
+def prefetch_rollback_versions(
+    outdated_packages: str, package_manager: str
+) -> Optional[threading.Thread]:
+    """
+    Start fetching registry versions for major updates in the background.
+
+    Rolling back a failed major update needs the latest release of the
+    package's current major line. Fetching those versions while the updater
+    applies and tests the updates lets get_latest_version_for_major(s) answer
+    from the versions cache instead of waiting on the registry.
+
+    Args:
+        outdated_packages: JSON list of outdated packages (name/current/latest)
+        package_manager: Package manager (npm, pip, poetry, ...)
+
+    Returns:
+        The started prefetch thread, or None if there is nothing to fetch
+    """
+    if _registry_request("", package_manager) is None:
+        return None
+    try:
+        packages = serialization.loads(outdated_packages)
+    except ValueError:
+        return None
+    if not isinstance(packages, list):
+        return None
+
+    entries = [
+        UpdateEntry.from_dict(pkg)
+        for pkg in packages
+        if isinstance(pkg, dict) and "name" in pkg
+    ]
+    names = [
+        entry.name
+        for entry in entries
+        if classify_update(str(entry.current or ""), str(entry.latest)) == "major"
+    ]
+    if not names:
+        return None
+
+    thread = threading.Thread(
+        target=asyncio.run,
+        args=(_fetch_versions_batch(names, package_manager),),
+        name="registry-prefetch",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _split_prefix(version: str) -> Tuple[str, str]:
+    """
+    Split a version requirement into its range operator and version.
+
+    Args:
+        version: Version requirement, e.g. "^1.2.3" or ">=2.0"
+
+    Returns:
+        Tuple of (operator prefix, remainder), e.g. ("^", "1.2.3")
+    """
+    remainder = version.lstrip(_RANGE_OPERATOR_CHARS)
+    return version[: len(version) - len(remainder)], remainder
+
+
+def _json_section_spans(
+    content: str, sections: Tuple[str, ...]
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Locate top-level JSON objects by key without building the document.
+
+    A single tokenizing regex skips over string literals, so braces inside
+    strings are ignored; only structural characters update the depth.
+
+    Args:
+        content: JSON text
+        sections: Top-level keys whose object values should be located
+
+    Returns:
+        Dict mapping each key found to the (start, end) offsets of its object
+    """
+    spans: Dict[str, Tuple[int, int]] = {}
+    depth = 0
+    key = None  # last string literal seen at depth 1
+    section = None
+    start = 0
+    for token in _JSON_TOKEN_RE.finditer(content):
+        char = token.group()[0]
+        if char == '"':
+            if depth == 1:
+                key = token.group()[1:-1]
+        elif char in "{[":
+            depth += 1
+            if depth == 2 and char == "{" and key in sections:
+                section, start = key, token.start()
+        elif char in "}]":
+            if depth == 2 and section is not None:
+                spans[section] = (start, token.end())
+                if len(spans) == len(sections):
+                    break
+                section = None
+            depth -= 1
+        elif depth == 1:  # ","
+            key = None
+    return spans
+
+
+def _patch_package_json_text(
+    content: str, package_data: Dict, applied_updates: List[Applied]
+) -> Optional[str]:
+    """
+    Write applied package.json updates directly into the original text.
+
+    Each dependency section is located with a brace scanner and only the
+    version strings inside it are rewritten, so the rest of the file is
+    copied verbatim.
+
+    Args:
+        content: Original package.json content
+        package_data: Parsed package.json with the updates already applied
+        applied_updates: Updates applied to package_data
+
+    Returns:
+        Patched content, or None if the updates cannot be patched safely
+        (a section cannot be located or an entry is not a plain string)
+    """
+    by_section: Dict[str, Dict[str, str]] = {}
+    for applied in applied_updates:
+        new_value = package_data[applied.section][applied.name]
+        by_section.setdefault(applied.section, {})[applied.name] = new_value
+
+    spans = _json_section_spans(content, tuple(by_section))
+    if len(spans) != len(by_section):
+        return None
+
+    pieces = []
+    position = 0
+    for section, (start, end) in sorted(spans.items(), key=lambda item: item[1]):
+        new_values = by_section[section]
+        names = "|".join(map(re.escape, sorted(new_values, key=len, reverse=True)))
+        pattern = re.compile(r'("(' + names + r')"\s*:\s*")[^"\\]*(")')
+        patched, count = pattern.subn(
+            lambda m: f"{m.group(1)}{new_values[m.group(2)]}{m.group(3)}",
+            content[start:end],
+        )
+        if count != len(new_values):
+            return None
+        pieces.extend((content[position:start], patched))
+        position = end
+    pieces.append(content[position:])
+    return "".join(pieces)
+
+
+def _pin_requirement(match: re.Match, version: str) -> str:
+    """
+    Pin a requirements.txt line matched by _REQ_LINE_RE to an exact version.
+
+    Only the name, extras and specifier span are rewritten; indentation and
+    anything after the specifier (markers, comments, hashes) stay untouched.
+
+    Args:
+        match: _REQ_LINE_RE match for the line
+        version: Version to pin
+
+    Returns:
+        Replacement text for the match
+    """
+    indent = match.group(0)[: match.start(1) - match.start()]
+    return f"{indent}{match.group(1)}{match.group(2) or ''}=={version}"
+
+
+def _cargo_declared_versions(data: Dict) -> Dict[str, str]:
+    """
+    Collect the declared version of every dependency in a parsed Cargo.toml.
+
+    Covers top-level, [workspace] and [target.*] dependency tables, with both
+    string and table (`{ version = "..." }`) specs.
+
+    Args:
+        data: Parsed Cargo.toml
+
+    Returns:
+        Dict mapping casefolded dependency name to its version requirement
+    """
+    tables = [data, data.get("workspace", {}), *data.get("target", {}).values()]
+    versions = {}
+    for table in tables:
+        for section in _CARGO_DEP_TABLES:
+            for name, spec in table.get(section, {}).items():
+                version = spec.get("version") if isinstance(spec, dict) else spec
+                if isinstance(version, str):
+                    versions[name.casefold()] = version
+    return versions
+
+
+def _apply_cargo_updates(
+    current_content: str, updates_dict: Dict[str, UpdateEntry]
+) -> Tuple[str, List[Applied]]:
+    """
+    Update dependency versions in Cargo.toml content in place.
+
+    The file is parsed once with tomllib to find the declared dependencies,
+    then only the matching version strings are rewritten so comments and
+    formatting are preserved. If the file is not valid TOML, every
+    `name = "version"` line in a dependency table is treated as a candidate.
+
+    Args:
+        current_content: Current Cargo.toml content
+        updates_dict: Updates keyed by casefolded package name
+
+    Returns:
+        Tuple of (updated content, applied updates)
+    """
+    try:
+        declared = _cargo_declared_versions(tomllib.loads(current_content))
+    except tomllib.TOMLDecodeError:
+        declared = None
+
+    updated_lines = []
+    applied_updates = []
+    in_dependencies = False
+    table_dependency = None  # set inside `[dependencies.<name>]` tables
+
+    for line in current_content.splitlines(keepends=True):
+        header = _TOML_HEADER_RE.match(line)
+        if header:
+            parent, _, child = header.group(1).strip().rpartition(".")
+            in_dependencies = child in _CARGO_DEP_TABLES
+            table_dependency = (
+                child if parent.rpartition(".")[2] in _CARGO_DEP_TABLES else None
+            )
+            updated_lines.append(line)
+            continue
+
+        key_match = _TOML_KEY_RE.match(line)
+        if table_dependency:
+            is_version = key_match and key_match.group(1) == "version"
+            pkg_name = table_dependency if is_version else None
+        elif in_dependencies and key_match:
+            pkg_name = key_match.group(1)
+        else:
+            pkg_name = None
+
+        key = pkg_name.casefold() if pkg_name else None
+        if key not in updates_dict or (declared is not None and key not in declared):
+            updated_lines.append(line)
+            continue
+
+        value_start = key_match.end()
+        value = line[value_start:]
+        inline_table = value.lstrip().startswith("{")
+        pattern = _CARGO_INLINE_VERSION_RE if inline_table else _TOML_STRING_RE
+        match = pattern.search(value)
+        if not match:
+            updated_lines.append(line)
+            continue
+
+        new_version = updates_dict[key].latest
+        start, end = value_start + match.start(2), value_start + match.end(2)
+        updated_lines.append(f"{line[:start]}{new_version}{line[end:]}")
+        applied_updates.append(Applied(pkg_name, match.group(2), new_version))
+
+    return "".join(updated_lines), applied_updates
+
 
 @tool
+@tool_result("Error applying updates", _INPUT_ERRORS)
 def apply_all_updates(
     current_content: str, outdated_packages: str, file_type: str
 ) -> str:
@@ -29,154 +628,87 @@ def apply_all_updates(
     Returns:
         JSON with updated content and list of applied updates
     """
-    try:
-        updates = json.loads(outdated_packages)
-        applied_updates = []
-
-        # Normalize: accept both "latest" and "latest_version" keys
-        for u in updates:
-            if "latest" not in u and "latest_version" in u:
-                u["latest"] = u["latest_version"]
-
-        if file_type == "package.json":
-            package_data = json.loads(current_content)
-
-            # Update dependencies
-            for section in ["dependencies", "devDependencies", "peerDependencies"]:
-                if section in package_data:
-                    for update in updates:
-                        pkg_name = update["name"]
-                        new_version = update.get(
-                            "latest", update.get("latest_version", "")
-                        )
-
-                        if pkg_name in package_data[section]:
-                            old_version = package_data[section][pkg_name]
-                            # Preserve version prefix (^, ~, etc.)
-                            prefix = ""
-                            if old_version.startswith("^"):
-                                prefix = "^"
-                            elif old_version.startswith("~"):
-                                prefix = "~"
-                            elif old_version.startswith(">="):
-                                prefix = ">="
-
-                            package_data[section][pkg_name] = f"{prefix}{new_version}"
-                            applied_updates.append(
-                                {
-                                    "name": pkg_name,
-                                    "old": update.get("current", old_version),
-                                    "new": new_version,
-                                    "section": section,
-                                }
-                            )
-
-            updated_content = json.dumps(package_data, indent=2)
-
-        elif file_type == "requirements.txt":
-            lines = current_content.split("\n")
-            updated_lines = []
-            updates_dict = {u["name"].lower(): u for u in updates}
-
-            for line in lines:
-                stripped = line.strip()
-
-                # Keep comments and empty lines
-                if not stripped or stripped.startswith("#"):
-                    updated_lines.append(line)
+    updates = [UpdateEntry.from_dict(u) for u in serialization.loads(outdated_packages)]
+    applied_updates = []
+    updates_dict = {u.name.casefold(): u for u in updates}
+
+    if not updates_dict and file_type in _UPDATABLE_FILE_TYPES:
+        # Nothing to apply; skip parsing and re-serializing the file
+        updated_content = current_content
+
+    elif file_type == "package.json":
+        package_data = serialization.loads(current_content)
+
+        # Single pass over each section, looking updates up by exact npm name
+        updates_by_name = {u.name: u for u in updates}
+        for section in ("dependencies", "devDependencies", "peerDependencies"):
+            deps = package_data.get(section)
+            if not deps:
+                continue
+            for pkg_name, old_version in deps.items():
+                update = updates_by_name.get(pkg_name)
+                if update is None:
                     continue
-
-                # Parse package name
-                pkg_name = None
-                if "==" in stripped:
-                    pkg_name = stripped.split("==")[0].strip()
-                elif ">=" in stripped:
-                    pkg_name = stripped.split(">=")[0].strip()
-                elif "<=" in stripped:
-                    pkg_name = stripped.split("<=")[0].strip()
-                else:
-                    pkg_name = stripped
-
-                # Update if found
-                if pkg_name and pkg_name.lower() in updates_dict:
-                    update_info = updates_dict[pkg_name.lower()]
-                    new_version = update_info.get(
-                        "latest", update_info.get("latest_version", "")
-                    )
-                    updated_lines.append(f"{pkg_name}=={new_version}")
-                    applied_updates.append(
-                        {
-                            "name": pkg_name,
-                            "old": update_info.get("current", "unknown"),
-                            "new": new_version,
-                        }
+                new_version = update.latest
+                # Preserve version prefix (^, ~, >=, etc.)
+                deps[pkg_name] = f"{_split_prefix(old_version)[0]}{new_version}"
+                applied_updates.append(
+                    Applied(
+                        pkg_name,
+                        update.current or old_version,
+                        new_version,
+                        section,
                     )
-                else:
-                    updated_lines.append(line)
-
-            updated_content = "\n".join(updated_lines)
-
-        elif file_type == "Cargo.toml":
-            lines = current_content.split("\n")
-            updated_lines = []
-            updates_dict = {u["name"].lower(): u for u in updates}
-            in_dependencies = False
-
-            for line in lines:
-                # Track if we're in dependencies section
-                if line.strip().startswith("["):
-                    in_dependencies = "dependencies" in line.lower()
-
-                # Try to update version
-                if in_dependencies and "=" in line and not line.strip().startswith("#"):
-                    match = re.match(
-                        r'(\s*)([a-zA-Z0-9_-]+)\s*=\s*["\']([^"\']+)["\']', line
-                    )
-                    if match:
-                        indent, pkg_name, current_version = match.groups()
-                        if pkg_name.lower() in updates_dict:
-                            update_info = updates_dict[pkg_name.lower()]
-                            new_version = update_info.get(
-                                "latest", update_info.get("latest_version", "")
-                            )
-                            updated_lines.append(
-                                f'{indent}{pkg_name} = "{new_version}"'
-                            )
-                            applied_updates.append(
-                                {
-                                    "name": pkg_name,
-                                    "old": current_version,
-                                    "new": new_version,
-                                }
-                            )
-                            continue
-
-                updated_lines.append(line)
-
-            updated_content = "\n".join(updated_lines)
+                )
 
+        if not applied_updates:
+            # None of the updates is declared here; keep the file byte-for-byte
+            updated_content = current_content
         else:
-            return json.dumps(
-                {"status": "error", "message": f"Unsupported file type: {file_type}"}
-            )
-
-        return json.dumps(
-            {
-                "status": "success",
-                "updated_content": updated_content,
-                "applied_updates": applied_updates,
-                "total_updates": len(applied_updates),
-            },
-            indent=2,
+            updated_content = None
+            if len(current_content) > _LARGE_MANIFEST_BYTES:
+                updated_content = _patch_package_json_text(
+                    current_content, package_data, applied_updates
+                )
+            if updated_content is None:
+                updated_content = serialization.dumps(package_data, indent=True)
+
+    elif file_type == "requirements.txt":
+
+        def update_requirement(match: re.Match) -> str:
+            pkg_name = match.group(1)
+            update_info = updates_dict.get(pkg_name.casefold())
+            if not update_info:
+                return match.group(0)
+            new_version = update_info.latest
+            old_version = update_info.current or "unknown"
+            applied_updates.append(Applied(pkg_name, old_version, new_version))
+            return _pin_requirement(match, new_version)
+
+        updated_content = _REQ_LINE_RE.sub(update_requirement, current_content)
+
+    elif file_type == "Cargo.toml":
+        updated_content, applied_updates = _apply_cargo_updates(
+            current_content, updates_dict
         )
 
-    except Exception as e:
-        return json.dumps(
-            {"status": "error", "message": f"Error applying updates: {str(e)}"}
+    else:
+        return serialization.dumps(
+            {"status": "error", "message": f"Unsupported file type: {file_type}"}
         )
 
+    return serialization.dumps(
+        {
+            "status": "success",
+            "updated_content": updated_content,
+            "applied_updates": [applied.to_dict() for applied in applied_updates],
+            "total_updates": len(applied_updates),
+        }
+    )
+
 
 @tool
+@tool_result("Error rolling back", _INPUT_ERRORS)
 def rollback_major_update(
     current_content: str, package_name: str, file_type: str, target_version: str
 ) -> str:
@@ -192,91 +724,114 @@ def rollback_major_update(
     Returns:
         JSON with updated content after rollback
     """
-    try:
-        if file_type == "package.json":
-            package_data = json.loads(current_content)
-
-            # Find and rollback in all sections
-            for section in ["dependencies", "devDependencies", "peerDependencies"]:
-                if section in package_data and package_name in package_data[section]:
-                    old_value = package_data[section][package_name]
-                    prefix = ""
-                    if old_value.startswith("^"):
-                        prefix = "^"
-                    elif old_value.startswith("~"):
-                        prefix = "~"
+    if file_type == "package.json":
+        package_data = serialization.loads(current_content)
+
+        # Find and rollback in all sections
+        rolled_back = False
+        for section in ["dependencies", "devDependencies", "peerDependencies"]:
+            if section in package_data and package_name in package_data[section]:
+                prefix = _split_prefix(package_data[section][package_name])[0]
+                package_data[section][package_name] = f"{prefix}{target_version}"
+                rolled_back = True
+
+        updated_content = (
+            serialization.dumps(package_data, indent=True)
+            if rolled_back
+            else current_content
+        )
 
-                    package_data[section][package_name] = f"{prefix}{target_version}"
+    elif file_type == "requirements.txt":
+        target_name = package_name.casefold()
 
-            updated_content = json.dumps(package_data, indent=2)
+        def rollback_requirement(match: re.Match) -> str:
+            if match.group(1).casefold() != target_name:
+                return match.group(0)
+            return _pin_requirement(match, target_version)
 
-        elif file_type == "requirements.txt":
-            lines = current_content.split("\n")
-            updated_lines = []
+        updated_content = _REQ_LINE_RE.sub(rollback_requirement, current_content)
 
-            for line in lines:
-                stripped = line.strip()
+    elif file_type == "Cargo.toml":
+        lines = current_content.splitlines(keepends=True)
+        updated_lines = []
+        package_re = re.compile(
+            r"(\s*)(" + re.escape(package_name) + r')\s*=\s*["\']([^"\']+)["\']'
+        )
 
-                if not stripped or stripped.startswith("#"):
-                    updated_lines.append(line)
-                    continue
+        for line in lines:
+            match = package_re.match(line)
+            if match:
+                start, end = match.span(3)
+                updated_lines.append(f"{line[:start]}{target_version}{line[end:]}")
+            else:
+                updated_lines.append(line)
 
-                # Check if this is the package to rollback
-                if "==" in stripped:
-                    pkg_name = stripped.split("==")[0].strip()
-                    if pkg_name.lower() == package_name.lower():
-                        updated_lines.append(f"{pkg_name}=={target_version}")
-                        continue
+        updated_content = "".join(updated_lines)
 
-                updated_lines.append(line)
+    else:
+        return serialization.dumps(
+            {"status": "error", "message": f"Unsupported file type: {file_type}"}
+        )
 
-            updated_content = "\n".join(updated_lines)
+    return serialization.dumps(
+        {
+            "status": "success",
+            "updated_content": updated_content,
+            "package": package_name,
+            "rolled_back_to": target_version,
+        }
+    )
 
-        elif file_type == "Cargo.toml":
-            lines = current_content.split("\n")
-            updated_lines = []
 
-            for line in lines:
-                match = re.match(
-                    r"(\s*)("
-                    + re.escape(package_name)
-                    + r')\s*=\s*["\']([^"\']+)["\']',
-                    line,
-                )
-                if match:
-                    indent, pkg_name, _ = match.groups()
-                    updated_lines.append(f'{indent}{pkg_name} = "{target_version}"')
-                else:
-                    updated_lines.append(line)
+def _mentioned_packages(error_output: str, package_names: List[str]) -> List[str]:
+    """
+    Find the updated packages named in an error output.
 
-            updated_content = "\n".join(updated_lines)
+    Names are matched case-insensitively as whole words in a single regex
+    pass, so "react" does not match inside "react-dom".
 
-        else:
-            return json.dumps(
-                {"status": "error", "message": f"Unsupported file type: {file_type}"}
-            )
+    Args:
+        error_output: Error output from build/test command
+        package_names: Names of the updated packages
 
-        return json.dumps(
-            {
-                "status": "success",
-                "updated_content": updated_content,
-                "package": package_name,
-                "rolled_back_to": target_version,
+    Returns:
+        Mentioned package names, in package_names order
+    """
+    if not package_names:
+        return []
+    names = sorted({name.lower() for name in package_names}, key=len, reverse=True)
+    pattern = re.compile(
+        r"(?<![\w.-])(" + "|".join(map(re.escape, names)) + r")(?![\w-])"
+    )
+    found = {match.group(1) for match in pattern.finditer(error_output.lower())}
+    return [name for name in package_names if name.lower() in found]
+
+
+def _error_analysis(
+    package: Optional[str], confidence: str, reasoning: str, error_type: str = "unknown"
+) -> str:
+    """Build the parse_error_for_dependency success envelope."""
+    return serialization.dumps(
+        {
+            "status": "success",
+            "analysis": {
+                "suspected_package": package,
+                "confidence": confidence,
+                "reasoning": reasoning,
+                "error_type": error_type,
             },
-            indent=2,
-        )
-
-    except Exception as e:
-        return json.dumps(
-            {"status": "error", "message": f"Error rolling back: {str(e)}"}
-        )
+        },
+        indent=True,
+    )
 
 
 @tool
+@tool_result("Error parsing error output")
 def parse_error_for_dependency(error_output: str, updated_packages: str) -> str:
     """
     Analyze error output to identify which dependency likely caused the failure.
-    Uses AI to intelligently parse error messages.
+    Uses AI to intelligently parse error messages when a keyword scan is
+    ambiguous.
 
     Args:
         error_output: Error output from build/test command
@@ -285,17 +840,29 @@ def parse_error_for_dependency(error_output: str, updated_packages: str) -> str:
     Returns:
         JSON with identified problematic package and confidence level
     """
-    try:
-        packages = json.loads(updated_packages)
-        package_names = [p["name"] for p in packages]
+    packages = serialization.loads(updated_packages)
+    package_names = [p["name"] for p in packages]
+
+    # Cheap path: skip the LLM when the keyword scan is unambiguous
+    mentioned = _mentioned_packages(error_output, package_names)
+    if len(mentioned) == 1:
+        return _error_analysis(
+            mentioned[0],
+            "high",
+            f"'{mentioned[0]}' is the only updated package in the error output",
+        )
+    if not mentioned and len(error_output) <= _SHORT_ERROR_OUTPUT:
+        return _error_analysis(
+            None, "low", "Could not identify specific package from error output"
+        )
 
-        # Use LLM to analyze the error
-        llm = ChatAnthropic(model="claude-sonnet-4-5-20250929", temperature=0)
+    # Use LLM to analyze the error
+    llm = _get_llm()
 
-        prompt = f"""Analyze this error output from a build/test command and identify which dependency likely caused the failure.
+    prompt = f"""Analyze this error output from a build/test command and identify which dependency likely caused the failure.
 
 Updated packages:
-{json.dumps(package_names, indent=2)}
+{serialization.dumps(package_names, indent=True)}
 
 Error output:
 {error_output[:3000]}
@@ -314,53 +881,31 @@ Return ONLY a JSON object with this structure:
   "error_type": "import_error|api_change|type_error|other"
 }}"""
 
-        result = llm.invoke(prompt)
-        content = result.content
-
-        # Try to extract JSON from the response
-        json_match = re.search(r"\{.*\}", content, re.DOTALL)
-        if json_match:
-            parsed_result = json.loads(json_match.group())
-            return json.dumps(
-                {"status": "success", "analysis": parsed_result}, indent=2
-            )
-        else:
-            # Fallback: simple keyword matching
-            for package in package_names:
-                if package.lower() in error_output.lower():
-                    return json.dumps(
-                        {
-                            "status": "success",
-                            "analysis": {
-                                "suspected_package": package,
-                                "confidence": "medium",
-                                "reasoning": f"Package name '{package}' found in error output",
-                                "error_type": "unknown",
-                            },
-                        },
-                        indent=2,
-                    )
+    result = llm.invoke(prompt)
+    content = result.content
 
-            return json.dumps(
-                {
-                    "status": "success",
-                    "analysis": {
-                        "suspected_package": None,
-                        "confidence": "low",
-                        "reasoning": "Could not identify specific package from error output",
-                        "error_type": "unknown",
-                    },
-                },
-                indent=2,
-            )
-
-    except Exception as e:
-        return json.dumps(
-            {"status": "error", "message": f"Error parsing error output: {str(e)}"}
+    # Try to extract JSON from the response
+    json_match = _JSON_BLOCK_RE.search(content)
+    if json_match:
+        parsed_result = serialization.loads(json_match.group())
+        return serialization.dumps(
+            {"status": "success", "analysis": parsed_result}, indent=True
+        )
+    elif mentioned:
+        # Fallback: first package named in the error output
+        return _error_analysis(
+            mentioned[0],
+            "medium",
+            f"Package name '{mentioned[0]}' found in error output",
+        )
+    else:
+        return _error_analysis(
+            None, "low", "Could not identify specific package from error output"
         )
 
 
 @tool
+@tool_result("Error categorizing updates", _INPUT_ERRORS)
 def categorize_updates(outdated_packages: str) -> str:
     """
     Categorize dependency updates into major, minor, and patch.
@@ -371,78 +916,39 @@ def categorize_updates(outdated_packages: str) -> str:
     Returns:
         JSON with categorized updates
     """
-    try:
-        parsed = json.loads(outdated_packages)
-
-        # Handle wrapped formats: {"outdated_dependencies": [...]} or {"packages": [...]}
-        if isinstance(parsed, dict):
-            for key in ["outdated_dependencies", "outdated_packages", "packages"]:
-                if key in parsed and isinstance(parsed[key], list):
-                    parsed = parsed[key]
-                    break
+    parsed = serialization.loads(outdated_packages)
+
+    # Handle wrapped formats: {"outdated_dependencies": [...]} or {"packages": [...]}
+    if isinstance(parsed, dict):
+        for key in ["outdated_dependencies", "outdated_packages", "packages"]:
+            if key in parsed and isinstance(parsed[key], list):
+                parsed = parsed[key]
+                break
+        else:
+            # If it's a dict with no known list key, wrap in a list
+            if "name" in parsed:
+                parsed = [parsed]
             else:
-                # If it's a dict with no known list key, wrap in a list
-                if "name" in parsed:
-                    parsed = [parsed]
-                else:
-                    parsed = []
-
-        packages = parsed
-
-        major_updates = []
-        minor_updates = []
-        patch_updates = []
-
-        for pkg in packages:
-            name = pkg.get("name", "unknown")
-            # Accept both "current"/"latest" and "current_version"/"latest_version"
-            current = pkg.get("current", pkg.get("current_version", "0.0.0"))
-            latest = pkg.get("latest", pkg.get("latest_version", "0.0.0"))
-            current = current.lstrip("^~>=v")
-            latest = latest.lstrip("^~>=v")
+                parsed = []
 
-            try:
-                curr_parts = current.split(".")
-                latest_parts = latest.split(".")
-
-                if len(curr_parts) >= 1 and len(latest_parts) >= 1:
-                    if curr_parts[0] != latest_parts[0]:
-                        major_updates.append(pkg)
-                    elif (
-                        len(curr_parts) >= 2
-                        and len(latest_parts) >= 2
-                        and curr_parts[1] != latest_parts[1]
-                    ):
-                        minor_updates.append(pkg)
-                    else:
-                        patch_updates.append(pkg)
-                else:
-                    minor_updates.append(pkg)
-            except:
-                minor_updates.append(pkg)
-
-        return json.dumps(
-            {
-                "status": "success",
-                "major": major_updates,
-                "minor": minor_updates,
-                "patch": patch_updates,
-                "counts": {
-                    "major": len(major_updates),
-                    "minor": len(minor_updates),
-                    "patch": len(patch_updates),
-                },
-            },
-            indent=2,
-        )
+    buckets: Dict[str, List[Dict]] = {"major": [], "minor": [], "patch": []}
+    for pkg in parsed:
+        # Accept both "current"/"latest" and "current_version"/"latest_version"
+        current = pkg.get("current", pkg.get("current_version", "0.0.0"))
+        latest = pkg.get("latest", pkg.get("latest_version", "0.0.0"))
+        buckets[classify_update(str(current), str(latest))].append(pkg)
 
-    except Exception as e:
-        return json.dumps(
-            {"status": "error", "message": f"Error categorizing updates: {str(e)}"}
-        )
+    return serialization.dumps(
+        {
+            "status": "success",
+            **buckets,
+            "counts": {kind: len(pkgs) for kind, pkgs in buckets.items()},
+        }
+    )
 
 
 @tool
+@tool_result("Error getting version info", (httpx.HTTPError, *_INPUT_ERRORS))
 def get_latest_version_for_major(
     package_name: str, major_version: str, package_manager: str
 ) -> str:
@@ -452,53 +958,76 @@ def get_latest_version_for_major(
     Args:
         package_name: Name of the package
         major_version: Major version to stay within (e.g., "17" for React 17.x)
-        package_manager: Package manager (npm, pip, cargo)
+        package_manager: Package manager (npm, pip, poetry, ...)
 
     Returns:
         JSON with the latest version in that major version line
     """
-    try:
-        import subprocess
-
-        if package_manager == "npm":
-            result = subprocess.run(
-                ["npm", "view", package_name, "versions", "--json"],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-
-            if result.returncode == 0:
-                versions = json.loads(result.stdout)
-                if not isinstance(versions, list):
-                    versions = [versions]
-
-                # Filter for major version
-                matching_versions = [
-                    v for v in versions if v.split(".")[0] == major_version
-                ]
-
-                if matching_versions:
-                    # Get the latest
-                    latest = matching_versions[-1]
-                    return json.dumps(
-                        {
-                            "status": "success",
-                            "package": package_name,
-                            "major_version": major_version,
-                            "latest_in_major": latest,
-                        }
-                    )
-
-        # Fallback or other package managers
-        return json.dumps(
+    major_version = str(major_version).lstrip("v")
+    versions = _fetch_versions(package_name, package_manager)
+    latest = (
+        _latest_in_major(versions, major_version, package_manager)
+        if versions
+        else None
+    )
+
+    if latest:
+        return serialization.dumps(
             {
-                "status": "error",
-                "message": f"Could not find latest version for {package_name} major {major_version}",
+                "status": "success",
+                "package": package_name,
+                "major_version": major_version,
+                "latest_in_major": latest,
             }
         )
 
-    except Exception as e:
-        return json.dumps(
-            {"status": "error", "message": f"Error getting version info: {str(e)}"}
-        )
+    # No matching release or unsupported package manager
+    return serialization.dumps(
+        {
+            "status": "error",
+            "message": f"Could not find latest version for {package_name} major {major_version}",
+        }
+    )
+
+
+@tool
+@tool_result("Error getting version info", (httpx.HTTPError, *_INPUT_ERRORS))
+def get_latest_versions_for_majors(packages: str, package_manager: str) -> str:
+    """
+    Get the latest version within the current major version of several packages.
+    Registry lookups run concurrently, so prefer this over calling
+    get_latest_version_for_major once per package.
+
+    Args:
+        packages: JSON list of {"name": ..., "major_version": ...} objects
+            ("current" is used to derive the major version if it is missing)
+        package_manager: Package manager (npm, pip, poetry, ...)
+
+    Returns:
+        JSON mapping each package name to its latest version in that major
+        version line (null when none was found)
+    """
+    majors = {}
+    for pkg in serialization.loads(packages):
+        major = pkg.get("major_version")
+        if major is None:
+            parsed = _parse_semver(str(pkg.get("current", "")))
+            major = parsed[0] if parsed else ""
+        majors[pkg["name"]] = str(major).lstrip("v")
+
+    versions = asyncio.run(_fetch_versions_batch(list(majors), package_manager))
+    latest = {
+        name: _latest_in_major(versions[name], major, package_manager)
+        if versions[name]
+        else None
+        for name, major in majors.items()
+    }
+
+    return serialization.dumps(
+        {
+            "status": "success",
+            "package_manager": package_manager,
+            "latest_in_major": latest,
+        }
+    )
+
@@ -1,87 +1,76 @@
 """Docker and container runtime utilities."""
 
+import functools
 import os
 import shutil
-import subprocess
 from typing import Optional
 
 
+# Directories Docker installers commonly use outside of PATH
+_DOCKER_DIRS = (
+    "/usr/local/bin",
+    "/usr/bin",
+    "/opt/homebrew/bin",
+    "/Applications/Docker.app/Contents/Resources/bin",
+)
+
+# Install locations checked for container runtimes outside of PATH,
+# macOS (Homebrew, MacPorts, OrbStack) before Linux
+_COMMAND_DIRS = (
+    "/usr/local/bin",
+    "/opt/homebrew/bin",
+    "/usr/bin",
+    "/opt/local/bin",
+    "/Applications/OrbStack.app/Contents/MacOS",
+    os.path.expanduser("~/.orbstack/bin"),
+    "/bin",
+    "/snap/bin",
+    os.path.expanduser("~/.local/bin"),
+)
+
+
+@functools.lru_cache(maxsize=1)
 def get_docker_path() -> str:
     """Get the absolute path to the docker executable.
 
     Using absolute paths prevents PyCharm debugger issues where it
-    tries to check if 'docker' is a Python script.
+    tries to check if 'docker' is a Python script. The lookup is done
+    once per process.
     """
-    docker_path = shutil.which("docker")
-    if docker_path:
-        return docker_path
-
-    # Common Docker paths on different systems
-    common_paths = [
-        "/usr/local/bin/docker",
-        "/usr/bin/docker",
-        "/opt/homebrew/bin/docker",
-        "/Applications/Docker.app/Contents/Resources/bin/docker",
-    ]
-
-    for path in common_paths:
-        if os.path.isfile(path) and os.access(path, os.X_OK):
-            return path
-
-    return "docker"  # Fallback to PATH lookup
+    return (
+        shutil.which("docker")
+        or shutil.which("docker", path=os.pathsep.join(_DOCKER_DIRS))
+        or "docker"  # Fallback to PATH lookup
+    )
 
 
+@functools.lru_cache(maxsize=None)
 def find_command_path(command: str) -> Optional[str]:
     """
     Find the full path to a command, checking common locations.
 
+    Results are cached for the lifetime of the process.
+
     Args:
         command: Command name to find (e.g., 'docker', 'podman')
 
     Returns:
         Full path to command if found, None otherwise
     """
-    # First try using shutil.which (respects PATH)
-    cmd_path = shutil.which(command)
-    if cmd_path:
-        return cmd_path
-
-    # Common installation paths for macOS
-    common_paths_mac = [
-        f"/usr/local/bin/{command}",
-        f"/opt/homebrew/bin/{command}",
-        f"/usr/bin/{command}",
-        f"/opt/local/bin/{command}",
-        # OrbStack specific paths
-        f"/Applications/OrbStack.app/Contents/MacOS/{command}",
-        f"~/.orbstack/bin/{command}",
-    ]
-
-    # Common installation paths for Linux
-    common_paths_linux = [
-        f"/usr/local/bin/{command}",
-        f"/usr/bin/{command}",
-        f"/bin/{command}",
-        f"/snap/bin/{command}",
-        f"~/.local/bin/{command}",
-    ]
-
-    # Try macOS paths first, then Linux
-    all_paths = common_paths_mac + common_paths_linux
-
-    # Expand ~ and check if file exists
-    for path in all_paths:
-        expanded_path = os.path.expanduser(path)
-        if os.path.isfile(expanded_path) and os.access(expanded_path, os.X_OK):
-            return expanded_path
-
-    return None
+    # PATH first, then the usual macOS and Linux install locations
+    return shutil.which(command) or shutil.which(
+        command, path=os.pathsep.join(_COMMAND_DIRS)
+    )
 
 
+@functools.lru_cache(maxsize=None)
 def detect_container_runtime() -> str:
     """
     Auto-detect available container runtime.
 
+    The detected runtime is cached for the lifetime of the process; a
+    failed detection is not cached, so it is retried on the next call.
+
     Checks for container runtimes in order of preference:
     1. docker (Docker Desktop, OrbStack, Rancher Desktop)
     2. podman (Podman Desktop, native Podman)
@@ -96,21 +85,12 @@ def detect_container_runtime() -> str:
     runtimes = ["docker", "podman", "nerdctl"]
 
     for runtime in runtimes:
-        # Try to find the command path
+        # An executable on disk is enough; no --version probe is spawned.
+        # Always return the full path to avoid PATH issues
+        # (especially important for PyCharm debugger and subprocess calls)
         cmd_path = find_command_path(runtime)
-
         if cmd_path:
-            # Verify it works by running --version
-            try:
-                result = subprocess.run(
-                    [cmd_path, "--version"], capture_output=True, timeout=5, text=True
-                )
-                if result.returncode == 0:
-                    # Always return the full path to avoid PATH issues
-                    # (especially important for PyCharm debugger and subprocess calls)
-                    return cmd_path
-            except (subprocess.TimeoutExpired, Exception):
-                continue
+            return cmd_path
 
     # Provide helpful error message
     error_msg = (
@@ -0,0 +1,15 @@
+"""LLM prompt utilities."""
+
+from langchain_core.messages import SystemMessage
+
+
+def cached_system_prompt(text: str) -> SystemMessage:
+    """Build a system prompt marked for Anthropic prompt caching.
+
+    The cache breakpoint on the system block covers the tool definitions
+    and system prompt, so every model call after the first in an agent
+    run reads them from the cache instead of re-processing them.
+    """
+    return SystemMessage(
+        content=[{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+    )
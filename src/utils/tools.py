@@ -0,0 +1,43 @@
+"""Helpers for LangChain tool functions."""
+
+import functools
+from typing import Callable, Tuple, Type
+
+from src.utils import serialization
+
+ToolFunction = Callable[..., str]
+
+
+def tool_result(
+    error_prefix: str, exceptions: Tuple[Type[Exception], ...] = (Exception,)
+) -> Callable[[ToolFunction], ToolFunction]:
+    """Turn expected exceptions raised by a tool into a JSON error envelope.
+
+    Apply below ``@tool`` so the tool keeps its signature and docstring:
+
+        @tool
+        @tool_result("Error applying updates")
+        def apply_all_updates(...) -> str: ...
+
+    Args:
+        error_prefix: Text placed before the exception message
+        exceptions: Exception types reported to the agent; anything else
+            propagates so real failures are not hidden behind an envelope
+
+    Returns:
+        Decorator wrapping the tool function
+    """
+
+    def decorator(func: ToolFunction) -> ToolFunction:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> str:
+            try:
+                return func(*args, **kwargs)
+            except exceptions as e:
+                return serialization.dumps(
+                    {"status": "error", "message": f"{error_prefix}: {e}"}
+                )
+
+        return wrapper
+
+    return decorator
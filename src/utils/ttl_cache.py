@@ -0,0 +1,76 @@
+"""Thread-safe in-process cache with per-entry expiry and a size cap."""
+
+import threading
+import time
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Map string keys to values for ``ttl`` seconds, keeping at most ``max_size``.
+
+    Entries are kept in insertion order and pruned on every write: expired
+    entries and anything over ``max_size`` are dropped oldest first. All access
+    holds one lock, so the cache can be shared by worker threads.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_size: int,
+        normalize_key: Optional[Callable[[str], str]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_size: Maximum number of entries kept
+            normalize_key: Applied to every key before lookup and storage,
+                e.g. to make package names case-insensitive
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._normalize_key = normalize_key or (lambda key: key)
+        self._entries: Dict[str, Tuple[float, V]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[V]:
+        """Get the value cached for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(self._normalize_key(key))
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def set(self, key: str, value: V) -> None:
+        """Cache value for key, dropping expired and excess entries."""
+        now = time.monotonic()
+        key = self._normalize_key(key)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now, value)
+            # The oldest entries come first, so pruning stops at the first one kept
+            while self._entries:
+                oldest = next(iter(self._entries))
+                if (
+                    len(self._entries) <= self.max_size
+                    and now - self._entries[oldest][0] < self.ttl
+                ):
+                    break
+                del self._entries[oldest]
+
+    def keys(self) -> List[str]:
+        """Get the cached keys, oldest first (expired entries included)."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
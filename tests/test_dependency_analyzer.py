@@ -9,17 +9,28 @@ and outdated package checking functionality.
 import json
 import os
 import shutil
+import subprocess
 import tempfile
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.agents import analyzer
 from src.agents.analyzer import (
+    _get_context,
+    _parse_outdated_output,
+    check_all_outdated,
     check_outdated_dependencies,
+    cleanup_checkouts,
+    create_dependency_analyzer_agent,
     cleanup_repository,
     clone_repository,
     detect_package_manager,
+    fetch_manifests,
     read_dependency_file,
+    read_dependency_files,
+    track_checkouts,
 )
 
 
@@ -157,6 +168,78 @@ class TestDetectPackageManager:
         assert result["language"] == "php"
         assert result["package_manager"] == "composer"
 
+    def test_detection_payload_is_reused(self, temp_repo):
+        """Test that repeated detections return the cached payload."""
+        with open(os.path.join(temp_repo, "requirements.txt"), "w") as f:
+            f.write("requests==2.28.0\n")
+
+        first = detect_package_manager.invoke({"repo_path": temp_repo})
+        second = detect_package_manager.invoke({"repo_path": temp_repo})
+
+        assert first is second
+        assert json.loads(first)["build_command"]
+
+    def test_detect_dotnet_glob_pattern(self, temp_repo):
+        """Test detection via a wildcard detect_files pattern."""
+        with open(os.path.join(temp_repo, "App.csproj"), "w") as f:
+            f.write("<Project></Project>")
+
+        result = json.loads(detect_package_manager.invoke({"repo_path": temp_repo}))
+
+        assert result["language"] == "dotnet"
+        assert result["package_manager"] == "nuget"
+
+    def test_detect_ignores_nested_exact_manifests(self, temp_repo):
+        """Test that manifests with exact names are only looked up at the root."""
+        nested = os.path.join(temp_repo, "tools", "scripts")
+        os.makedirs(nested)
+        with open(os.path.join(nested, "package.json"), "w") as f:
+            json.dump({"name": "scripts"}, f)
+
+        result = json.loads(detect_package_manager.invoke({"repo_path": temp_repo}))
+
+        assert result["language"] is None
+
+    def test_detect_nested_dotnet_projects(self, temp_repo):
+        """Test a .NET layout with the solution at the root and projects in src/."""
+        with open(os.path.join(temp_repo, "App.sln"), "w") as f:
+            f.write("")
+        project_dir = os.path.join(temp_repo, "src", "App")
+        os.makedirs(project_dir)
+        with open(os.path.join(project_dir, "App.csproj"), "w") as f:
+            f.write("<Project></Project>")
+
+        result = json.loads(detect_package_manager.invoke({"repo_path": temp_repo}))
+
+        assert result["language"] == "dotnet"
+
+    def test_detect_nested_terraform_modules(self, temp_repo):
+        """Test that Terraform modules in subdirectories are detected."""
+        module_dir = os.path.join(temp_repo, "modules", "vpc")
+        os.makedirs(module_dir)
+        with open(os.path.join(module_dir, "main.tf"), "w") as f:
+            f.write("")
+
+        result = json.loads(detect_package_manager.invoke({"repo_path": temp_repo}))
+
+        assert result["language"] == "terraform"
+
+    def test_detect_skips_vendored_and_deep_directories(self, temp_repo):
+        """Test that the wildcard search skips vendored dirs and stops at its depth."""
+        for parts in (
+            ("node_modules", "dep"),
+            ("vendor", "lib"),
+            ("a",) * (analyzer.NESTED_SEARCH_DEPTH + 1),
+        ):
+            directory = os.path.join(temp_repo, *parts)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, "main.tf"), "w") as f:
+                f.write("")
+
+        result = json.loads(detect_package_manager.invoke({"repo_path": temp_repo}))
+
+        assert result["language"] is None
+
     def test_detect_no_package_manager(self, temp_repo):
         """Test detection when no package manager files exist."""
         result = json.loads(detect_package_manager.invoke({"repo_path": temp_repo}))
@@ -208,6 +291,325 @@ class TestReadDependencyFile:
 
         assert "Error" in result
 
+    def test_read_multiple_files(self, temp_repo):
+        with open(os.path.join(temp_repo, "requirements.txt"), "w") as f:
+            f.write("requests==2.28.0\n")
+        with open(os.path.join(temp_repo, "package.json"), "w") as f:
+            f.write('{"name": "test"}')
+
+        result = json.loads(
+            read_dependency_files.invoke(
+                {
+                    "repo_path": temp_repo,
+                    "file_paths": ["requirements.txt", "package.json", "missing.txt"],
+                }
+            )
+        )
+
+        assert result["status"] == "success"
+        assert result["files"] == {
+            "requirements.txt": "requests==2.28.0\n",
+            "package.json": '{"name": "test"}',
+        }
+        assert list(result["errors"]) == ["missing.txt"]
+
+
+class TestParseOutdatedOutput:
+    """Test cases for _parse_outdated_output."""
+
+    def test_json_array(self):
+        stdout = json.dumps(
+            [{"name": "serde", "project": "1.0.0", "latest": "1.0.200"}]
+        )
+
+        result = _parse_outdated_output(
+            stdout,
+            {
+                "output_format": "json_array",
+                "field_map": {"current": "project"},
+            },
+        )
+
+        assert result == [{"name": "serde", "current": "1.0.0", "latest": "1.0.200"}]
+
+    def test_ndjson_with_multiline_objects(self):
+        """Test that concatenated pretty-printed objects are all parsed."""
+        stdout = (
+            '{\n  "Path": "a",\n  "Version": "v1",\n  "Update": {"Version": "v2"}\n}\n'
+            '{\n  "Path": "b",\n  "Version": "v1"\n}\n'
+        )
+
+        result = _parse_outdated_output(
+            stdout,
+            {
+                "output_format": "ndjson",
+                "field_map": {
+                    "name": "Path",
+                    "current": "Version",
+                    "latest": "Update.Version",
+                },
+                "skip_when": {"Update": None},
+            },
+        )
+
+        assert result == [{"name": "a", "current": "v1", "latest": "v2"}]
+
+    def test_invalid_json_falls_back_to_raw_output(self):
+        result = _parse_outdated_output(
+            "npm ERR! not json", {"output_format": "json_dict"}
+        )
+
+        assert result == [{"raw_output": "npm ERR! not json"}]
+
+
+class TestCheckOutdatedDependencies:
+    """Test cases for check_outdated_dependencies with CLI package managers."""
+
+    NPM_INFO = {
+        "language": "nodejs",
+        "package_manager": "npm",
+        "outdated_command": "npm outdated --json",
+        "output_format": "json_dict",
+        "field_map": {"name": "_key", "current": "current", "latest": "latest"},
+    }
+
+    @pytest.fixture
+    def temp_repo(self):
+        temp_dir = tempfile.mkdtemp(prefix="test_repo_")
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    @patch("src.agents.analyzer.subprocess.run")
+    def test_runs_in_repo_without_chdir(self, mock_run, temp_repo):
+        """Test the command runs with cwd= and the process cwd is untouched."""
+        mock_run.return_value = MagicMock(
+            returncode=1,
+            stdout=json.dumps({"lodash": {"current": "4.0.0", "latest": "4.17.21"}}),
+        )
+        original_dir = os.getcwd()
+
+        result = json.loads(
+            check_outdated_dependencies.invoke(
+                {"repo_path": temp_repo, "detected_info": self.NPM_INFO}
+            )
+        )
+
+        assert os.getcwd() == original_dir
+        assert mock_run.call_args.kwargs["cwd"] == Path(temp_repo).resolve()
+        assert result["outdated_packages"] == [
+            {"name": "lodash", "current": "4.0.0", "latest": "4.17.21"}
+        ]
+
+    def test_missing_detected_info(self, temp_repo):
+        result = json.loads(
+            check_outdated_dependencies.invoke({"repo_path": temp_repo})
+        )
+
+        assert result["status"] == "error"
+
+
+class TestCheckOutdatedPypi:
+    """Test cases for the PyPI-backed pip outdated check."""
+
+    @pytest.fixture
+    def temp_repo(self):
+        """Create a temporary repository with a requirements file."""
+        temp_dir = tempfile.mkdtemp(prefix="test_repo_")
+        with open(os.path.join(temp_dir, "requirements.txt"), "w") as f:
+            f.write(
+                "# pinned deps\n"
+                "requests==2.28.0\n"
+                "flask[async]==2.0.0  # web\n"
+                "click==8.1.7\n"
+                "pytest>=7.0\n"
+                "black\n"
+                "-r dev-requirements.txt\n"
+            )
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    @patch("src.agents.analyzer._fetch_pypi_latest")
+    def test_reports_only_newer_versions(self, mock_fetch, temp_repo):
+        """Test that only pins behind the latest PyPI release are reported."""
+        mock_fetch.return_value = {
+            "requests": "2.31.0",
+            "flask": "3.0.0",
+            "click": "8.1.7",
+        }
+
+        result = json.loads(
+            check_outdated_dependencies.invoke(
+                {
+                    "repo_path": temp_repo,
+                    "detected_info": {
+                        "language": "python",
+                        "package_manager": "pip",
+                        "outdated_command": "pip list --outdated --format json",
+                    },
+                }
+            )
+        )
+
+        assert result["status"] == "success"
+        assert result["outdated_packages"] == [
+            {"name": "requests", "current": "2.28.0", "latest": "2.31.0"},
+            {"name": "flask", "current": "2.0.0", "latest": "3.0.0"},
+        ]
+        mock_fetch.assert_called_once_with(["requests", "flask", "click", "pytest"])
+
+    @patch("src.agents.analyzer._fetch_pypi_latest")
+    def test_handles_markers_and_compatible_release(self, mock_fetch, temp_repo):
+        """Test that ~= pins and environment markers are parsed."""
+        with open(os.path.join(temp_repo, "requirements.txt"), "w") as f:
+            f.write('django~=4.2.0; python_version >= "3.8"\n')
+        mock_fetch.return_value = {"django": "5.0.1"}
+
+        result = json.loads(
+            check_outdated_dependencies.invoke(
+                {
+                    "repo_path": temp_repo,
+                    "detected_info": {
+                        "package_manager": "pip",
+                        "outdated_command": "pip list --outdated --format json",
+                    },
+                }
+            )
+        )
+
+        assert result["outdated_packages"] == [
+            {"name": "django", "current": "4.2.0", "latest": "5.0.1"}
+        ]
+
+    @patch("src.agents.analyzer._fetch_pypi_latest")
+    def test_skips_failed_lookups(self, mock_fetch, temp_repo):
+        """Test that packages PyPI could not resolve are skipped."""
+        mock_fetch.return_value = dict.fromkeys(
+            ["requests", "flask", "click", "pytest"]
+        )
+
+        result = json.loads(
+            check_outdated_dependencies.invoke(
+                {
+                    "repo_path": temp_repo,
+                    "detected_info": {
+                        "package_manager": "pip",
+                        "outdated_command": "pip list --outdated --format json",
+                    },
+                }
+            )
+        )
+
+        assert result["outdated_count"] == 0
+
+
+class TestCheckAllOutdated:
+    """Test cases for check_all_outdated across several package managers."""
+
+    @pytest.fixture
+    def temp_repo(self):
+        """Create a temporary repository with npm and pip manifests."""
+        temp_dir = tempfile.mkdtemp(prefix="test_repo_")
+        with open(os.path.join(temp_dir, "package.json"), "w") as f:
+            f.write('{"name": "test"}')
+        with open(os.path.join(temp_dir, "requirements.txt"), "w") as f:
+            f.write("requests==2.28.0\n")
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    @patch("src.agents.analyzer._fetch_pypi_latest")
+    @patch("src.agents.analyzer.subprocess.run")
+    def test_checks_every_package_manager(self, mock_run, mock_fetch, temp_repo):
+        """Test that each detected package manager is checked in one call."""
+        mock_run.return_value = MagicMock(
+            returncode=1,
+            stdout=json.dumps({"lodash": {"current": "4.0.0", "latest": "4.17.21"}}),
+        )
+        mock_fetch.return_value = {"requests": "2.31.0"}
+
+        result = json.loads(check_all_outdated.invoke({"repo_path": temp_repo}))
+
+        assert result["status"] == "success"
+        assert result["package_manager"] == "pip"
+        assert result["outdated_packages"] == [
+            {"name": "requests", "current": "2.28.0", "latest": "2.31.0"}
+        ]
+        managers = {pm["package_manager"]: pm for pm in result["package_managers"]}
+        assert set(managers) == {"npm", "pip"}
+        assert managers["npm"]["outdated_packages"] == [
+            {"name": "lodash", "current": "4.0.0", "latest": "4.17.21"}
+        ]
+        mock_run.assert_called_once()
+
+    @patch("src.agents.analyzer._fetch_pypi_latest")
+    @patch("src.agents.analyzer.subprocess.run")
+    def test_failed_check_does_not_hide_others(self, mock_run, mock_fetch, temp_repo):
+        """Test that one manager timing out still reports the others."""
+        mock_run.side_effect = subprocess.TimeoutExpired("npm", 120)
+        mock_fetch.return_value = {"requests": "2.31.0"}
+
+        result = json.loads(check_all_outdated.invoke({"repo_path": temp_repo}))
+
+        assert result["status"] == "success"
+        assert result["outdated_count"] == 1
+        npm_result = result["package_managers"][1]
+        assert npm_result["package_manager"] == "npm"
+        assert npm_result["error"] == "Outdated command timed out"
+
+    def test_no_package_manager(self):
+        temp_dir = tempfile.mkdtemp(prefix="test_repo_")
+        try:
+            result = json.loads(check_all_outdated.invoke({"repo_path": temp_dir}))
+        finally:
+            shutil.rmtree(temp_dir)
+
+        assert result["status"] == "error"
+
+
+class TestPypiLatestCache:
+    """Test cases for the bounded PyPI latest-release cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        analyzer._pypi_latest_cache.clear()
+        yield
+        analyzer._pypi_latest_cache.clear()
+
+    @patch("src.utils.ttl_cache.time.monotonic")
+    def test_entries_expire(self, mock_time):
+        mock_time.return_value = 1000.0
+        analyzer._pypi_latest_cache.set("Requests", "2.31.0")
+
+        assert analyzer._pypi_latest_cache.get("requests") == "2.31.0"
+
+        mock_time.return_value += analyzer.PYPI_LATEST_CACHE_TTL
+        assert analyzer._pypi_latest_cache.get("requests") is None
+
+    def test_keys_are_pep503_normalized(self):
+        analyzer._pypi_latest_cache.set("Typing_Extensions", "4.9.0")
+
+        assert analyzer._pypi_latest_cache.get("typing.extensions") == "4.9.0"
+        assert analyzer._pypi_latest_cache.keys() == ["typing-extensions"]
+
+    @patch("src.utils.ttl_cache.time.monotonic")
+    def test_insert_prunes_expired_entries(self, mock_time):
+        mock_time.return_value = 1000.0
+        analyzer._pypi_latest_cache.set("requests", "2.31.0")
+
+        mock_time.return_value += analyzer.PYPI_LATEST_CACHE_TTL
+        analyzer._pypi_latest_cache.set("flask", "3.0.0")
+
+        assert analyzer._pypi_latest_cache.keys() == ["flask"]
+
+    def test_insert_evicts_oldest_over_max_size(self):
+        with patch.object(analyzer._pypi_latest_cache, "max_size", 2):
+            for name in ("a", "b", "a", "c"):
+                analyzer._pypi_latest_cache.set(name, "1.0")
+
+        assert analyzer._pypi_latest_cache.keys() == ["a", "c"]
+
 
 class TestCleanupRepository:
     """Test cases for cleanup_repository function."""
@@ -262,6 +664,11 @@ class TestCloneRepository:
         result = json.loads(clone_repository.invoke("https://github.com/test/repo"))
 
         assert result["status"] == "success"
+        clone_args = mock_run.call_args[0][0]
+        assert clone_args[:2] == ["git", "clone"]
+        assert "--filter=blob:none" in clone_args
+        assert "--single-branch" in clone_args
+        assert "--no-tags" in clone_args
         assert "repo_path" in result
 
     @patch("src.agents.analyzer.subprocess.run")
@@ -299,3 +706,147 @@ class TestCloneRepository:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestFetchManifests:
+    """Test cases for fetch_manifests function."""
+
+    @patch("src.agents.analyzer._list_root_entries")
+    @patch("src.agents.analyzer._fetch_raw_files")
+    def test_fetch_from_url(self, mock_fetch, mock_list):
+        mock_list.return_value = None
+        mock_fetch.return_value = {"package.json": '{"name": "repo"}'}
+
+        result = json.loads(
+            fetch_manifests.invoke("https://github.com/test/repo.git")
+        )
+
+        assert result["status"] == "success"
+        assert result["repository"] == "test/repo"
+        assert result["files"] == {"package.json": '{"name": "repo"}'}
+        assert result["package_managers"] == [
+            {"language": "nodejs", "package_manager": "npm"}
+        ]
+        repo, candidates = mock_fetch.call_args[0]
+        assert repo == "test/repo"
+        assert "package.json" in candidates
+        assert "requirements.txt" in candidates
+        assert not any("*" in name for name in candidates)
+
+    @patch("src.agents.analyzer._list_root_entries")
+    @patch("src.agents.analyzer._fetch_raw_files")
+    def test_fetches_only_listed_manifests(self, mock_fetch, mock_list):
+        """Test that the root listing limits downloads to existing manifests."""
+        mock_list.return_value = frozenset(
+            {"README.md", "package.json", "yarn.lock", "App.csproj"}
+        )
+        mock_fetch.return_value = {"package.json": "{}", "App.csproj": "<Project/>"}
+
+        result = json.loads(fetch_manifests.invoke("test/repo"))
+
+        mock_fetch.assert_called_once_with("test/repo", ["App.csproj", "package.json"])
+        managers = [pm["package_manager"] for pm in result["package_managers"]]
+        assert "yarn" in managers
+
+    def test_rejects_non_github_repo(self):
+        result = json.loads(fetch_manifests.invoke("https://gitlab.com/a/b/c"))
+
+        assert result["status"] == "error"
+
+
+class TestRepoContext:
+    """Test cases for checkouts registered by clone_repository."""
+
+    @pytest.fixture
+    def cloned_repo(self):
+        """Clone (mocked) a repository with a package.json at its root."""
+
+        def fake_clone(args, **kwargs):
+            with open(os.path.join(args[-1], "package.json"), "w") as f:
+                json.dump({"name": "repo"}, f)
+            return MagicMock(returncode=0, stdout="", stderr="")
+
+        with patch("src.agents.analyzer.get_cache") as mock_cache, patch(
+            "src.agents.analyzer.subprocess.run", side_effect=fake_clone
+        ):
+            mock_cache.return_value.get_cached_repository.return_value = None
+            result = json.loads(
+                clone_repository.invoke("https://github.com/test/repo")
+            )
+        yield result["repo_path"]
+        if os.path.exists(result["repo_path"]):
+            shutil.rmtree(result["repo_path"])
+
+    def test_detect_uses_registered_entries(self, cloned_repo):
+        result = json.loads(detect_package_manager.invoke({"repo_path": cloned_repo}))
+
+        assert result["language"] == "nodejs"
+
+    def test_read_is_memoized_until_file_changes(self, cloned_repo):
+        args = {"repo_path": cloned_repo, "file_path": "package.json"}
+        first = read_dependency_file.invoke(args)
+
+        with patch("pathlib.Path.read_text") as mock_read:
+            assert read_dependency_file.invoke(args) == first
+            mock_read.assert_not_called()
+
+        path = os.path.join(cloned_repo, "package.json")
+        with open(path, "w") as f:
+            f.write('{"name": "changed"}')
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+
+        assert "changed" in read_dependency_file.invoke(args)
+
+    def test_cleanup_unregisters_checkout(self, cloned_repo):
+        result = json.loads(cleanup_repository.invoke(cloned_repo))
+
+        assert result["status"] == "success"
+        assert not os.path.exists(cloned_repo)
+        assert _get_context(cloned_repo) is None
+
+    def test_cleanup_checkouts(self, cloned_repo):
+        """Test that registered checkouts are removed without the LLM's help."""
+        cleanup_checkouts("/tmp/not_a_checkout", cloned_repo)
+
+        assert not os.path.exists(cloned_repo)
+        assert _get_context(cloned_repo) is None
+
+    def test_track_checkouts_keeps_other_runs(self, cloned_repo):
+        """Test that a run only removes the checkouts it registered itself."""
+        with track_checkouts() as paths:
+            pass
+
+        assert paths == set()
+        assert os.path.exists(cloned_repo)
+        assert _get_context(cloned_repo) is not None
+
+    def test_cleanup_all_checkouts(self, cloned_repo):
+        cleanup_checkouts()
+
+        assert not os.path.exists(cloned_repo)
+
+
+class TestCreateDependencyAnalyzerAgent:
+    """Test cases for create_dependency_analyzer_agent caching."""
+
+    @pytest.fixture(autouse=True)
+    def clear_agent_cache(self):
+        """Make each test build its own (mocked) agent."""
+        create_dependency_analyzer_agent.cache_clear()
+        yield
+        create_dependency_analyzer_agent.cache_clear()
+
+    @patch("langchain.agents.create_agent")
+    @patch("langchain_anthropic.ChatAnthropic")
+    def test_agent_cached_per_model(self, mock_llm, mock_create_agent):
+        """Test that agents are built once per (model, temperature)."""
+        mock_create_agent.side_effect = lambda *args, **kwargs: MagicMock()
+
+        default = create_dependency_analyzer_agent()
+        other = create_dependency_analyzer_agent("claude-haiku-4-5", 0.5)
+
+        assert create_dependency_analyzer_agent() is default
+        assert create_dependency_analyzer_agent("claude-haiku-4-5", 0.5) is other
+        assert other is not default
+        assert mock_llm.call_count == 2
+        mock_llm.assert_called_with(model="claude-haiku-4-5", temperature=0.5)
@@ -8,14 +8,22 @@ error parsing, and version categorization.
 
 import json
 import os
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
+from src.tools import dependency_ops
 from src.tools.dependency_ops import (
+    _get_llm,
+    _parse_semver,
     apply_all_updates,
     categorize_updates,
+    classify_update,
     get_latest_version_for_major,
+    get_latest_versions_for_majors,
+    prefetch_rollback_versions,
     rollback_major_update,
 )
 
@@ -122,6 +130,88 @@ class TestApplyAllUpdates:
         assert updated["dependencies"]["tilde"] == "~2.0.0"
         assert updated["dependencies"]["gte"] == ">=2.0.0"
 
+    @staticmethod
+    def _large_package_json(**sections):
+        """Build a >64 KiB tab-indented package.json with the given sections."""
+        deps = {f"pkg-{i}": "^1.0.0" for i in range(3000)}
+        data = {"name": "big", "dependencies": deps}
+        for section, deps in sections.items():
+            data.setdefault(section, {}).update(deps)
+        return json.dumps(data, indent="\t")
+
+    def test_update_large_package_json_patches_text(self):
+        """Test that large package.json files keep their formatting."""
+        current_content = self._large_package_json(
+            dependencies={"react": "^17.0.2"}, devDependencies={"react": "^17.0.2"}
+        )
+        outdated_packages = json.dumps(
+            [{"name": "react", "current": "17.0.2", "latest": "18.2.0"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "package.json",
+                }
+            )
+        )
+
+        assert result["total_updates"] == 2
+        assert result["updated_content"] == current_content.replace(
+            '"react": "^17.0.2"', '"react": "^18.2.0"'
+        )
+
+    def test_update_large_package_json_per_section_values(self):
+        """Test that each section keeps its own prefix when patched in place."""
+        current_content = self._large_package_json(
+            dependencies={"react": "^17.0.2"}, devDependencies={"react": "~17.0.2"}
+        )
+        outdated_packages = json.dumps(
+            [{"name": "react", "current": "17.0.2", "latest": "18.2.0"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "package.json",
+                }
+            )
+        )
+
+        updated = json.loads(result["updated_content"])
+        assert updated["dependencies"]["react"] == "^18.2.0"
+        assert updated["devDependencies"]["react"] == "~18.2.0"
+        assert "\t" in result["updated_content"]
+
+    def test_update_large_package_json_leaves_other_sections(self):
+        """Test that same-named keys outside dependency sections are untouched."""
+        current_content = self._large_package_json(
+            overrides={"react": "^17.0.2", "note": "{ \"react\": \"x\" }"},
+            devDependencies={"react": "^17.0.2"},
+        )
+        outdated_packages = json.dumps(
+            [{"name": "react", "current": "17.0.2", "latest": "18.2.0"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "package.json",
+                }
+            )
+        )
+
+        updated = json.loads(result["updated_content"])
+        assert updated["devDependencies"]["react"] == "^18.2.0"
+        assert updated["overrides"]["react"] == "^17.0.2"
+        assert "\t" in result["updated_content"]
+
     def test_update_requirements_txt(self):
         """Test updating requirements.txt file."""
         current_content = """# Python dependencies
@@ -207,6 +297,78 @@ tokio = "1.20.0"
         assert 'serde = "1.0.193"' in result["updated_content"]
         assert 'tokio = "1.35.0"' in result["updated_content"]
 
+    def test_update_cargo_toml_tables(self):
+        """Test Cargo.toml inline, dotted, workspace and target tables."""
+        current_content = """[package]
+name = "test"
+version = "0.1.0"
+
+[workspace.dependencies]
+anyhow = "1.0.70"  # error handling
+
+[dependencies]
+serde = { version = "1.0.0", features = ["derive"] }
+local = { path = "../local" }
+
+[dependencies.tokio]
+version = "1.20.0"
+features = ["full"]
+
+[target.'cfg(unix)'.dependencies]
+libc = "0.2.100"
+"""
+
+        outdated_packages = json.dumps(
+            [
+                {"name": "anyhow", "current": "1.0.70", "latest": "1.0.80"},
+                {"name": "serde", "current": "1.0.0", "latest": "1.0.193"},
+                {"name": "tokio", "current": "1.20.0", "latest": "1.35.0"},
+                {"name": "libc", "current": "0.2.100", "latest": "0.2.150"},
+                {"name": "local", "current": "0.1.0", "latest": "0.2.0"},
+                {"name": "test", "current": "0.1.0", "latest": "0.2.0"},
+            ]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "Cargo.toml",
+                }
+            )
+        )
+
+        content = result["updated_content"]
+        assert result["total_updates"] == 4
+        assert 'anyhow = "1.0.80"  # error handling' in content
+        assert 'serde = { version = "1.0.193", features = ["derive"] }' in content
+        assert 'version = "1.35.0"\nfeatures = ["full"]' in content
+        assert 'libc = "0.2.150"' in content
+        assert 'local = { path = "../local" }' in content
+        assert 'name = "test"\nversion = "0.1.0"' in content
+
+    def test_update_invalid_cargo_toml_falls_back(self):
+        """Test that Cargo.toml content that is not valid TOML is still updated."""
+        current_content = '[dependencies]\nserde = "1.0.0"\nbroken = \n'
+
+        outdated_packages = json.dumps(
+            [{"name": "serde", "current": "1.0.0", "latest": "1.0.193"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "Cargo.toml",
+                }
+            )
+        )
+
+        assert result["status"] == "success"
+        assert 'serde = "1.0.193"' in result["updated_content"]
+
     def test_unsupported_file_type(self):
         """Test handling of unsupported file types."""
         result = json.loads(
@@ -222,6 +384,57 @@ tokio = "1.20.0"
         assert result["status"] == "error"
         assert "Unsupported file type" in result["message"]
 
+    def test_accepts_versioned_keys(self):
+        """Test updates given as current_version/latest_version."""
+        outdated_packages = json.dumps(
+            [{"name": "flask", "current_version": "2.0.0", "latest_version": "3.0.0"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": "flask==2.0.0\n",
+                    "outdated_packages": outdated_packages,
+                    "file_type": "requirements.txt",
+                }
+            )
+        )
+
+        assert result["updated_content"] == "flask==3.0.0\n"
+        assert result["applied_updates"] == [
+            {"name": "flask", "old": "2.0.0", "new": "3.0.0"}
+        ]
+
+    def test_malformed_input_returns_error(self):
+        """Test that invalid JSON input is reported as an error envelope."""
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": "{}",
+                    "outdated_packages": "not json",
+                    "file_type": "package.json",
+                }
+            )
+        )
+
+        assert result["status"] == "error"
+        assert result["message"].startswith("Error applying updates: ")
+
+    def test_unexpected_errors_propagate(self):
+        """Test that failures unrelated to the input are not swallowed."""
+        with patch(
+            "src.tools.dependency_ops._apply_cargo_updates",
+            side_effect=RuntimeError("boom"),
+        ):
+            with pytest.raises(RuntimeError):
+                apply_all_updates.invoke(
+                    {
+                        "current_content": "[dependencies]\n",
+                        "outdated_packages": '[{"name": "serde", "latest": "1.0"}]',
+                        "file_type": "Cargo.toml",
+                    }
+                )
+
     def test_no_updates_needed(self):
         """Test when no packages match for update."""
         current_content = json.dumps(
@@ -246,6 +459,158 @@ tokio = "1.20.0"
         assert result["total_updates"] == 0
 
 
+    def test_empty_updates_returns_content_unchanged(self):
+        """Test that an empty update list leaves the file untouched."""
+        current_content = '{"name": "test", "dependencies": {"lodash": "^4.17.0"}}'
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": "[]",
+                    "file_type": "package.json",
+                }
+            )
+        )
+
+        assert result["status"] == "success"
+        assert result["updated_content"] == current_content
+        assert result["total_updates"] == 0
+
+    def test_unrelated_updates_return_content_unchanged(self):
+        """Test that updates for undeclared packages keep the file formatting."""
+        current_content = '{"name": "test", "dependencies": {"lodash": "^4.17.0"}}'
+        outdated_packages = json.dumps(
+            [{"name": "react", "current": "17.0.2", "latest": "18.2.0"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "package.json",
+                }
+            )
+        )
+
+        assert result["updated_content"] == current_content
+        assert result["total_updates"] == 0
+
+    def test_update_requirements_txt_keeps_comment_lines(self):
+        """Test that comment and blank lines survive the substitution pass."""
+        current_content = "# web\n\n  requests==2.0.0\n#flask==1.0\n"
+        outdated_packages = json.dumps(
+            [
+                {"name": "requests", "current": "2.0.0", "latest": "2.31.0"},
+                {"name": "flask", "current": "1.0", "latest": "3.0.0"},
+            ]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "requirements.txt",
+                }
+            )
+        )
+
+        assert result["updated_content"] == "# web\n\n  requests==2.31.0\n#flask==1.0\n"
+        assert result["total_updates"] == 1
+
+    def test_update_requirements_txt_other_comparators(self):
+        """Test requirements.txt lines using ~=, != and > comparators."""
+        current_content = "flask~=2.0\nrequests[socks]>2.0,!=2.1\nclick"
+
+        outdated_packages = json.dumps(
+            [
+                {"name": "flask", "current": "2.0.0", "latest": "3.0.0"},
+                {"name": "requests", "current": "2.0.0", "latest": "2.31.0"},
+                {"name": "click", "current": "7.0", "latest": "8.1.7"},
+            ]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "requirements.txt",
+                }
+            )
+        )
+
+        assert result["updated_content"] == (
+            "flask==3.0.0\nrequests[socks]==2.31.0\nclick==8.1.7"
+        )
+
+    def test_update_requirements_txt_preserves_crlf(self):
+        """Test that Windows line endings survive an update."""
+        current_content = "# deps\r\nrequests==2.28.0\r\nflask==2.0.0\r\n"
+
+        outdated_packages = json.dumps(
+            [{"name": "requests", "current": "2.28.0", "latest": "2.31.0"}]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "requirements.txt",
+                }
+            )
+        )
+
+        assert result["updated_content"] == (
+            "# deps\r\nrequests==2.31.0\r\nflask==2.0.0\r\n"
+        )
+
+    def test_update_requirements_txt_keeps_markers_comments_and_hashes(self):
+        """Test that only the specifier is rewritten, never the rest of the line."""
+        current_content = (
+            "requests[socks]>=2.0 ; python_version>'3.8'  # pinned\n"
+            'pywin32==305 ; sys_platform == "win32"\n'
+            "flask == 2.0.0 \\\n"
+            "    --hash=sha256:abc123\n"
+            "click --hash=sha256:def456\n"
+            "httpx @ https://example.com/httpx-0.1.tar.gz\n"
+            "-r base.txt\n"
+        )
+        outdated_packages = json.dumps(
+            [
+                {"name": "requests", "current": "2.0", "latest": "2.32.0"},
+                {"name": "pywin32", "current": "305", "latest": "306"},
+                {"name": "flask", "current": "2.0.0", "latest": "3.0.0"},
+                {"name": "click", "current": "7.0", "latest": "8.1.7"},
+                {"name": "httpx", "current": "0.1", "latest": "0.27.0"},
+            ]
+        )
+
+        result = json.loads(
+            apply_all_updates.invoke(
+                {
+                    "current_content": current_content,
+                    "outdated_packages": outdated_packages,
+                    "file_type": "requirements.txt",
+                }
+            )
+        )
+
+        assert result["updated_content"] == (
+            "requests[socks]==2.32.0 ; python_version>'3.8'  # pinned\n"
+            'pywin32==306 ; sys_platform == "win32"\n'
+            "flask==3.0.0 \\\n"
+            "    --hash=sha256:abc123\n"
+            "click==8.1.7 --hash=sha256:def456\n"
+            "httpx @ https://example.com/httpx-0.1.tar.gz\n"
+            "-r base.txt\n"
+        )
+        assert result["total_updates"] == 4
+
+
 class TestRollbackMajorUpdate:
     """Test cases for rollback_major_update function."""
 
@@ -294,6 +659,50 @@ class TestRollbackMajorUpdate:
         assert "flask==2.3.0" in result["updated_content"]
         assert "requests==2.31.0" in result["updated_content"]
 
+    def test_rollback_requirements_txt_any_operator(self):
+        """Test rollback of unpinned requirements, matching names case-insensitively."""
+        current_content = "Flask[async]>=3.0.0\nrequests~=2.31\n"
+
+        result = json.loads(
+            rollback_major_update.invoke(
+                {
+                    "current_content": current_content,
+                    "package_name": "flask",
+                    "file_type": "requirements.txt",
+                    "target_version": "2.3.0",
+                }
+            )
+        )
+
+        assert result["updated_content"] == "Flask[async]==2.3.0\nrequests~=2.31\n"
+
+    def test_rollback_requirements_txt_only_touches_specifier(self):
+        """Test that rollback keeps markers, comments and other packages' lines."""
+        current_content = (
+            "  flask>=3.0.0 ; python_version>='3.8'  # web\n"
+            "requests~=2.31\n"
+            "click!=8.0\n"
+            "httpx\n"
+        )
+
+        result = json.loads(
+            rollback_major_update.invoke(
+                {
+                    "current_content": current_content,
+                    "package_name": "flask",
+                    "file_type": "requirements.txt",
+                    "target_version": "2.3.0",
+                }
+            )
+        )
+
+        assert result["updated_content"] == (
+            "  flask==2.3.0 ; python_version>='3.8'  # web\n"
+            "requests~=2.31\n"
+            "click!=8.0\n"
+            "httpx\n"
+        )
+
     def test_rollback_cargo_toml(self):
         """Test rolling back a package in Cargo.toml."""
         current_content = """[dependencies]
@@ -334,6 +743,28 @@ tokio = "1.35.0"
         updated = json.loads(result["updated_content"])
         assert updated["dependencies"]["react"] == "~17.0.2"
 
+    def test_rollback_preserves_range_operators(self):
+        """Test that >= and <= prefixes are preserved during rollback."""
+        current_content = json.dumps(
+            {"dependencies": {"react": ">=18.2.0"}, "devDependencies": {"jest": "<=29"}}
+        )
+
+        for package, expected in (("react", ">=17.0.2"), ("jest", "<=17.0.2")):
+            result = json.loads(
+                rollback_major_update.invoke(
+                    {
+                        "current_content": current_content,
+                        "package_name": package,
+                        "file_type": "package.json",
+                        "target_version": "17.0.2",
+                    }
+                )
+            )
+
+            updated = json.loads(result["updated_content"])
+            section = "dependencies" if package == "react" else "devDependencies"
+            assert updated[section][package] == expected
+
 
 class TestCategorizeUpdates:
     """Test cases for categorize_updates function."""
@@ -428,17 +859,176 @@ class TestCategorizeUpdates:
         assert result["counts"]["patch"] == 0
 
 
+class TestParseSemver:
+    """Test cases for _parse_semver helper."""
+
+    @pytest.mark.parametrize(
+        "version,expected",
+        [
+            ("1.2.3", (1, 2, 3)),
+            ("^17.0.2", (17, 0, 2)),
+            (">=2.31.0", (2, 31, 0)),
+            ("v4.1", (4, 1, 0)),
+            ("3", (3, 0, 0)),
+            ("1.0.0-beta.1", (1, 0, 0)),
+            ("2.0rc1", (2, 0, 0)),
+        ],
+    )
+    def test_parse_versions(self, version, expected):
+        """Test parsing of common version formats."""
+        assert _parse_semver(version) == expected
+
+    def test_non_numeric_version(self):
+        """Test that versions without a leading number are rejected."""
+        assert _parse_semver("latest") is None
+        assert _parse_semver("") is None
+
+    @pytest.mark.parametrize(
+        "current,latest,expected",
+        [
+            ("^17.0.2", "18.2.0", "major"),
+            ("~4.15.0", "4.17.21", "minor"),
+            ("2.31.0", "2.31.1", "patch"),
+            ("1", "1.2", "minor"),
+            ("latest", "1.0.0", "minor"),
+            ("1.2.0-rc1", "1.2.0", "patch"),
+            ("2023.1", "1!1.0", "major"),
+            ("1!1.0.0", "1!1.0.1", "patch"),
+            ("1!1.0", "1!bogus", "minor"),
+        ],
+    )
+    def test_classify_update(self, current, latest, expected):
+        """Test major/minor/patch classification of version pairs."""
+        assert classify_update(current, latest) == expected
+
+    def test_categorize_unparseable_as_minor(self):
+        """Test that unparseable versions fall back to minor updates."""
+        outdated_packages = json.dumps(
+            [{"name": "pkg", "current": "git+https://x", "latest": "1.0.0"}]
+        )
+
+        result = json.loads(categorize_updates.invoke(outdated_packages))
+
+        assert result["counts"]["minor"] == 1
+
+
 class TestGetLatestVersionForMajor:
     """Test cases for get_latest_version_for_major function."""
 
+    @pytest.fixture(autouse=True)
+    def clear_versions_cache(self):
+        """Start each test with an empty registry cache."""
+        dependency_ops._VERSIONS_CACHE.clear()
+        yield
+        dependency_ops._VERSIONS_CACHE.clear()
+
+    @staticmethod
+    def _registry(status_code=200, payload=None):
+        """Patch the registry HTTP client with a canned response."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(status_code, json=payload or {})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        return patch(
+            "src.tools.dependency_ops._get_http_client", return_value=client
+        ), requests
+
     def test_get_latest_npm_version(self):
         """Test getting latest version for npm package."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout=json.dumps(["17.0.0", "17.0.1", "17.0.2", "18.0.0", "18.2.0"]),
+        versions = ["17.0.0", "17.0.2", "17.0.1", "18.0.0-rc.0", "18.2.0"]
+        registry, requests = self._registry(
+            payload={"versions": {v: {} for v in versions}}
+        )
+
+        with registry:
+            result = json.loads(
+                get_latest_version_for_major.invoke(
+                    {
+                        "package_name": "react",
+                        "major_version": "17",
+                        "package_manager": "npm",
+                    }
+                )
             )
 
+        assert result["status"] == "success"
+        assert result["package"] == "react"
+        assert result["major_version"] == "17"
+        assert result["latest_in_major"] == "17.0.2"
+        assert str(requests[0].url) == "https://registry.npmjs.org/react"
+
+    def test_get_latest_scoped_npm_version(self):
+        """Test that scoped npm package names are URL-encoded."""
+        registry, requests = self._registry(payload={"versions": {"7.24.0": {}}})
+
+        with registry:
+            result = json.loads(
+                get_latest_version_for_major.invoke(
+                    {
+                        "package_name": "@babel/core",
+                        "major_version": "7",
+                        "package_manager": "npm",
+                    }
+                )
+            )
+
+        assert result["latest_in_major"] == "7.24.0"
+        assert requests[0].url.raw_path == b"/@babel%2Fcore"
+
+    def test_get_latest_pypi_version(self):
+        """Test getting latest version for a PyPI package."""
+        releases = ["1.26.18", "1.26.9", "2.0.0", "1.27.0rc1", "not-a-version"]
+        registry, requests = self._registry(
+            payload={"releases": {v: [] for v in releases}}
+        )
+
+        with registry:
+            result = json.loads(
+                get_latest_version_for_major.invoke(
+                    {
+                        "package_name": "urllib3",
+                        "major_version": "1",
+                        "package_manager": "pip",
+                    }
+                )
+            )
+
+        assert result["latest_in_major"] == "1.26.18"
+        assert str(requests[0].url) == "https://pypi.org/pypi/urllib3/json"
+
+    def test_versions_are_cached(self):
+        """Test that repeated lookups for a package reuse the registry response."""
+        registry, requests = self._registry(
+            payload={"versions": {"17.0.2": {}, "18.2.0": {}}}
+        )
+
+        with registry:
+            for major in ("17", "18"):
+                result = json.loads(
+                    get_latest_version_for_major.invoke(
+                        {
+                            "package_name": "react",
+                            "major_version": major,
+                            "package_manager": "npm",
+                        }
+                    )
+                )
+                assert result["latest_in_major"].startswith(major)
+
+        assert len(requests) == 1
+
+    def test_expired_versions_are_refetched(self):
+        """Test that cache entries older than the TTL are ignored."""
+        registry, requests = self._registry(payload={"versions": {"17.0.2": {}}})
+        url = "https://registry.npmjs.org/react"
+        stale = time.monotonic() - dependency_ops.VERSIONS_CACHE_TTL - 1
+        with patch("src.utils.ttl_cache.time.monotonic", return_value=stale):
+            dependency_ops._VERSIONS_CACHE.set(url, ["17.0.0"])
+
+        with registry:
             result = json.loads(
                 get_latest_version_for_major.invoke(
                     {
@@ -449,18 +1039,28 @@ class TestGetLatestVersionForMajor:
                 )
             )
 
-            assert result["status"] == "success"
-            assert result["package"] == "react"
-            assert result["major_version"] == "17"
-            assert result["latest_in_major"] == "17.0.2"
+        assert result["latest_in_major"] == "17.0.2"
+        assert len(requests) == 1
+        assert dependency_ops._VERSIONS_CACHE.keys() == [url]
+
+    def test_cache_is_bounded(self):
+        """Test that the registry cache keeps at most VERSIONS_CACHE_MAX_SIZE URLs."""
+        assert dependency_ops._VERSIONS_CACHE.max_size == (
+            dependency_ops.VERSIONS_CACHE_MAX_SIZE
+        )
+        assert dependency_ops._VERSIONS_CACHE.ttl == dependency_ops.VERSIONS_CACHE_TTL
+
+    def test_pypi_lookups_use_normalized_names(self):
+        """Test that PyPI spellings of one package share a registry URL."""
+        assert dependency_ops._registry_request("Typing_Extensions", "pip") == (
+            dependency_ops._registry_request("typing.extensions", "pip")
+        )
 
     def test_get_latest_version_no_matching(self):
         """Test when no versions match the major version."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0, stdout=json.dumps(["18.0.0", "18.2.0"])
-            )
+        registry, _ = self._registry(payload={"versions": {"18.0.0": {}, "18.2.0": {}}})
 
+        with registry:
             result = json.loads(
                 get_latest_version_for_major.invoke(
                     {
@@ -471,15 +1071,13 @@ class TestGetLatestVersionForMajor:
                 )
             )
 
-            assert result["status"] == "error"
+        assert result["status"] == "error"
 
     def test_get_latest_version_npm_failure(self):
-        """Test handling npm command failure."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=1, stdout="", stderr="npm ERR! 404"
-            )
+        """Test handling a registry error response."""
+        registry, _ = self._registry(status_code=404, payload={"error": "Not found"})
 
+        with registry:
             result = json.loads(
                 get_latest_version_for_major.invoke(
                     {
@@ -490,13 +1088,93 @@ class TestGetLatestVersionForMajor:
                 )
             )
 
-            assert result["status"] == "error"
+        assert result["status"] == "error"
+
+
+class TestGetLatestVersionsForMajors:
+    """Test cases for get_latest_versions_for_majors function."""
+
+    @patch("src.tools.dependency_ops._fetch_versions_batch", new_callable=AsyncMock)
+    def test_batch_lookup(self, mock_fetch):
+        """Test batched lookups with explicit and derived major versions."""
+        mock_fetch.return_value = {
+            "react": ["17.0.1", "17.0.2", "18.2.0"],
+            "lodash": ["3.10.1", "4.17.21"],
+            "missing": None,
+        }
+        packages = json.dumps(
+            [
+                {"name": "react", "major_version": "17"},
+                {"name": "lodash", "current": "^3.0.0"},
+                {"name": "missing", "major_version": "1"},
+            ]
+        )
+
+        result = json.loads(
+            get_latest_versions_for_majors.invoke(
+                {"packages": packages, "package_manager": "npm"}
+            )
+        )
+
+        assert result["status"] == "success"
+        assert result["latest_in_major"] == {
+            "react": "17.0.2",
+            "lodash": "3.10.1",
+            "missing": None,
+        }
+        mock_fetch.assert_awaited_once_with(["react", "lodash", "missing"], "npm")
+
+    def test_invalid_packages_json(self):
+        """Test that malformed input returns an error envelope."""
+        result = json.loads(
+            get_latest_versions_for_majors.invoke(
+                {"packages": "not json", "package_manager": "npm"}
+            )
+        )
+
+        assert result["status"] == "error"
+
+
+class TestPrefetchRollbackVersions:
+    """Test cases for prefetch_rollback_versions function."""
+
+    @patch("src.tools.dependency_ops._fetch_versions_batch", new_callable=AsyncMock)
+    def test_prefetches_major_updates_only(self, mock_fetch):
+        """Test that only packages with a major update are fetched."""
+        outdated = json.dumps(
+            [
+                {"name": "react", "current": "17.0.2", "latest": "18.2.0"},
+                {"name": "lodash", "current": "4.17.0", "latest": "4.17.21"},
+            ]
+        )
+
+        thread = prefetch_rollback_versions(outdated, "npm")
+        thread.join(timeout=5)
+
+        mock_fetch.assert_awaited_once_with(["react"], "npm")
+
+    @patch("src.tools.dependency_ops._fetch_versions_batch", new_callable=AsyncMock)
+    def test_nothing_to_prefetch(self, mock_fetch):
+        """Test unsupported managers, minor-only updates and bad input."""
+        minor_only = json.dumps([{"name": "a", "current": "1.0.0", "latest": "1.1.0"}])
+
+        assert prefetch_rollback_versions(minor_only, "npm") is None
+        assert prefetch_rollback_versions(minor_only, "cargo") is None
+        assert prefetch_rollback_versions("not json", "pip") is None
+        mock_fetch.assert_not_called()
 
 
 class TestParseErrorForDependency:
     """Test cases for parse_error_for_dependency function."""
 
-    @patch("src.tools.dependency_ops.ChatAnthropic")
+    @pytest.fixture(autouse=True)
+    def clear_llm_cache(self):
+        """Make each test construct its own (mocked) LLM client."""
+        _get_llm.cache_clear()
+        yield
+        _get_llm.cache_clear()
+
+    @patch("langchain_anthropic.ChatAnthropic")
     def test_parse_error_identifies_package(self, mock_llm):
         """Test that error parsing identifies problematic package."""
         mock_instance = MagicMock()
@@ -523,6 +1201,51 @@ class TestParseErrorForDependency:
 
         assert result["status"] == "success"
         assert result["analysis"]["suspected_package"] == "react"
+        assert result["analysis"]["confidence"] == "high"
+        mock_instance.invoke.assert_not_called()
+
+    @patch("langchain_anthropic.ChatAnthropic")
+    def test_parse_error_ambiguous_uses_llm(self, mock_llm):
+        """Test that errors naming several updated packages go to the LLM."""
+        mock_instance = MagicMock()
+        mock_instance.invoke.return_value = MagicMock(
+            content='{"suspected_package": "react-dom", "confidence": "high", "reasoning": "API change", "error_type": "api_change"}'
+        )
+        mock_llm.return_value = mock_instance
+
+        from src.tools.dependency_ops import parse_error_for_dependency
+
+        error_output = "TypeError in react-dom: render is not a function (react)"
+        updated_packages = json.dumps(
+            [{"name": "react"}, {"name": "react-dom"}, {"name": "lodash"}]
+        )
+
+        result = json.loads(
+            parse_error_for_dependency.invoke(
+                {"error_output": error_output, "updated_packages": updated_packages}
+            )
+        )
+
+        assert result["analysis"]["suspected_package"] == "react-dom"
+        mock_instance.invoke.assert_called_once()
+
+    @patch("langchain_anthropic.ChatAnthropic")
+    def test_parse_error_short_unmatched_output_skips_llm(self, mock_llm):
+        """Test that short errors naming no package skip the LLM."""
+        from src.tools.dependency_ops import parse_error_for_dependency
+
+        result = json.loads(
+            parse_error_for_dependency.invoke(
+                {
+                    "error_output": "Segmentation fault",
+                    "updated_packages": json.dumps([{"name": "react"}]),
+                }
+            )
+        )
+
+        assert result["analysis"]["suspected_package"] is None
+        assert result["analysis"]["confidence"] == "low"
+        mock_llm.assert_not_called()
 
 
 if __name__ == "__main__":
@@ -6,24 +6,47 @@ Tests container runtime detection, GitHub MCP client initialization,
 and synchronous wrapper functions.
 """
 
+import asyncio
 import os
-import subprocess
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from mcp.types import CallToolResult, TextContent
 
+from src.integrations import github_mcp_client
 from src.integrations.github_mcp_client import (
     GitHubMCPClient,
-    _get_event_loop,
+    _get_background_loop,
+    _get_http_client,
+    _parse_labels,
+    _run_in_background,
+    _shutdown_background_loop,
+    _unwrap_tool_result,
+    close_http_clients,
+    close_pooled_clients,
     create_issue_sync,
+    create_issues_sync,
+    create_pr_and_issue_sync,
     create_pr_sync,
+    pooled_client,
+)
+from src.utils.docker import (
+    detect_container_runtime,
+    find_command_path,
+    get_docker_path,
 )
-from src.utils.docker import detect_container_runtime, find_command_path
 
 
 class TestFindCommandPath:
     """Test cases for find_command_path function."""
 
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        find_command_path.cache_clear()
+        yield
+        find_command_path.cache_clear()
+
     def test_find_command_in_path(self):
         with patch("shutil.which") as mock_which:
             mock_which.return_value = "/usr/bin/docker"
@@ -33,48 +56,77 @@ class TestFindCommandPath:
             assert result == "/usr/bin/docker"
 
     def test_find_command_in_common_paths(self):
-        with (
-            patch("shutil.which") as mock_which,
-            patch("os.path.isfile") as mock_isfile,
-            patch("os.access") as mock_access,
-        ):
-            mock_which.return_value = None
-            mock_isfile.side_effect = lambda p: p == "/opt/homebrew/bin/docker"
-            mock_access.return_value = True
+        def which(cmd, path=None):
+            if path and "/opt/homebrew/bin" in path.split(os.pathsep):
+                return "/opt/homebrew/bin/docker"
+            return None
 
+        with patch("shutil.which", side_effect=which) as mock_which:
             result = find_command_path("docker")
 
-            assert result == "/opt/homebrew/bin/docker"
+        assert result == "/opt/homebrew/bin/docker"
+        assert mock_which.call_count == 2
 
     def test_command_not_found(self):
-        with (
-            patch("shutil.which") as mock_which,
-            patch("os.path.isfile") as mock_isfile,
-        ):
+        with patch("shutil.which") as mock_which:
             mock_which.return_value = None
-            mock_isfile.return_value = False
 
             result = find_command_path("nonexistent")
 
             assert result is None
 
 
+class TestGetDockerPath:
+    """Test cases for get_docker_path function."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        get_docker_path.cache_clear()
+        yield
+        get_docker_path.cache_clear()
+
+    def test_falls_back_to_common_dirs(self):
+        def which(cmd, path=None):
+            return "/opt/homebrew/bin/docker" if path else None
+
+        with patch("shutil.which", side_effect=which) as mock_which:
+            assert get_docker_path() == "/opt/homebrew/bin/docker"
+            assert get_docker_path() == "/opt/homebrew/bin/docker"
+
+        assert mock_which.call_count == 2
+
+    def test_bare_name_when_not_found(self):
+        with patch("shutil.which", return_value=None):
+            assert get_docker_path() == "docker"
+
+
 class TestDetectContainerRuntime:
     """Test cases for detect_container_runtime function."""
 
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        detect_container_runtime.cache_clear()
+        yield
+        detect_container_runtime.cache_clear()
+
     @patch("src.utils.docker.find_command_path")
-    @patch("src.utils.docker.subprocess.run")
-    def test_detect_docker(self, mock_run, mock_find):
+    def test_result_is_cached(self, mock_find):
+        mock_find.return_value = "/usr/bin/docker"
+
+        assert detect_container_runtime() == detect_container_runtime()
+
+        mock_find.assert_called_once_with("docker")
+
+    @patch("src.utils.docker.find_command_path")
+    def test_detect_docker(self, mock_find):
         mock_find.return_value = "/usr/bin/docker"
-        mock_run.return_value = MagicMock(returncode=0)
 
         result = detect_container_runtime()
 
         assert result == "/usr/bin/docker"
 
     @patch("src.utils.docker.find_command_path")
-    @patch("src.utils.docker.subprocess.run")
-    def test_detect_podman_when_docker_unavailable(self, mock_run, mock_find):
+    def test_detect_podman_when_docker_unavailable(self, mock_find):
         def find_side_effect(cmd):
             if cmd == "docker":
                 return None
@@ -83,7 +135,6 @@ class TestDetectContainerRuntime:
             return None
 
         mock_find.side_effect = find_side_effect
-        mock_run.return_value = MagicMock(returncode=0)
 
         result = detect_container_runtime()
 
@@ -99,10 +150,8 @@ class TestDetectContainerRuntime:
         assert "No container runtime found" in str(exc_info.value)
 
     @patch("src.utils.docker.find_command_path")
-    @patch("src.utils.docker.subprocess.run")
-    def test_returns_full_path_for_non_standard_location(self, mock_run, mock_find):
+    def test_returns_full_path_for_non_standard_location(self, mock_find):
         mock_find.return_value = "/opt/homebrew/bin/docker"
-        mock_run.return_value = MagicMock(returncode=0)
 
         result = detect_container_runtime()
 
@@ -153,6 +202,145 @@ class TestGitHubMCPClient:
         )
         assert toolsets_idx > 0
 
+    @patch("src.integrations.github_mcp_client.detect_container_runtime")
+    def test_init_http_transport(self, mock_detect):
+        client = GitHubMCPClient(
+            github_token="test_token",
+            toolsets="repos",
+            transport="http",
+            url="http://127.0.0.1:8082/mcp",
+        )
+
+        assert client.url == "http://127.0.0.1:8082/mcp"
+        assert client.headers == {
+            "Authorization": "Bearer test_token",
+            "X-MCP-Toolsets": "repos",
+        }
+        mock_detect.assert_not_called()
+
+    def test_init_http_transport_requires_url(self):
+        with patch.dict(os.environ, {"GITHUB_MCP_URL": ""}):
+            with pytest.raises(ValueError, match="GitHub MCP URL not provided"):
+                GitHubMCPClient(github_token="test_token", transport="http")
+
+    def test_list_available_tools_is_cached(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        tool = MagicMock()
+        tool.name = "issue_write"
+        client.session.list_tools.return_value = MagicMock(tools=[tool])
+
+        async def run():
+            return await asyncio.gather(
+                client.list_available_tools(), client.list_available_tools()
+            )
+
+        first, second = asyncio.run(run())
+
+        assert first == second == ["issue_write"]
+        client.session.list_tools.assert_awaited_once()
+
+    def test_list_available_tools_refreshes_after_ttl(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        client.session.list_tools.return_value = MagicMock(tools=[])
+
+        async def run():
+            await client.list_available_tools()
+            await client.list_available_tools()
+
+        with patch.object(github_mcp_client, "TOOLS_CACHE_TTL", 0):
+            asyncio.run(run())
+
+        assert client.session.list_tools.await_count == 2
+
+    def test_create_issue_calls_issue_write(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        client.session.call_tool.return_value = CallToolResult(
+            content=[], structuredContent={"number": 5}
+        )
+
+        result = asyncio.run(client.create_issue("owner", "repo", "Title", "Body"))
+
+        assert result["issue_number"] == 5
+        client.session.call_tool.assert_awaited_once_with(
+            "issue_write",
+            arguments={
+                "owner": "owner",
+                "repo": "repo",
+                "title": "Title",
+                "body": "Body",
+                "labels": ["dependencies"],
+            },
+        )
+
+    def test_create_issues_uses_one_session(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        client.session.call_tool.side_effect = [
+            CallToolResult(content=[], structuredContent={"number": 1}),
+            CallToolResult(content=[], structuredContent={"number": 2}),
+        ]
+
+        results = asyncio.run(
+            client.create_issues(
+                "owner",
+                "repo",
+                [
+                    {"title": "A", "body": "a"},
+                    {"title": "B", "body": "b", "labels": ["bug"]},
+                ],
+            )
+        )
+
+        assert [r["issue_number"] for r in results] == [1, 2]
+        second_call = client.session.call_tool.await_args_list[1]
+        assert second_call.kwargs["arguments"]["labels"] == ["bug"]
+
+    def test_tool_call_error(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        client.session.call_tool.side_effect = asyncio.TimeoutError("timed out")
+
+        result = asyncio.run(client.get_repository_info("owner", "repo"))
+
+        assert result == {
+            "status": "error",
+            "message": "Error getting repository info: timed out",
+        }
+
+    def test_unexpected_tool_call_error_propagates(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        client.session.call_tool.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(client.get_repository_info("owner", "repo"))
+        assert client._broken is True
+
+    def test_handled_tool_call_error_keeps_client_healthy(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+        client.session = AsyncMock()
+        client.session.call_tool.side_effect = asyncio.TimeoutError("timed out")
+
+        asyncio.run(client.get_repository_info("owner", "repo"))
+
+        assert client._broken is False
+
+    def test_tool_call_requires_session(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+
+        with pytest.raises(RuntimeError, match="Session not initialized"):
+            asyncio.run(client.create_pull_request("o", "r", "t", "b", "head"))
+        with pytest.raises(RuntimeError, match="Session not initialized"):
+            asyncio.run(client.list_available_tools())
+
+    def test_uses_slots(self):
+        client = GitHubMCPClient(github_token="test_token", container_runtime="docker")
+
+        assert not hasattr(client, "__dict__")
+
 
 class TestCreatePRSync:
     """Test cases for create_pr_sync function."""
@@ -168,22 +356,15 @@ class TestCreatePRSync:
         assert result["status"] == "error"
         assert "Invalid repo_name format" in result["message"]
 
-    @patch("src.integrations.github_mcp_client.GitHubMCPClient")
-    @patch("src.integrations.github_mcp_client._get_event_loop")
-    def test_create_pr_success(self, mock_loop, mock_client_class):
-        mock_client = AsyncMock()
-        mock_client.create_pull_request.return_value = {
-            "status": "success",
-            "pr_url": "https://github.com/test/repo/pull/1",
-        }
-        mock_client_class.return_value.__aenter__.return_value = mock_client
-
-        mock_event_loop = MagicMock()
-        mock_event_loop.run_until_complete.return_value = {
-            "status": "success",
-            "pr_url": "https://github.com/test/repo/pull/1",
-        }
-        mock_loop.return_value = mock_event_loop
+    @patch("src.integrations.github_mcp_client.pooled_client")
+    def test_create_pr_success(self, mock_pool):
+        client = mock_pool.return_value.__aenter__.return_value
+        client.create_pull_request = AsyncMock(
+            return_value={
+                "status": "success",
+                "pr_url": "https://github.com/test/repo/pull/1",
+            }
+        )
 
         result = create_pr_sync(
             repo_name="test/repo",
@@ -193,13 +374,19 @@ class TestCreatePRSync:
         )
 
         assert result["status"] == "success"
-
-    @patch("src.integrations.github_mcp_client._get_event_loop")
-    def test_create_pr_exception(self, mock_loop):
-        mock_loop.return_value.run_until_complete.side_effect = Exception(
-            "Connection failed"
+        client.create_pull_request.assert_awaited_once_with(
+            repo_owner="test",
+            repo_name="repo",
+            title="Test PR",
+            body="Test body",
+            head="feature-branch",
+            base="main",
         )
 
+    @patch("src.integrations.github_mcp_client.pooled_client")
+    def test_create_pr_exception(self, mock_pool):
+        mock_pool.side_effect = Exception("Connection failed")
+
         result = create_pr_sync(
             repo_name="test/repo", branch_name="feature", title="Test", body="Test body"
         )
@@ -219,41 +406,407 @@ class TestCreateIssueSync:
         assert result["status"] == "error"
         assert "Invalid repo_name format" in result["message"]
 
-    @patch("src.integrations.github_mcp_client._get_event_loop")
-    def test_create_issue_success(self, mock_loop):
-        mock_loop.return_value.run_until_complete.return_value = {
-            "status": "success",
-            "issue_url": "https://github.com/test/repo/issues/1",
-        }
+    @patch("src.integrations.github_mcp_client.pooled_client")
+    def test_create_issue_success(self, mock_pool):
+        client = mock_pool.return_value.__aenter__.return_value
+        client.create_issue = AsyncMock(
+            return_value={
+                "status": "success",
+                "issue_url": "https://github.com/test/repo/issues/1",
+            }
+        )
 
         result = create_issue_sync(
             repo_name="test/repo", title="Test Issue", body="Test body"
         )
 
         assert result["status"] == "success"
+        assert client.create_issue.await_args.kwargs["labels"] == ["dependencies"]
 
-    def test_labels_parsing(self):
-        with patch("src.integrations.github_mcp_client._get_event_loop") as mock_loop:
-            mock_loop.return_value.run_until_complete.return_value = {
-                "status": "success"
-            }
+    @patch("src.integrations.github_mcp_client.pooled_client")
+    def test_labels_parsing(self, mock_pool):
+        client = mock_pool.return_value.__aenter__.return_value
+        client.create_issue = AsyncMock(return_value={"status": "success"})
+
+        create_issue_sync(
+            repo_name="test/repo",
+            title="Test",
+            body="Body",
+            labels="bug,enhancement,dependencies",
+        )
+
+        assert client.create_issue.await_args.kwargs["labels"] == [
+            "bug",
+            "enhancement",
+            "dependencies",
+        ]
+
+    def test_parse_labels(self):
+        assert _parse_labels("bug, enhancement ,dependencies") == (
+            "bug",
+            "enhancement",
+            "dependencies",
+        )
+
+    @pytest.mark.parametrize("repo_name", ["owner/", "/repo", "a/b/c"])
+    def test_rejects_malformed_repo_names(self, repo_name):
+        result = create_issue_sync(repo_name=repo_name, title="Test", body="Body")
+
+        assert result["status"] == "error"
+        assert "Invalid repo_name format" in result["message"]
+
+
+class TestCreateIssuesSync:
+    """Test cases for create_issues_sync function."""
+
+    def test_invalid_repo_name_format(self):
+        results = create_issues_sync(
+            repo_name="invalid-format",
+            issues=[{"title": "A", "body": "a"}, {"title": "B", "body": "b"}],
+        )
+
+        assert len(results) == 2
+        assert all("Invalid repo_name format" in r["message"] for r in results)
+
+    @patch("src.integrations.github_mcp_client.pooled_client")
+    def test_creates_issues_on_pooled_client(self, mock_pool):
+        client = mock_pool.return_value.__aenter__.return_value
+        client.create_issues = AsyncMock(return_value=[{"issue_number": 1}])
+        issues = [{"title": "A", "body": "a"}]
+
+        results = create_issues_sync(repo_name="test/repo", issues=issues)
+
+        assert results == [{"issue_number": 1}]
+        client.create_issues.assert_awaited_once_with("test", "repo", issues)
 
-            create_issue_sync(
+    @patch("src.integrations.github_mcp_client.pooled_client")
+    def test_exception_fails_every_issue(self, mock_pool):
+        mock_pool.side_effect = Exception("Connection failed")
+
+        results = create_issues_sync(
+            repo_name="test/repo", issues=[{"title": "A", "body": "a"}]
+        )
+
+        assert results == [
+            {"status": "error", "message": "Error in MCP client: Connection failed"}
+        ]
+
+
+class TestCreatePRAndIssueSync:
+    """Test cases for create_pr_and_issue_sync function."""
+
+    def test_shares_one_pooled_session(self):
+        client = MagicMock()
+        client.create_pull_request = AsyncMock(return_value={"pr_number": 1})
+        client.create_issue = AsyncMock(return_value={"issue_number": 2})
+
+        with patch("src.integrations.github_mcp_client.pooled_client") as mock_pool:
+            mock_pool.return_value.__aenter__.return_value = client
+            result = create_pr_and_issue_sync(
                 repo_name="test/repo",
-                title="Test",
-                body="Body",
-                labels="bug,enhancement,dependencies",
+                branch_name="deps",
+                pr_title="Update deps",
+                pr_body="body",
+                issue_title="Major updates",
+                issue_body="body",
+                labels="dependencies, major",
             )
 
+        assert result == {"pr": {"pr_number": 1}, "issue": {"issue_number": 2}}
+        mock_pool.assert_called_once()
+        mock_pool.return_value.__aexit__.assert_awaited_once()
+        assert client.create_issue.await_args.kwargs["labels"] == [
+            "dependencies",
+            "major",
+        ]
+
+    def test_invalid_repo_name_format(self):
+        result = create_pr_and_issue_sync(
+            repo_name="invalid-format",
+            branch_name="deps",
+            pr_title="t",
+            pr_body="b",
+            issue_title="t",
+            issue_body="b",
+        )
+
+        assert result["pr"]["status"] == result["issue"]["status"] == "error"
+
 
 class TestEventLoop:
     """Test cases for event loop handling."""
 
-    def test_get_event_loop_creates_new_loop(self):
-        loop = _get_event_loop()
+    def test_background_loop_runs_coroutines(self):
+        async def where():
+            return asyncio.get_running_loop(), threading.get_ident()
+
+        loop, thread_id = _run_in_background(where())
+
+        assert loop is _run_in_background(where())[0]
+        assert loop.is_running()
+        assert thread_id != threading.get_ident()
+
+    def test_refuses_to_block_a_running_loop(self):
+        async def noop():
+            return None
+
+        async def run():
+            _run_in_background(noop())
+
+        with pytest.raises(RuntimeError, match="running event loop"):
+            asyncio.run(run())
+
+    def test_background_loop_prefers_uvloop(self):
+        fake_uvloop = MagicMock()
+        fake_uvloop.new_event_loop.side_effect = asyncio.new_event_loop
+
+        with (
+            patch.object(github_mcp_client, "uvloop", fake_uvloop),
+            patch.object(github_mcp_client, "_LOOP", None),
+        ):
+            loop = _get_background_loop()
+
+        loop.call_soon_threadsafe(loop.stop)
+        fake_uvloop.new_event_loop.assert_called_once()
+
+
+class TestUnwrapToolResult:
+    """Test cases for converting MCP tool results."""
+
+    @staticmethod
+    def _result(text, structured=None):
+        return CallToolResult(
+            content=[TextContent(type="text", text=text)],
+            structuredContent=structured,
+        )
+
+    def test_prefers_structured_content(self):
+        result = self._result("not json", structured={"number": 7})
+
+        assert _unwrap_tool_result(result) == {
+            "status": "success",
+            "data": {"number": 7},
+        }
+
+    def test_parses_text_content(self):
+        result = self._result('{"html_url": "https://x/pull/3", "number": 3}')
+
+        unwrapped = _unwrap_tool_result(result, "pr", "PR")
+
+        assert unwrapped["pr_url"] == "https://x/pull/3"
+        assert unwrapped["pr_number"] == 3
+        assert unwrapped["message"] == "Successfully created PR #3"
+
+    def test_non_json_text_is_raw_response(self):
+        unwrapped = _unwrap_tool_result(self._result("created"), "issue", "issue")
+
+        assert unwrapped == {
+            "status": "success",
+            "message": "created",
+            "raw_response": "created",
+        }
+
+    def test_empty_content(self):
+        result = CallToolResult(content=[])
+
+        assert _unwrap_tool_result(result)["status"] == "error"
+
+
+class TestHttpClients:
+    """Test cases for the shared streamable HTTP clients."""
+
+    def test_reused_per_headers(self):
+        async def run():
+            first = _get_http_client({"Authorization": "Bearer a"})
+            again = _get_http_client({"Authorization": "Bearer a"})
+            other = _get_http_client({"Authorization": "Bearer b"})
+            await close_http_clients()
+            return first, again, other
+
+        first, again, other = asyncio.run(run())
+
+        assert first is again
+        assert first is not other
+        assert first.is_closed and other.is_closed
+
+    def test_replaced_after_close(self):
+        async def run():
+            first = _get_http_client({"Authorization": "Bearer a"})
+            await close_http_clients()
+            second = _get_http_client({"Authorization": "Bearer a"})
+            await close_http_clients()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first is not second
+
+
+async def _use_pooled_client(token: str = "token"):
+    """Lease a pooled client and release it right away."""
+    async with pooled_client(token) as client:
+        return client
+
+
+class TestClientPool:
+    """Test cases for the pooled MCP client."""
+
+    @pytest.fixture(autouse=True)
+    def client_class(self):
+        def open_client(token):
+            client = MagicMock(_cleanup=AsyncMock(), _broken=False)
+            client.__aenter__ = AsyncMock(return_value=client)
+            return client
+
+        github_mcp_client._GLOBAL_POOL.clear()
+        with patch(
+            "src.integrations.github_mcp_client.GitHubMCPClient",
+            side_effect=open_client,
+        ) as mock_class:
+            yield mock_class
+        github_mcp_client._GLOBAL_POOL.clear()
+
+    def test_reuses_open_client(self, client_class):
+        async def run():
+            return await _use_pooled_client(), await _use_pooled_client()
+
+        first, second = asyncio.run(run())
+
+        assert first is second
+        assert client_class.call_count == 1
+        (entry,) = github_mcp_client._GLOBAL_POOL.values()
+        assert entry.use_count == 2
+
+    def test_recycles_expired_client(self, client_class):
+        async def run():
+            return await _use_pooled_client(), await _use_pooled_client()
+
+        with patch.object(github_mcp_client, "POOL_MAX_AGE", 0):
+            first, second = asyncio.run(run())
+
+        assert first is not second
+        first._cleanup.assert_awaited_once()
+
+    def test_leases_are_counted(self, client_class):
+        async def run():
+            async with pooled_client("token"):
+                (entry,) = github_mcp_client._GLOBAL_POOL.values()
+                async with pooled_client("token"):
+                    assert entry.leases == 2
+                assert entry.leases == 1
+            return entry
+
+        entry = asyncio.run(run())
+
+        assert entry.leases == 0
+
+    def test_recycled_client_stays_open_while_leased(self, client_class):
+        """Test that a stale client is closed only after its last user leaves."""
+
+        async def run():
+            async with pooled_client("token") as first:
+                with patch.object(github_mcp_client, "POOL_MAX_AGE", 0):
+                    second = await _use_pooled_client()
+                assert not first._cleanup.await_count
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first is not second
+        first._cleanup.assert_awaited_once()
+
+    def test_replaces_broken_client(self, client_class):
+        """Test that a client whose transport failed is not handed out again."""
+
+        async def run():
+            first = await _use_pooled_client()
+            first._broken = True
+            return first, await _use_pooled_client()
+
+        first, second = asyncio.run(run())
+
+        assert first is not second
+        first._cleanup.assert_awaited_once()
+
+    def test_replaces_client_whose_holder_task_died(self, client_class):
+        """Test that a pooled client is dropped once its holder task is done."""
+
+        async def run():
+            first = await _use_pooled_client()
+            (entry,) = github_mcp_client._GLOBAL_POOL.values()
+            entry.task.cancel()
+            await asyncio.sleep(0)
+            return first, await _use_pooled_client()
+
+        first, second = asyncio.run(run())
+
+        assert first is not second
+        assert client_class.call_count == 2
+
+    def test_http_transport_falls_back_to_stdio(self, client_class):
+        def open_client(token, transport="stdio"):
+            client = MagicMock(_cleanup=AsyncMock(), _broken=False, transport=transport)
+            client.__aenter__ = AsyncMock(return_value=client)
+            if transport == "http":
+                client.__aenter__.side_effect = RuntimeError("refused")
+            return client
+
+        client_class.side_effect = open_client
+
+        with patch.dict(os.environ, {"GITHUB_MCP_URL": "http://127.0.0.1:1/mcp"}):
+            client = asyncio.run(_use_pooled_client())
+
+        assert client.transport == "stdio"
+        ((_, transport),) = github_mcp_client._GLOBAL_POOL
+        assert transport == "http"
+
+    def test_client_is_exited_by_the_task_that_entered_it(self, client_class):
+        tasks = []
+
+        def open_client(token):
+            client = MagicMock(_broken=False)
+            client.__aenter__ = AsyncMock(
+                side_effect=lambda: tasks.append(asyncio.current_task()) or client
+            )
+            client._cleanup = AsyncMock(
+                side_effect=lambda: tasks.append(asyncio.current_task())
+            )
+            return client
+
+        client_class.side_effect = open_client
+
+        async def run():
+            await _use_pooled_client()
+            await close_pooled_clients()
+
+        asyncio.run(run())
+
+        entered, exited = tasks
+        assert entered is exited
+
+    def test_shutdown_closes_background_clients(self):
+        client = _run_in_background(_use_pooled_client())
+
+        with patch.object(github_mcp_client, "_LOOP", None):
+            _shutdown_background_loop()  # no background loop: nothing to do
+
+        loop = _get_background_loop()
+        with patch.object(loop, "stop"):
+            _shutdown_background_loop()
+
+        client._cleanup.assert_awaited_once()
+        assert github_mcp_client._GLOBAL_POOL == {}
+
+    def test_close_pooled_clients(self):
+        async def run():
+            client = await _use_pooled_client()
+            await close_pooled_clients()
+            return client
+
+        client = asyncio.run(run())
 
-        assert loop is not None
-        assert not loop.is_closed()
+        client._cleanup.assert_awaited_once()
+        assert github_mcp_client._GLOBAL_POOL == {}
 
 
 class TestServerParams:
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the JobStore used by the API server's in-process job queue.
+
+Tests:
+- Creating and patching job records
+- Returned records are copies
+- LRU eviction once the store is full
+- Pagination
+- Compressed result output
+- Checkout cleanup after a job run
+"""
+
+import asyncio
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from src.agents.analyzer import _get_context, clone_repository
+from src.api.jobs import (
+    OUTPUT_TAIL_CHARS,
+    JobStore,
+    compress_output,
+    expand_result,
+    run_repository_update,
+)
+
+
+class TestJobStore:
+    """Test cases for JobStore class."""
+
+    def test_set_creates_and_patches_record(self):
+        """Test that set creates a record and merges later patches."""
+        store = JobStore()
+
+        async def run():
+            await store.set("job-1", {"status": "queued", "repository": "a/b"})
+            await store.set("job-1", {"status": "completed"})
+            return await store.get("job-1")
+
+        record = asyncio.run(run())
+
+        assert record == {
+            "job_id": "job-1",
+            "status": "completed",
+            "repository": "a/b",
+        }
+
+    def test_get_unknown_job(self):
+        """Test that unknown jobs return None."""
+        assert asyncio.run(JobStore().get("missing")) is None
+
+    def test_get_returns_copy(self):
+        """Test that mutating a returned record does not affect the store."""
+        store = JobStore()
+
+        async def run():
+            await store.set("job-1", {"status": "queued"})
+            record = await store.get("job-1")
+            record["status"] = "tampered"
+            return await store.get("job-1")
+
+        assert asyncio.run(run())["status"] == "queued"
+
+    def test_evicts_oldest_created(self):
+        """Test that the oldest job is evicted when the store is full."""
+        store = JobStore(max_jobs=2)
+
+        async def run():
+            await store.set("job-1", {"status": "queued"})
+            await store.set("job-2", {"status": "queued"})
+            await store.set("job-1", {"status": "processing"})
+            await store.set("job-3", {"status": "queued"})
+            return await store.list()
+
+        total, jobs = asyncio.run(run())
+
+        assert total == 2
+        assert [job["job_id"] for job in jobs] == ["job-2", "job-3"]
+
+    def test_list_order_ignores_updates(self):
+        """Test that updating a job does not move it between list pages."""
+        store = JobStore()
+
+        async def run():
+            for i in range(3):
+                await store.set(f"job-{i}", {"status": "queued"})
+            await store.set("job-0", {"status": "processing"})
+            return await store.list(offset=0, limit=1)
+
+        _, jobs = asyncio.run(run())
+
+        assert jobs == [{"job_id": "job-0", "status": "processing"}]
+
+    def test_list_paginates(self):
+        """Test that list returns the requested page and the full total."""
+        store = JobStore()
+
+        async def run():
+            for i in range(5):
+                await store.set(f"job-{i}", {"status": "queued"})
+            return await store.list(offset=1, limit=2)
+
+        total, jobs = asyncio.run(run())
+
+        assert total == 5
+        assert [job["job_id"] for job in jobs] == ["job-1", "job-2"]
+
+
+class TestResultCompression:
+    """Test cases for compressed job output."""
+
+    def test_round_trip(self):
+        """Test that expand_result restores the compressed output."""
+        stored = {"output_gz": compress_output('{"status": "pr_created"}'), "x": 1}
+
+        result = expand_result(stored)
+
+        assert result == {"output": '{"status": "pr_created"}', "x": 1}
+        assert "output_gz" in stored
+
+    def test_keeps_only_tail(self):
+        """Test that only the last OUTPUT_TAIL_CHARS characters are stored."""
+        text = "a" * OUTPUT_TAIL_CHARS + "tail"
+
+        result = expand_result({"output_gz": compress_output(text)})
+
+        assert len(result["output"]) == OUTPUT_TAIL_CHARS
+        assert result["output"].endswith("tail")
+
+    def test_uncompressed_result_passthrough(self):
+        """Test that results without output_gz are returned unchanged."""
+        assert expand_result(None) is None
+        assert expand_result({"output": "x"}) == {"output": "x"}
+
+
+class TestRunRepositoryUpdate:
+    """Test cases for run_repository_update."""
+
+    @patch("src.api.jobs.create_main_orchestrator")
+    @patch("src.api.jobs.validate_prerequisites", return_value=(True, "ok"))
+    def test_up_to_date_run_removes_checkout(self, mock_validate, mock_create):
+        """Test that a run stopping after analysis still removes its checkout."""
+        cloned = []
+
+        def fake_clone(args, **kwargs):
+            with open(os.path.join(args[-1], "package.json"), "w") as f:
+                f.write("{}")
+            return MagicMock(returncode=0, stdout="", stderr="")
+
+        def clone():
+            with patch("src.agents.analyzer.get_cache") as mock_cache, patch(
+                "src.agents.analyzer.subprocess.run", side_effect=fake_clone
+            ):
+                mock_cache.return_value.get_cached_repository.return_value = None
+                result = clone_repository.invoke("https://github.com/test/repo")
+            cloned.append(json.loads(result)["repo_path"])
+
+        def invoke(*args, **kwargs):
+            # Clone on a worker thread, the way agent tools are executed
+            with ContextThreadPoolExecutor() as executor:
+                executor.submit(clone).result()
+            assert os.path.exists(cloned[0])
+            content = '{"status": "up_to_date", "message": "Nothing to update"}'
+            return {"messages": [MagicMock(content=content)]}
+
+        mock_create.return_value.invoke.side_effect = invoke
+
+        record = asyncio.run(run_repository_update("job-1", "test/repo"))
+
+        assert record["status"] == "completed"
+        assert record["result"]["status"] == "up_to_date"
+        assert not os.path.exists(cloned[0])
+        assert _get_context(cloned[0]) is None
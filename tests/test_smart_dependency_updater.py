@@ -93,6 +93,38 @@ class TestDetectBuildCommand:
         assert result["commands"]["install"] == "poetry install"
         assert result["commands"]["test"] == "poetry run pytest"
 
+    def test_detect_poetry_ignores_commented_table(self, temp_repo):
+        """Test that a commented-out [tool.poetry] table is not treated as poetry."""
+        with open(os.path.join(temp_repo, "pyproject.toml"), "w") as f:
+            f.write("# [tool.poetry]\n[project]\nname = 'test'\n")
+
+        result = json.loads(detect_build_command.invoke(temp_repo))
+
+        assert result["commands"]["package_manager"] == "pip"
+        assert result["commands"]["install"] == "pip install ."
+
+    def test_detect_uv_commands(self, temp_repo):
+        """Test detection of uv from its lock file."""
+        with open(os.path.join(temp_repo, "pyproject.toml"), "w") as f:
+            f.write("[project]\nname = 'test'\n")
+        with open(os.path.join(temp_repo, "uv.lock"), "w") as f:
+            f.write("")
+
+        result = json.loads(detect_build_command.invoke(temp_repo))
+
+        assert result["commands"]["package_manager"] == "uv"
+        assert result["commands"]["test"] == "uv run pytest"
+
+    def test_detect_pdm_commands(self, temp_repo):
+        """Test detection of pdm from [tool.pdm]."""
+        with open(os.path.join(temp_repo, "pyproject.toml"), "w") as f:
+            f.write("[project]\nname = 'test'\n\n[tool.pdm]\ndistribution = true\n")
+
+        result = json.loads(detect_build_command.invoke(temp_repo))
+
+        assert result["commands"]["package_manager"] == "pdm"
+        assert result["commands"]["install"] == "pdm install"
+
     def test_detect_pip_commands(self, temp_repo):
         """Test detection of pip commands."""
         with open(os.path.join(temp_repo, "requirements.txt"), "w") as f:
@@ -201,6 +233,17 @@ class TestRunBuildTest:
         # Verify working directory restored
         assert os.getcwd() == original_dir
 
+    def test_runs_in_repo_directory(self, temp_repo):
+        """Test that the command runs in the repo without changing our cwd."""
+        original_dir = os.getcwd()
+
+        result = json.loads(
+            run_build_test.invoke({"repo_path": temp_repo, "command": "pwd -P"})
+        )
+
+        assert result["stdout"].strip() == os.path.realpath(temp_repo)
+        assert os.getcwd() == original_dir
+
     def test_run_failing_command(self, temp_repo):
         """Test running a failing command."""
         result = json.loads(
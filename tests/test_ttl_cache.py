@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the ttl_cache module.
+
+Tests expiry, size-bounded eviction, key normalization and concurrent use
+of the in-process TTLCache.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache class."""
+
+    @patch("src.utils.ttl_cache.time.monotonic")
+    def test_entries_expire(self, mock_time):
+        """Test that entries are not returned once the TTL has passed."""
+        mock_time.return_value = 1000.0
+        cache = TTLCache(ttl=60, max_size=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+
+        mock_time.return_value += 60
+        assert cache.get("a") is None
+
+    @patch("src.utils.ttl_cache.time.monotonic")
+    def test_set_drops_expired_entries(self, mock_time):
+        """Test that a write prunes entries past the TTL."""
+        mock_time.return_value = 1000.0
+        cache = TTLCache(ttl=60, max_size=10)
+        cache.set("old", 1)
+
+        mock_time.return_value += 60
+        cache.set("new", 2)
+
+        assert cache.keys() == ["new"]
+
+    def test_evicts_oldest_over_max_size(self):
+        """Test that the least recently written keys are evicted first."""
+        cache = TTLCache(ttl=60, max_size=2)
+        for key in ("a", "b", "a", "c"):
+            cache.set(key, 1)
+
+        assert cache.keys() == ["a", "c"]
+        assert len(cache) == 2
+
+    def test_normalize_key(self):
+        """Test that keys are normalized on both lookup and storage."""
+        cache = TTLCache(ttl=60, max_size=10, normalize_key=str.lower)
+        cache.set("Flask", "3.0.0")
+
+        assert cache.get("FLASK") == "3.0.0"
+        assert cache.keys() == ["flask"]
+
+    def test_clear(self):
+        """Test that clear removes every entry."""
+        cache = TTLCache(ttl=60, max_size=10)
+        cache.set("a", 1)
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_concurrent_writes(self):
+        """Test that threads writing and pruning at once keep the cache bounded."""
+        cache = TTLCache(ttl=60, max_size=8)
+
+        def store(worker: int) -> None:
+            for index in range(500):
+                cache.set(f"{worker}-{index}", index)
+                cache.get(f"{worker}-{index}")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(store, range(8)))
+
+        assert len(cache) == 8